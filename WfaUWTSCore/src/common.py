@@ -148,6 +148,7 @@ class TestExecutionCommand(UserCommand):
         self.test_case_id = ""
         self.is_group_run = False
         self.group_file_name = ""
+        self.bench_file_name = ""
         self.user_mode = "PreCert"
         self.log_level = '0'
 
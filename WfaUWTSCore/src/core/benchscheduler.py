@@ -0,0 +1,234 @@
+###############################################################################
+#
+# Copyright (c) 2016 Wi-Fi Alliance
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER
+# RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT,
+# NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE
+# USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+###############################################################################
+
+#!/usr/bin/env python
+
+"""
+Parallel execution of a group file across several test benches
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import subprocess
+from Queue import Queue, Empty
+from common import TestConfigError
+
+
+class TestBenchProfile(object):
+    """The class that describes one test bench and the WTS installation driving it.
+
+    Every bench has its own installation, i.e. its own init, testbed and DUT
+    config files, database and log folder, so a test case running on one bench
+    never shares state with a test case running on another one.
+
+    Attributes:
+        name (str): The bench name used in the log messages.
+        src_path (str): The src folder of the WTS installation of the bench.
+        cli_port (int): The port of the front end server of the worker process.
+
+    """
+    def __init__(self, name, src_path, cli_port):
+        self.name = name
+        self.src_path = src_path
+        self.cli_port = cli_port
+
+
+    def get_result_file(self, tc_name):
+        """Gets the TMS result file the worker process writes for the test case.
+
+        Args:
+            tc_name (str): The test case ID.
+        """
+        return os.path.join(self.src_path, "tms_%s.json" % tc_name)
+
+
+    def get_worker_command(self, prog_name, tc_name):
+        """Gets the legacy command line running a single test case on the bench.
+
+        Args:
+            prog_name (str): The program name.
+            tc_name (str): The test case ID.
+        """
+        if getattr(sys, 'frozen', False):
+            return [os.path.join(self.src_path, os.path.basename(sys.executable)), prog_name, tc_name]
+        return [sys.executable, os.path.join(self.src_path, "wts.py"), prog_name, tc_name]
+
+
+
+class TestBenchResult(object):
+    """The class that records the run of a test case on a bench.
+
+    Attributes:
+        tc_name (str): The test case ID.
+        bench_name (str): The name of the bench the test case ran on.
+        ret_code (int): The exit code of the worker process, None if it could not be started.
+        elapsed (float): The execution time in seconds.
+        verdict (str): The final test result, PASS or FAIL, N/A if the worker reported none.
+
+    """
+    def __init__(self, tc_name, bench_name, ret_code, elapsed, verdict):
+        self.tc_name = tc_name
+        self.bench_name = bench_name
+        self.ret_code = ret_code
+        self.elapsed = elapsed
+        self.verdict = verdict
+
+
+
+class TestBenchScheduler(object):
+    """The class that hands the test cases of a group file to free benches.
+
+    One worker thread is started per bench. Each worker takes the next test case
+    of the group, runs it in a WTS process of its bench and waits for it to end
+    before taking another one, so a group finishes in roughly 1/N of the serial
+    time on N identical benches. The worker process always exits with 0, so the
+    verdict of a test case is read from the TMS result file it writes.
+
+    Attributes:
+        prog_name (str): The program name.
+        bench_list (list): The TestBenchProfile objects.
+        tc_queue (object): The queue of test case IDs waiting for a bench.
+        results (dictionary): The TestBenchResult objects keyed by test case ID.
+        lock (object): The lock protecting the results.
+
+    """
+    BENCH_PORT_BASE = 8560
+
+    def __init__(self, prog_name, bench_list):
+        self.prog_name = prog_name
+        self.bench_list = bench_list
+        self.tc_queue = Queue()
+        self.results = {}
+        self.lock = threading.Lock()
+
+
+    @staticmethod
+    def load_bench_file(bench_file_name):
+        """Reads the bench profiles from a file of name,src folder lines.
+
+        Args:
+            bench_file_name (str): The bench profile file name.
+        """
+        if not os.path.exists(bench_file_name):
+            raise OSError(bench_file_name + " not exists")
+
+        bench_list = []
+        with open(bench_file_name, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line == "" or line.startswith('#'):
+                    continue
+                fields = [field.strip() for field in line.split(',')]
+                if len(fields) < 2 or fields[1] == "":
+                    raise TestConfigError("Invalid bench profile [%s] in %s" % (line, bench_file_name))
+                if not os.path.exists(os.path.join(fields[1], "wts.py")) and not getattr(sys, 'frozen', False):
+                    raise TestConfigError("No WTS installation found for bench %s at %s" % (fields[0], fields[1]))
+                bench_list.append(TestBenchProfile(fields[0], fields[1], TestBenchScheduler.BENCH_PORT_BASE + len(bench_list)))
+
+        if not bench_list:
+            raise TestConfigError("No bench profile found in %s" % bench_file_name)
+        return bench_list
+
+
+    def run_group(self, tc_list):
+        """Runs all test cases of a group and waits for them to complete.
+
+        Args:
+            tc_list (list): The test case IDs in group file order.
+        """
+        for tc_name in tc_list:
+            self.tc_queue.put(tc_name)
+
+        logging.info("Running %d test cases on %d benches" % (len(tc_list), len(self.bench_list)))
+        start_time = time.time()
+        workers = []
+        for bench in self.bench_list:
+            worker = threading.Thread(target=self.run_bench, args=(bench,), name="bench-%s" % bench.name)
+            worker.start()
+            workers.append(worker)
+        for worker in workers:
+            worker.join()
+
+        counts = {'PASS' : 0, 'FAIL' : 0, 'N/A' : 0}
+        for tc_name in tc_list:
+            result = self.results.get(tc_name)
+            if result is not None:
+                counts[result.verdict] += 1
+                logging.info("%-30s %-5s bench %-10s exit code %s in %s seconds" % (tc_name, result.verdict, result.bench_name, result.ret_code, round(result.elapsed, 2)))
+        logging.info("Group Result: %d PASS, %d FAIL, %d N/A" % (counts['PASS'], counts['FAIL'], counts['N/A']))
+        logging.info("Group Execution Time [%s] seconds" % round(time.time() - start_time, 2))
+        return [self.results.get(tc_name) for tc_name in tc_list]
+
+
+    @staticmethod
+    def get_verdict(bench, tc_name, start_time):
+        """Reads the final test result of a test case run from its TMS result file.
+
+        Args:
+            bench (object): The TestBenchProfile object.
+            tc_name (str): The test case ID.
+            start_time (float): The time the test case was started, older files are ignored.
+
+        Returns PASS or FAIL, N/A if the run wrote no result.
+        """
+        result_file = bench.get_result_file(tc_name)
+        try:
+            if os.path.getmtime(result_file) < int(start_time):
+                return 'N/A'
+            with open(result_file, 'r') as f:
+                verdict = json.load(f)["TmsTestResult"]["TestResult"]
+        except (OSError, IOError, ValueError, KeyError, TypeError), e:
+            logging.debug("No result of test case %s on bench %s: %s" % (tc_name, bench.name, e))
+            return 'N/A'
+        if verdict in ('PASS', 'FAIL'):
+            return verdict
+        return 'N/A'
+
+
+    def run_bench(self, bench):
+        """Runs test cases on a bench until the group is drained.
+
+        Args:
+            bench (object): The TestBenchProfile object.
+        """
+        while True:
+            try:
+                tc_name = self.tc_queue.get_nowait()
+            except Empty:
+                break
+
+            logging.info("START: TEST CASE [%s] on bench %s" % (tc_name, bench.name))
+            start_time = time.time()
+            env = dict(os.environ)
+            env["WTS_CLI_PORT"] = str(bench.cli_port)
+            try:
+                ret_code = subprocess.call(bench.get_worker_command(self.prog_name, tc_name), cwd=bench.src_path, env=env)
+            except OSError, e:
+                logging.error("Bench %s could not start test case %s: %s" % (bench.name, tc_name, e))
+                ret_code = None
+
+            verdict = 'N/A'
+            if ret_code is not None:
+                verdict = TestBenchScheduler.get_verdict(bench, tc_name, start_time)
+            with self.lock:
+                self.results[tc_name] = TestBenchResult(tc_name, bench.name, ret_code, time.time() - start_time, verdict)
+            logging.info("END: TEST CASE [%s] on bench %s - %s" % (tc_name, bench.name, verdict))
@@ -0,0 +1,80 @@
+###############################################################################
+#
+# Copyright (c) 2016 Wi-Fi Alliance
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER
+# RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT,
+# NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE
+# USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+###############################################################################
+
+#!/usr/bin/env python
+
+"""
+Parsed CAPI replies
+"""
+
+
+class CapiResponse(object):
+    """The class that tokenizes a status,<STATUS>,k1,v1,k2,v2... CAPI reply once.
+
+    Attributes:
+        line (str): The reply without the trailing line break.
+        items (list): The comma separated items of the reply.
+        status (str): The reply status, e.g. COMPLETE, RUNNING, INVALID or ERROR.
+        names (list): The value names in reply order.
+        values (dictionary): The values keyed by name, the first value wins if a
+            name is repeated.
+
+    """
+    __slots__ = ('line', 'items', 'status', 'names', 'values')
+
+    def __init__(self, line):
+        self.line = line.rstrip('\r\n') if line else ""
+        self.items = self.line.split(',')
+        self.status = self.items[1] if len(self.items) > 1 else ""
+
+        values = self.items[3::2]
+        self.names = self.items[2:2 + 2 * len(values):2]
+        # built from the end so that the first occurrence of a name is kept
+        self.values = dict(zip(reversed(self.names), reversed(values)))
+
+
+    def is_complete(self):
+        """Checks if the reply reports status,COMPLETE.
+        """
+        return self.status == 'COMPLETE'
+
+
+    def has_key(self, key):
+        """Checks if the reply carries a value for the key.
+
+        Args:
+            key (str): The value name.
+        """
+        return self.get(key) is not None
+
+
+    def get(self, key, default=None):
+        """Gets the value of a key with leading white spaces removed.
+
+        Args:
+            key (str): The value name.
+            default (str): The value returned if the reply does not carry the key.
+        """
+        value = self.values.get(key)
+        if value is None:
+            return default
+        return value.lstrip()
+
+
+    def __str__(self):
+        return self.line
@@ -27,6 +27,8 @@ class ExecutionQueue(object):
         
         self.name = name
         self.q = Queue()
+        # control agent of the task being executed from this queue
+        self.curr_ipport = None
 
     def empty(self):
         """Removes all tasks on the queue."""
@@ -27,7 +27,6 @@ import ctypes
 import thread
 import threading
 import random
-import subprocess, platform, os
 from socket import *
 from select import select
 from random import randrange
@@ -35,6 +34,8 @@ from random import randrange
 from netcomm.netsocket import NetCommClient, NetCommServer
 from testinfo.datastream import streamInfo, streamResult
 from core.symtable import TestScriptSymbolTable
+from core.paramtemplate import CapiParamTemplate
+from core.capiresponse import CapiResponse
 from util.misc import Util
 from features.validation import ValidationExternal
 
@@ -46,21 +47,80 @@ class ValueTable:
     recv_id = {}
     oplist = []
     traffic_done = False
-    client_net = None
-    clisock_ip = {}
     lock = threading.RLock()
-    
-    @staticmethod
-    def sock_tcp_conn(ipa, ipp):        
-        if "%s:%s" %(ipa, ipp) in NetCommServer.conntable:
-            #logging.info('Already Connected to - IP Addr = %s Port =%s', ipa, ipp)
-            #client_sock = NetCommServer.conntable["%s:%s" %(ipa, ipp)]
-            return
-        
-        ValueTable.client_net = NetCommClient(AF_INET,SOCK_STREAM)
-        ValueTable.client_net.networkClientSockConnect(ipa, ipp)            
-        NetCommServer.conntable["%s:%s" %(ipa, ipp)] = ValueTable.client_net.sock
-        ValueTable.clisock_ip["%s:%s" %(ipa, ipp)] = ValueTable.client_net
+
+class ExecutionTaskPlan(object):
+    """The compiled form of a task, built once when the execution queue is constructed.
+
+    Attributes:
+        cmd: The command the plan was compiled for
+        type: The task type the plan was compiled for, UCCAction or UCCCommand
+        param: The param string the arguments were split from
+        handler: The ExecutionTask function running the task, None for the no-op commands
+        pre_handler: The ExecutionTask function to be run before the handler
+        keep_result: The flag to indicate the handler return value is the task result
+        is_conditional: The flag to indicate the handler also runs inside a false if branch
+        is_unknown: The flag to indicate no handler exists for the UCC action
+        has_vars: The flag to indicate the param refers to variables
+        args: The param split by args_delimiter, None if it refers to variables
+        args_delimiter: The delimiter of the handler arguments
+        ret_type: The return data type, e.g. STREAMID or RECV_ID, None without return value
+        ret_key: The return variable string
+        ret_vars: The return variable names
+    """
+    __slots__ = ('cmd', 'type', 'param', 'handler', 'pre_handler', 'keep_result', 'is_conditional',
+                 'is_unknown', 'has_vars', 'args', 'args_delimiter', 'ret_type', 'ret_key', 'ret_vars')
+
+    conditional_handlers = {"if" : "if_statement", "else" : "else_statement", "endif" : "endif_statement"}
+    noop_actions = ("SEPRATROR", "ResultCheck", "CheckThroughput", "config_multi_subresults")
+    #CAPI commands handled locally, name => (handler, pre_handler, keep_result)
+    command_handlers = {"traffic_agent_send" : ("traffic_agent_send", None, True),
+                        "traffic_agent_receive_stop" : ("traffic_agent_receive_stop", None, True),
+                        "sta_is_connected" : ("sta_is_connected", None, False),
+                        "sniffer_control_stop" : ("send_capi", "sniffer_control_stop", True),
+                        "externalfunc" : ("validation_external", None, False)}
+
+    def __init__(self, task):
+        self.cmd = task.cmd
+        self.type = task.type
+        self.param = task.param
+        self.handler = None
+        self.pre_handler = None
+        self.keep_result = True
+        self.is_conditional = False
+        self.is_unknown = False
+        self.has_vars = isinstance(task.param, basestring) and task.param.find("$") != -1
+        self.args = None
+        self.args_delimiter = "," if task.type == "UCCCommand" else "!"
+        self.ret_type = None
+        self.ret_key = ""
+        self.ret_vars = []
+
+        if task.cmd in ExecutionTaskPlan.conditional_handlers and task.type == "UCCAction":
+            self.handler = getattr(ExecutionTask, ExecutionTaskPlan.conditional_handlers[task.cmd])
+            self.is_conditional = True
+        elif task.type == "UCCAction":
+            if task.cmd != "" and task.cmd not in ExecutionTaskPlan.noop_actions:
+                self.handler = getattr(ExecutionTask, task.cmd.lower(), None)
+                self.is_unknown = self.handler is None
+        else:
+            handler, pre_handler, self.keep_result = ExecutionTaskPlan.command_handlers.get(task.cmd.lower(), ("send_capi", None, True))
+            self.handler = getattr(ExecutionTask, handler)
+            if pre_handler is not None:
+                self.pre_handler = getattr(ExecutionTask, pre_handler)
+
+        if isinstance(task.param, basestring) and not self.has_vars:
+            self.args = task.param.split(self.args_delimiter)
+
+        if task.ret:
+            self.ret_type = task.ret.keys()[0]
+            self.ret_key = task.ret.values()[0].keys()[0]
+            if self.ret_type == 'RECV_ID':
+                self.ret_vars = self.ret_key.split(' ')
+            else:
+                self.ret_vars = self.ret_key.split(',')
+
+
 
 class ExecutionTask(object):
     """Execution Task to be enqueued into Execution Queue.
@@ -71,14 +131,18 @@ class ExecutionTask(object):
         param: A dictionary of parameters with key/value pairs 
         ret: A dictionary of return variables with initial values set to an empty string
         ip: A string representing the IP address and port number
+        run_context: The RunContext object owning the symbol tables, data streams and connections
+        plan: The ExecutionTaskPlan object built by compile()
     """
-    def __init__(self, test_mngr_initr):
+    def __init__(self, test_mngr_initr, run_context):
         ret = {}
+        self.run_context = run_context
         self.cmd = "" # string
         self.param = "" # string
         self.ret = {} # dict
         self.ipport = "" # string
         self.recv = ""
+        self.response = None
         self.device_id = ""
         self.test_mngr_initr = test_mngr_initr
         self.testBedDeviceList = test_mngr_initr.test_prog_mngr.test_prog.testbed_dev_list
@@ -94,6 +158,8 @@ class ExecutionTask(object):
         #self.DisplayNameTable = {}
         self.DisplayNameTable = self.set_displayname()
         self.ori_param = ''
+        self.param_template = None
+        self.plan = None
 
         self.parallel = False
         self.queue_parallel_id = None
@@ -107,35 +173,35 @@ class ExecutionTask(object):
         
     @property
     def multicast(self):
-        return self.test_mngr_initr.test_data_strm_mngr.multicast
+        return self.run_context.data_strm_mngr.multicast
 
     @multicast.setter
     def multicast(self, value):
-        self.test_mngr_initr.test_data_strm_mngr.multicast = value
+        self.run_context.data_strm_mngr.multicast = value
 
     @property
     def running_phase(self):
-        return self.test_mngr_initr.test_data_strm_mngr.running_phase
+        return self.run_context.data_strm_mngr.running_phase
 
     @running_phase.setter
     def running_phase(self, value):
-        self.test_mngr_initr.test_data_strm_mngr.running_phase = value
+        self.run_context.data_strm_mngr.running_phase = value
 
     @property
     def RTPCount(self):
-        return self.test_mngr_initr.test_data_strm_mngr.RTPCount
+        return self.run_context.data_strm_mngr.RTPCount
 
     @RTPCount.setter
     def RTPCount(self, value):
-        self.test_mngr_initr.test_data_strm_mngr.RTPCount = value
+        self.run_context.data_strm_mngr.RTPCount = value
 
     @property
     def resultPrinted(self):
-        return self.test_mngr_initr.test_data_strm_mngr.resultPrinted
+        return self.run_context.data_strm_mngr.resultPrinted
 
     @resultPrinted.setter
     def resultPrinted(self, value):
-        self.test_mngr_initr.test_data_strm_mngr.resultPrinted = value
+        self.run_context.data_strm_mngr.resultPrinted = value
 
 
     def condreplace(self, exprs):
@@ -146,167 +212,103 @@ class ExecutionTask(object):
             self.param = self.param.replace(exprs, new_exprs)
 
     def execute(self):
-	    #ret_data_def_type = self.ret.split(',')
-        #logging.debug("Command Return Type = %s" % (ret_data_def_type[0].lower()))
-        #if ret_data_def_type[0] == 'STREAMID' or ret_data_def_type[0] == 'INTERFACEID' or ret_data_def_type[0] == 'PING':
-        #    self.ret = 
-        #    ret_data_idx = ret_data_def_type[1]
-        #elif ret_data_def_type[0] == 'RECV_ID':
-        #    recv_value = ret_data_def_type[1].split(' ')
-        #    i = 0
-        #    for r in recv_value:
-        #        ValueTable.recv_id[i] = r
-        #        i += 1
-        #    logging.debug('RECV ID %s', ValueTable.recv_id)
-        #print "self.param = " + self.param
-        if TestScriptSymbolTable.test_script_sym_tab["ifCondBit"] == False:
-            if self.cmd == "if":
-                return getattr(self, "if_statement")()
-            elif self.cmd == "else":
-                return getattr(self, "else_statement")()
-            elif self.cmd == "endif":
-                return getattr(self, "endif_statement")()
-            else:
-                return 'SKIP'
+        """
+        Run the task through the handler resolved by compile()
+        """
+        plan = self.plan
+        if plan is None or plan.cmd != self.cmd or plan.type != self.type:
+            plan = self.compile()
+
+        if self.run_context.test_script_sym_tab["ifCondBit"] == False:
+            if plan.is_conditional:
+                return plan.handler(self)
+            return 'SKIP'
         self.ori_param = self.param
-        flag = 0
         if self.cmd == "":
             return
-        if (self.param.find("$") != -1): 
-            if self.cmd == "if":
-                self.param = self.param.replace(" or ", "!or!")
-                self.param = self.param.replace(" and ", "!and!")
-                self.param = self.param.replace("=", "!=!")
-                self.param = self.param.replace("<", "!<!")
-                self.param = self.param.replace(">", "!>!")
-                self.param = self.param.replace("!!", "")
-                capi_elem = self.param.split('!')
-                #print "self.param = " + self.param
-            elif self.cmd == "ResultCheck":
-                capi_elem_temp = self.param.split('!')
-                #print "capi_elem_temp = " + capi_elem_temp[1]
-                capi_elem = capi_elem_temp[1].split(',')
-            elif self.cmd == "CheckThroughput":
-                capi_elem_temp = self.param.split('!')
-                #print "capi_elem_temp = " + capi_elem_temp[1]
-                capi_elem = capi_elem_temp[1].split(',')
-            elif self.cmd == 'define':
-                capi_elem_temp = self.param.split('!')
-                #print 'self.param'
-                #print self.param
-                capi_elem = capi_elem_temp
-                flag = 1
-            elif self.cmd == "traffic_agent_send":
-                capi_elem_temp = self.param.split(',')
-                #print "capi_elem_temp = " + capi_elem_temp[1]
-                capi_elem = capi_elem_temp[1].split(' ')
-            elif self.cmd == "traffic_agent_receive_stop":
-                capi_elem_temp = self.param.split(',')
-                #print "capi_elem_temp = " + capi_elem_temp[1]
-                capi_elem = capi_elem_temp[1].split(' ')
-            elif self.cmd == "math" or self.cmd =="config_multi_subresults" or self.cmd =="cat":
-                #skip for loop below
-                flag = 1
-            elif self.cmd == "getuserinput":
-                #skip for loop below
-                capi_elem = self.param.split(',')
-                flag = 1
-            elif self.cmd == "StoreThroughput":
-                capi_elem_temp = self.param.split('!')
-                #print "capi_elem_temp = " + capi_elem_temp[1]
-                capi_elem = capi_elem_temp[1].split(',')
-                #flag = 1
-            else:
-                capi_elem = self.param.split(',')
-            if flag != 1:
-                index = 0
-                for i in capi_elem:
-                    #print "capi_elem[index] = " + capi_elem[index]
-                    if (capi_elem[index].find("$") != -1):
-                        try:
-                            if capi_elem[index] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                                self.param = self.param.replace(capi_elem[index], str(TestScriptSymbolTable.capi_cmd_ret_sym_tab[capi_elem[index]]))
-                            elif capi_elem[index] in TestScriptSymbolTable.test_script_sym_tab:
-                                self.param = self.param.replace(capi_elem[index], str(TestScriptSymbolTable.test_script_sym_tab[capi_elem[index]]))
-                            else:
-                                if (capi_elem[index].find("!") == -1):
-                                    print "KEY NOT FOUND : " + capi_elem[index]									
-                            #print "after self.param = " + self.param
-                            
-                        except:
-                            raise Exception('Error to replace  - %s' % capi_elem[index])
-                    index = index + 1
-
-        #self.setRetVal(self.getRetKey(retDict), ret_val)
-        if self.ret:
+        if self.param.find("$") != -1:
+            if self.param_template is None or self.param_template.source != self.param:
+                self.param = CapiParamTemplate.normalize(self.cmd, self.param)
+                if self.param_template is None or self.param_template.source != self.param:
+                    self.param_template = CapiParamTemplate.get_for_command(self.cmd, self.param)
+            if self.param_template is not None:
+                self.param = self.param_template.render(self.resolve_param_variable)
+
+        if plan.ret_type is not None:
             logging.debug ("ret    : %s" % str(self.ret))
-            retKey = ""
-
-            for key, val in self.ret.items():
-                retKey = val.keys()[0]
-            #ret_data_def_type = self.getRetKey(retDict)self.ret.split(',')
-            if self.ret.keys()[0] == 'STREAMID' or self.ret.keys()[0] == 'INTERFACEID' or self.ret.keys()[0] == 'PING':
-                ret_data_idx = retKey
-            elif self.ret.keys()[0] == 'RECV_ID':
-                recv_value = retKey.split(' ')
+            if plan.ret_type == 'RECV_ID':
                 i = 0
-                for r in recv_value:
-                    ValueTable.recv_id[i] = TestScriptSymbolTable.capi_cmd_ret_sym_tab[r]
+                for r in plan.ret_vars:
+                    ValueTable.recv_id[i] = self.run_context.capi_cmd_ret_sym_tab[r]
                     i += 1
                 logging.debug('RECV ID %s', ValueTable.recv_id)
 
-        if self.type == "UCCAction":
-            if self.cmd == "if":
-                return getattr(self, "if_statement")()
-            elif self.cmd == "else":
-                return getattr(self, "else_statement")()
-            elif self.cmd == "endif":
-                return getattr(self, "endif_statement")()
-            elif self.cmd == "SEPRATROR":
-                return 
-            elif self.cmd == "ResultCheck":
-                return
-            elif self.cmd == "CheckThroughput":
-                return
-            elif self.cmd == "config_multi_subresults":
-                return
-            if TestScriptSymbolTable.test_script_sym_tab["ifCondBit"] == False:
-                return
-            else:
+        if plan.pre_handler is not None:
+            plan.pre_handler(self)
+        if plan.handler is None:
+            if plan.is_unknown:
+                # keep the error an unknown UCC action always raised
                 return getattr(self, self.cmd.lower())()
-        elif self.type == "UCCCommand":
-            if self.cmd.lower() == "traffic_agent_send":
-                self.traffic_agent_send()
-                return
-            elif self.cmd.lower() == "traffic_agent_receive_stop":
-                self.traffic_agent_receive_stop()
-                return
-            elif self.cmd.lower() == "sta_is_connected":
-                self.sta_is_connected()
-                return
-            elif self.cmd.lower() == "sniffer_control_stop":
-                self.sniffer_control_stop()
-            elif self.cmd.lower() == "externalfunc":
-                self.validation_external()
-                return
-            return self.send_capi()            
+            return
+        result = plan.handler(self)
+        if plan.keep_result:
+            return result
         return
 
+    def compile(self):
+        """
+        Resolve the handler, the arguments and the return bindings of the task once
+        """
+        self.plan = ExecutionTaskPlan(self)
+        self.compile_param()
+        return self.plan
+
+    def get_args(self, delimiter):
+        """
+        Get the param split by the delimiter, the split done by compile() is reused while the param is unchanged
+        """
+        plan = self.plan
+        if plan is not None and plan.args is not None and plan.args_delimiter == delimiter and plan.param == self.param:
+            return list(plan.args)
+        return self.param.split(delimiter)
+
+    def compile_param(self):
+        """
+        Compile the variable substitution template of the param string ahead of execution
+        """
+        if isinstance(self.param, basestring) and self.param.find("$") != -1:
+            self.param_template = CapiParamTemplate.get_for_command(self.cmd, CapiParamTemplate.normalize(self.cmd, self.param))
+
+    def resolve_param_variable(self, name):
+        """
+        Look up a param variable in the CAPI return table first and then in the script symbol table
+        """
+        try:
+            if name in self.run_context.capi_cmd_ret_sym_tab:
+                return str(self.run_context.capi_cmd_ret_sym_tab[name])
+            elif name in self.run_context.test_script_sym_tab:
+                return str(self.run_context.test_script_sym_tab[name])
+            elif name.find("!") == -1:
+                print "KEY NOT FOUND : " + name
+        except:
+            raise Exception('Error to replace  - %s' % name)
+        return None
+
     def setRetVal(self, key, val):
         """
         set capi return to global symbol table
         """
         if isinstance(key, str):
-            TestScriptSymbolTable.insert_sym_tab(key, val, TestScriptSymbolTable.capi_cmd_ret_sym_tab)
+            TestScriptSymbolTable.insert_sym_tab(key, val, self.run_context.capi_cmd_ret_sym_tab)
         elif isinstance(key, dict):
             if key:
                 for i in len(key):
-                    TestScriptSymbolTable.insert_sym_tab(key[i], val[i], TestScriptSymbolTable.capi_cmd_ret_sym_tab)
+                    TestScriptSymbolTable.insert_sym_tab(key[i], val[i], self.run_context.capi_cmd_ret_sym_tab)
         elif isinstance(key, list):
             if key:
                 i = 0
                 for kVal in key:
-                    TestScriptSymbolTable.insert_sym_tab(kVal, val[i], TestScriptSymbolTable.capi_cmd_ret_sym_tab)
+                    TestScriptSymbolTable.insert_sym_tab(kVal, val[i], self.run_context.capi_cmd_ret_sym_tab)
                     i = i+1
         else:
             logging.debug ("setRetVal error : wrong type..")
@@ -348,7 +350,7 @@ class ExecutionTask(object):
 
     def pinginternalchk(self):
         val = self.get_param()
-        TestScriptSymbolTable.insert_sym_tab('PingInternalChk', val, TestScriptSymbolTable.test_script_sym_tab)
+        TestScriptSymbolTable.insert_sym_tab('PingInternalChk', val, self.run_context.test_script_sym_tab)
 
 
     def check_parallel(self, cmd=None):
@@ -442,6 +444,15 @@ class ExecutionTask(object):
         """
         return self.ret
 
+    def get_response(self):
+        """
+        Get the CapiResponse object of the received reply, the reply is only parsed once
+        """
+        recv = self.recv or ""
+        if self.response is None or self.response.line != recv.rstrip('\r\n'):
+            self.response = CapiResponse(recv)
+        return self.response
+
     def set_ret(self, ret):
         """
         Set return dictionary, which is the key/value pair returns in this case
@@ -510,22 +521,7 @@ class ExecutionTask(object):
         """
         return self.status
 
-    def ping(self, host):
-        """
-        Returns True if host responds to a ping request
-        """
-        # Ping parameters as function of OS
-        ping_str = "-n 1" if  platform.system().lower()=="windows" else "-c 1"
-        args = "ping " + " " + ping_str + " " + host
-        #need_sh = False if  platform.system().lower()=="windows" else True
-
-        # Ping
-        return subprocess.call(args, stdout=open(os.devnull, 'wb')) == 0
-
-        
-
     def send_capi(self):
-        buffer = 2048
         split_ipport_data = self.ipport.split(':')
         #print "send_capi: ip ", split_ipport_data[0], " port", split_ipport_data[1]
 
@@ -543,67 +539,76 @@ class ExecutionTask(object):
             Util.set_color(Util.FOREGROUND_INTENSITY)
             return "FAIL"
         
-        pingchk = self.ping(split_ipport_data[0])
-        pingchk = self.ping(split_ipport_data[0])
-        if pingchk == False and self.parallel == False:
-            Util.set_color(Util.FOREGROUND_RED | Util.FOREGROUND_INTENSITY)
-            logging.info("Network Connection Failure - NO IP Connection -- Aborting the test")
-            Util.set_color(Util.FOREGROUND_INTENSITY)
+        # the response dispatcher owns the socket while it watches the agent
+        watching = self.run_context.dispatcher.is_watching(self.ipport)
+        client = self.run_context.conn_pool.get_client(split_ipport_data[0], split_ipport_data[1], not watching)
+        if client is None:
+            if self.parallel == False:
+                Util.set_color(Util.FOREGROUND_RED | Util.FOREGROUND_INTENSITY)
+                logging.info("Network Connection Failure - NO IP Connection -- Aborting the test")
+                Util.set_color(Util.FOREGROUND_INTENSITY)
             return "FAIL"
 
-        try:       
+        waiter = None
+        if watching:
+            waiter = self.run_context.dispatcher.expect_reply(self.ipport)
 
-            ValueTable.lock.acquire()
-            
-            #print "create new socket"
-            ValueTable.sock_tcp_conn(split_ipport_data[0], split_ipport_data[1])
-            client = ValueTable.clisock_ip[self.ipport]
-            ValueTable.lock.release()
-            
+        try:       
             client.networkClientSockSend(cmd)
 
-            socktimeout = TestScriptSymbolTable.get_value_from_sym_tab("socktimeout", TestScriptSymbolTable.test_script_sym_tab)
-            if socktimeout > 0 :
-                client.networkClientSockTimeout(int(socktimeout))
-            else:
-                client.networkClientSockTimeout(240)
+            socktimeout = TestScriptSymbolTable.get_value_from_sym_tab("socktimeout", self.run_context.test_script_sym_tab)
+            if socktimeout <= 0 :
+                socktimeout = 240
+            client.networkClientSockTimeout(int(socktimeout))
+
+            reader = self.run_context.conn_pool.get_reader(self.ipport)
+            self.recv = self.read_reply_line(reader, waiter, int(socktimeout))
+
+            # Status,Running is followed by the actual reply unless do-not-block is set
+            if self.recv.startswith("status,RUNNING"):
+                if self.run_context.test_script_sym_tab["iDNB"] == 0:
+                    self.recv = self.read_reply_line(reader, waiter, int(socktimeout))
+                else:
+                    self.run_context.test_script_sym_tab["iDNB"] = 0
 
-            self.recv = client.networkClientSockRecv(buffer)
+            # keep any further lines of a multi-line reply (e.g. sniffer check results)
+            if waiter is None:
+                extra_lines = reader.drain_lines()
+                if extra_lines:
+                    self.recv = '\n'.join([self.recv] + extra_lines)
 
         except:
+            self.run_context.conn_pool.release(self.ipport)
             return "FAIL"
-        
+        finally:
+            if waiter is not None:
+                self.run_context.dispatcher.release_reply(waiter)
 
-        # Status,Running
-        # Quick fix for case where AzWTG sends response RUNNING and COMPLETED in one read
-
-        if len(self.recv) > 25:
-            if self.recv.find("status,RUNNING\n") != -1:
-                self.recv = self.recv.split('\n')
-                self.recv = self.recv[1]
-            elif self.recv.find("status,RUNNING\r\n") != -1:
-                self.recv = self.recv.replace('status,RUNNING\r\n', '')
-            elif self.recv.find("status,RUNNING\n\r") != -1:
-                self.recv = self.recv.replace('status,RUNNING\n\r', '')
-            elif self.recv.find("status,RUNNING") != -1:
-                logging.info("Missing new line after status,RUNNING")
-                self.recv = self.recv.replace('status,RUNNING', '')
-        else:
-            if TestScriptSymbolTable.test_script_sym_tab["iDNB"] == 0:
-                self.recv = client.networkClientSockRecv(buffer)
-            else:
-                TestScriptSymbolTable.test_script_sym_tab["iDNB"] = 0
+        if self.recv == '':
+            logging.info("Connection to %s closed by the control agent" % self.ipport)
+            self.run_context.conn_pool.release(self.ipport)
         #ExecConnect.networkClientSockClose()
         return
+
+
+    def read_reply_line(self, reader, waiter, timeout):
+        """Reads a reply line from the response dispatcher or directly from the socket"""
+        if waiter is not None:
+            line = waiter.get_line(timeout)
+            if line is not None:
+                return line
+            # dispatcher stopped meanwhile, the socket is ours again
+        return reader.read_line()
     
     
     def send_capi_select(self):        
         buffer = 1024
         split_ipport_data = self.ipport.split(':')
         #print "send_capi: ip ", split_ipport_data[0], " port", split_ipport_data[1]
-        ValueTable.sock_tcp_conn(split_ipport_data[0], split_ipport_data[1])
-        
-        client = ValueTable.clisock_ip[self.ipport]
+        client = self.run_context.conn_pool.get_client(split_ipport_data[0], split_ipport_data[1], not self.run_context.dispatcher.is_watching(self.ipport))
+        if client is None:
+            logging.info("Network Connection Failure - NO IP Connection to %s" % self.ipport)
+            return "FAIL"
         
         #=======================================================================
         # for tbd in self.testBedDeviceList:
@@ -611,6 +616,7 @@ class ExecutionTask(object):
         #=======================================================================
             
         cmd = self.cmd + "," + self.param + " \r\n"
+        self.run_context.dispatcher.watch(self.ipport, self.process_stream_response)
         client.networkClientSockSend(cmd)
         #self.client.networkClientSockTimeout(120)
         ##client.networkClientSockTimeout(10)
@@ -626,48 +632,17 @@ class ExecutionTask(object):
         """
 
     # UCC Command Methods
-    def read1line(self, s):
-        """To resolve a readline problem with multiple messages in one line"""
-        ret = ''
-        c = ''
-        while True:
-            try:
-                c = s.recv(1)
-                c.strip()
-            except OSError, e:
-                logging.info("Recv error: " + e)
-                #print "Socket error " + e
-            except :
-                #print "exception----"
-                pass
-
-            if c == '\n' or c == '':
-                if c == '':
-                    #logging.info("get a null char")
-                    pass
-                    
-                break
-            else:
-                ret += c
-
-        return ret + '\n'	
-
-    
     def set_displayname(self):
-        displayNameTable = {}      
-        for tbd in self.test_mngr_initr.test_prog_mngr.test_prog.testbed_dev_list:
-            displayNameTable.setdefault("%s:%s" % (tbd.ctrlipaddr, tbd.ctrlport), tbd.displayname)
-        
-        return displayNameTable
+        return self.test_mngr_initr.testbed_dev_mngr.get_testbed_dev_index().displayname_by_ipport
 
 
     def responseWaitThreadFunc(self, _threadID, command, addr, receiverStream):
                 
         """Thread runs until send string completion or when test stops running"""
-        if "$MT" in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
+        if "$MT" in self.run_context.capi_cmd_ret_sym_tab:
             logging.info("MT START")
             while 1:
-                if TestScriptSymbolTable.capi_cmd_ret_sym_tab["$MT"] == "0":
+                if self.run_context.capi_cmd_ret_sym_tab["$MT"] == "0":
                     break
                 time.sleep(0.1)
             logging.info("MT STOP")
@@ -687,115 +662,77 @@ class ExecutionTask(object):
         #print self.DisplayNameTable
         #print NetCommServer.conntable
         #thread_sock = self.sock
-        logging.debug("responseWaitThreadFunc started %s" % TestScriptSymbolTable.test_script_sym_tab["testRunning"])
-        while TestScriptSymbolTable.test_script_sym_tab["testRunning"] > 0:
-            #print "in thread while---" + str(TestScriptSymbolTable.test_script_sym_tab["testRunning"])
-            #Temporarily commented. Will be tested on VHT to confirm removal
-            readables, writeables, exceptions = select(NetCommServer.SOCK_READABLE, NetCommServer.SOCK_WRITABLE, NetCommServer.SOCK_ERROR, 0.1)
-            for sockobj in readables:
-                if sockobj in NetCommServer.SOCK_WAIT:
-                    #Resolve the issue in reading 1 single line with multiple messages
-                    resp = self.read1line(sockobj)
-                    #print "thread while after read1line resp---> " + resp
-                    #responseIPAddress = ""
-                    resp_arr = resp.split(',')
-                    
-                    responseIPAddress = ""
-                    for sock in NetCommServer.conntable:
-                        if sockobj == NetCommServer.conntable[sock]:
-                            responseIPAddress = sock
-                            #print "response IP address %s ..." % responseIPAddress
-                    displayname = responseIPAddress
-                    #displayaddr = ""     
-                    if responseIPAddress in self.DisplayNameTable:
-                        displayname = self.DisplayNameTable[responseIPAddress]
-                        #print "self.ipport:%s" % self.ipport
-                    #if not resp:
-                    logging.info("%-15s <--1 %s" % (displayname, resp))
-
-                    if re.search("RUNNING", resp):
-                        resp = resp.strip()
-                        resp = resp.lstrip('status,RUNNING')
-                        resp = resp.strip() 
-                        #print " RUNNING ---"
-                        continue
-                    elif re.search("COMPLETE", resp):
-                        logging.debug("THREAD ---- > Complete Returned")
-                        self.recv = resp
-                    else:
-                        #logging.debug("Did not receive expected RUNNING or COMPLETE response, check device local log for additional information")
-                        continue
-                    
-                    #logging.info("%-15s <--1 %s" % (displayname, resp))
-                    
-                    #logging.debug("%-15s <--2 %s" % (displayname, resp))
-                    
-                    #===========================================================
-                    #if self.test_mngr_initr.test_data_strm_mngr.data_strm.event:
-                    #    self.test_mngr_initr.test_data_strm_mngr.data_strm.event.set()
-                    #    time.sleep(2)
-                    #===========================================================
-                    
-                    # Check for send stream completion
-                    if len(resp_arr) > 2:
-                        if resp_arr[3] == '':
-                            logging.error("NULL streamID returned from %s" % self.ipport)
-                            continue
-                        if resp_arr[2] == 'streamID':
-                            logging.debug("STREAM COMPLETED = %s" % (resp_arr[3]))
-
-                            # spliting the values of multiple streams
-                            idx = resp_arr[3].strip()
-                            idx = idx.split(' ')
-                            sCounter = 0 # For mutliple stream value returns
-                            if resp_arr[7].split(' ')[sCounter] == '':
-                                sCounter = 1
-                            
-                            for i in idx:
-                                txFrames = resp_arr[5].split(' ')[sCounter]
-                                logging.debug(" TXFRAMES = %s" % txFrames)
-                                #i = ("%s;%s"%(i, self.ipport))
-                                if txFrames != '0':
-                                    logging.info("%s (%-15s) <--  SEND Stream - %s Completed " % (displayname, responseIPAddress, i))
-                                    
-                                    # Setting status complete
-                                    for p in self.test_mngr_initr.test_data_strm_mngr.data_strm.streamInfoArray:
-                                        if p.IPAddress == responseIPAddress and p.streamID == i and p.phase == self.running_phase:
-                                            p.status = 1
-                                            #print "set status ---> 1"
-                                            #print "response ip ----> %s" % responseIPAddress
-                                    self.test_mngr_initr.test_data_strm_mngr.data_strm.streamSendResultArray.append(streamResult(i, responseIPAddress, resp_arr[7].split(' ')[sCounter], resp_arr[5].split(' ')[sCounter], resp_arr[11].split(' ')[sCounter], resp_arr[9].split(' ')[sCounter], self.running_phase))
-
-                                else:
-                                    self.test_mngr_initr.test_data_strm_mngr.data_strm.streamRecvResultArray.append(streamResult(i, responseIPAddress, resp_arr[7].split(' ')[sCounter], resp_arr[5].split(' ')[sCounter], resp_arr[11].split(' ')[sCounter], resp_arr[9].split(' ')[sCounter], self.running_phase))
-                                    logging.info("%s (%-15s) <----  RECV Stream - %s Completed " % (displayname, responseIPAddress, i))
-                                    #ValueTable.traffic_done = True
-    
-                                sCounter += 1
-                            
-                            #sockobj.close()
-                            #print "closing the socket %s ..." % responseIPAddress
-                            #if sockobj in NetCommServer.conntable:
-                            #    del NetCommServer.conntable[sockobj]
-                            #print NetCommServer.SOCK_READABLE
-                            ##NetCommServer.SOCK_READABLE.remove(sockobj)
-                            ##NetCommServer.SOCK_WAIT.remove(sockobj)
-                            #print NetCommServer.SOCK_READABLE
-                else:
-                    #logging.debug('Unwanted data on socket')
-                    pass    
-        #print "TEST---->  THREAD ENDS!!!"
+        logging.debug("responseWaitThreadFunc started %s" % self.run_context.test_script_sym_tab["testRunning"])
+        # blocks in select() until an agent responds or the test stops running
+        self.run_context.dispatcher.watch_all(self.process_stream_response)
+        self.run_context.dispatcher.run()
         return
 
+    def process_stream_response(self, responseIPAddress, resp):
+        """Handles a single response line received by the response wait thread"""
+        displayname = responseIPAddress
+        if responseIPAddress in self.DisplayNameTable:
+            displayname = self.DisplayNameTable[responseIPAddress]
+        logging.info("%-15s <--1 %s" % (displayname, resp))
+
+        if re.search("RUNNING", resp):
+            return
+        elif re.search("COMPLETE", resp):
+            logging.debug("THREAD ---- > Complete Returned")
+            self.recv = resp
+        else:
+            #logging.debug("Did not receive expected RUNNING or COMPLETE response, check device local log for additional information")
+            return
+
+        resp_arr = resp.split(',')
+
+        # Check for send stream completion
+        if len(resp_arr) > 2:
+            if resp_arr[3] == '':
+                logging.error("NULL streamID returned from %s" % self.ipport)
+                return
+            if resp_arr[2] == 'streamID':
+                logging.debug("STREAM COMPLETED = %s" % (resp_arr[3]))
+
+                # spliting the values of multiple streams
+                idx = resp_arr[3].strip()
+                idx = idx.split(' ')
+                sCounter = 0 # For mutliple stream value returns
+                if resp_arr[7].split(' ')[sCounter] == '':
+                    sCounter = 1
+
+                for i in idx:
+                    txFrames = resp_arr[5].split(' ')[sCounter]
+                    logging.debug(" TXFRAMES = %s" % txFrames)
+                    if txFrames != '0':
+                        logging.info("%s (%-15s) <--  SEND Stream - %s Completed " % (displayname, responseIPAddress, i))
+
+                        # Setting status complete
+                        p = self.run_context.data_strm_mngr.data_strm.get_stream_info(i, responseIPAddress, self.running_phase)
+                        if p is not None:
+                            p.set_complete()
+                        self.run_context.data_strm_mngr.data_strm.add_send_result(streamResult(i, responseIPAddress, resp_arr[7].split(' ')[sCounter], resp_arr[5].split(' ')[sCounter], resp_arr[11].split(' ')[sCounter], resp_arr[9].split(' ')[sCounter], self.running_phase))
+
+                    else:
+                        self.run_context.data_strm_mngr.data_strm.add_recv_result(streamResult(i, responseIPAddress, resp_arr[7].split(' ')[sCounter], resp_arr[5].split(' ')[sCounter], resp_arr[11].split(' ')[sCounter], resp_arr[9].split(' ')[sCounter], self.running_phase))
+                        logging.info("%s (%-15s) <----  RECV Stream - %s Completed " % (displayname, responseIPAddress, i))
+
+                    sCounter += 1
+
     def sniffer_control_stop(self):
-        time.sleep(2)
-        TestScriptSymbolTable.test_script_sym_tab["testRunning"] = 0
-        time.sleep(2)
+        settle_time = self.test_mngr_initr.test_prog_mngr.test_prog.sniffer_settle_time
+        if settle_time > 0:
+            time.sleep(settle_time)
+        self.run_context.test_script_sym_tab["testRunning"] = 0
+        self.run_context.dispatcher.stop()
+        self.run_context.data_strm_mngr.data_strm.drop_pending_results()
+        if settle_time > 0:
+            time.sleep(settle_time)
 
     def traffic_agent_receive_stop(self):
         
         capi_run = self.cmd + ',' + self.param
-        capi_elem = self.param.split(',')
+        capi_elem = self.get_args(',')
         idx = capi_elem.index('streamID')
         #print "traffic_agent_receive_stop --->"
         # Wait for Send to finish, in case of receive_stop
@@ -806,38 +743,45 @@ class ExecutionTask(object):
         #print "idx : " + str(idx)
         
         capi_elem[idx+1] = ''
+        test_prog = self.test_mngr_initr.test_prog_mngr.test_prog
         for i in sid:
             val = i
             logging.debug("val--->%s" % val)
             if re.search(";", i):
                 val = i.split(";")[0]
 
-            for p in self.test_mngr_initr.test_data_strm_mngr.data_strm.streamInfoArray:
+            for p in self.run_context.data_strm_mngr.data_strm.streamInfoArray:
                 #print "in for loop ---> p.pairID / p.phase / p.status :" + str(p.pairID) +'/'+  p.phase + '/' + str(p.status)
                 #print "in for loop ---> i / self.runningPhase / p.status : " + i +'/'+ self.running_phase + '/' + str(p.status)
                 if p.pairID == i and p.phase == self.running_phase:
-                    while (p.status != 1):
-                        #Minor sleep to avoid 100% CPU Usage by rapid while
-                        #print "waiting..."
-                        time.sleep(0.5)
+                    # woken up by the response dispatcher once the send stream completes
+                    if not p.wait_complete(test_prog.stream_timeout):
+                        logging.info("Timed out after %s seconds waiting for send stream %s to complete" % (test_prog.stream_timeout, p.streamID))
                     #print "status %s ..." % p.status
                     ##print "pairID %s ..." % p.pairID
                     #print "running_phase %s ..." % p.phase
                     break
         
+        # the receive results are reported asynchronously with the reply
+        for i in sid:
+            if i != '':
+                self.run_context.data_strm_mngr.data_strm.expect_result(i.split(";")[0], self.ipport, self.running_phase)
+                self.run_context.dispatcher.expect_stream(self.ipport, i.split(";")[0])
+
         ##logging.info("(%-10s) --> %s" % (self.ipport, self.cmd))
-        self.send_capi_select()
+        ret = self.send_capi_select()
         #while ValueTable.traffic_done == False:
         #    time.sleep(0.5)
         
         #time.sleep(1)
-        time.sleep(2)
-        return
+        if test_prog.stream_settle_time > 0:
+            time.sleep(test_prog.stream_settle_time)
+        return ret
 
     def traffic_agent_send(self):
         
         capi_run = self.cmd + ',' + self.param
-        capi_elem = self.param.split(',')
+        capi_elem = self.get_args(',')
         rCounter = 0
         sid = capi_elem[1].split(' ')
         
@@ -845,39 +789,44 @@ class ExecutionTask(object):
         for i in sid:
             #Making Send-receive Pair
             #print "sid : " + i
-            for s in self.test_mngr_initr.test_data_strm_mngr.data_strm.streamInfoArray:
-                #print "s.IPAddress : " + s.IPAddress
-                #print "self.ipport : " + self.ipport
-                if s.IPAddress == self.ipport and s.streamID == i and s.phase == self.running_phase:
-                    #print "ValueTable.recv_id[rCounter] : " + ValueTable.recv_id
-                    s.pairID = ValueTable.recv_id[rCounter]
+            s = self.run_context.data_strm_mngr.data_strm.get_stream_info(i, self.ipport, self.running_phase)
+            if s is not None:
+                #print "ValueTable.recv_id[rCounter] : " + ValueTable.recv_id
+                s.pairID = ValueTable.recv_id[rCounter]
+            if i != '':
+                self.run_context.data_strm_mngr.data_strm.expect_result(i, self.ipport, self.running_phase)
+                self.run_context.dispatcher.expect_stream(self.ipport, i)
 
             rCounter += 1
         
-        #self.test_mngr_initr.test_data_strm_mngr.data_strm.event = threading.Event()
+        #self.run_context.data_strm_mngr.data_strm.event = threading.Event()
         
-        # Start the response wait thread (only once)
-        if TestScriptSymbolTable.test_script_sym_tab["threadCount"] == 0:
-            TestScriptSymbolTable.test_script_sym_tab["testRunning"] = 1
+        # Start the response wait thread (only once, even if parallel sub queues get here together)
+        sym_tab = self.run_context.test_script_sym_tab
+        with sym_tab.lock:
+            thread_id = sym_tab["threadCount"]
+            if thread_id == 0:
+                sym_tab["threadCount"] = thread_id + 1
+        if thread_id == 0:
+            sym_tab["testRunning"] = 1
+            self.run_context.dispatcher.start()
             #print "starting thread"
-            thread.start_new(self.responseWaitThreadFunc, (TestScriptSymbolTable.test_script_sym_tab["threadCount"], capi_run, self.ipport, ValueTable.recv_id))
-            TestScriptSymbolTable.test_script_sym_tab["threadCount"] = TestScriptSymbolTable.test_script_sym_tab["threadCount"] + 1
+            thread.start_new(self.responseWaitThreadFunc, (thread_id, capi_run, self.ipport, ValueTable.recv_id))
             #Temporary Addition for VHT
         
-        self.send_capi_select()
-        return
+        return self.send_capi_select()
     # UCC Action Methods
 
     def _dnb_(self):
-        TestScriptSymbolTable.test_script_sym_tab["iDNB"] = 1
+        self.run_context.test_script_sym_tab["iDNB"] = 1
         return
 
     def _inv(self):
-        TestScriptSymbolTable.test_script_sym_tab["iINV"] = 1
+        self.run_context.test_script_sym_tab["iINV"] = 1
         return
 
     def inv_(self):
-        TestScriptSymbolTable.test_script_sym_tab["iINV"] = 0
+        self.run_context.test_script_sym_tab["iINV"] = 0
         return
 
     def add_media_file(self):
@@ -904,10 +853,10 @@ class ExecutionTask(object):
             return
 
         #print vInfo
-        #print len(TestScriptSymbolTable.capi_cmd_ret_sym_tab)
+        #print len(self.run_context.capi_cmd_ret_sym_tab)
         for c in vInfo:
-            if c in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                vInfo[i] = TestScriptSymbolTable.capi_cmd_ret_sym_tab[c]
+            if c in self.run_context.capi_cmd_ret_sym_tab:
+                vInfo[i] = self.run_context.capi_cmd_ret_sym_tab[c]
             if vInfo[i] in ValueTable.displayName:
                 vInfo[i] = ValueTable.displayName[vInfo[i]]
             i = i + 1
@@ -928,21 +877,21 @@ class ExecutionTask(object):
             logging.info("Incorrect version format")
             return
 
-        if vInfo[0] not in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
+        if vInfo[0] not in self.run_context.capi_cmd_ret_sym_tab:
             logging.debug("Unknown Component[1] %s", vInfo[0])
             return
 
         #tbd
-        #if TestScriptSymbolTable.capi_cmd_ret_sym_tab[vInfo[0]] not in conntable:
-        #    if TestScriptSymbolTable.capi_cmd_ret_sym_tab[TestScriptSymbolTable.capi_cmd_ret_sym_tab[vInfo[0]]] not in conntable:
+        #if self.run_context.capi_cmd_ret_sym_tab[vInfo[0]] not in conntable:
+        #    if self.run_context.capi_cmd_ret_sym_tab[self.run_context.capi_cmd_ret_sym_tab[vInfo[0]]] not in conntable:
         #        logging.debug("Unknown Component[3] %s", vInfo[0])
         #        return
 
         #print vInfo
-        #print len(TestScriptSymbolTable.capi_cmd_ret_sym_tab)
+        #print len(self.run_context.capi_cmd_ret_sym_tab)
         for c in vInfo:
-            if c in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                vInfo[i] = TestScriptSymbolTable.capi_cmd_ret_sym_tab[c]
+            if c in self.run_context.capi_cmd_ret_sym_tab:
+                vInfo[i] = self.run_context.capi_cmd_ret_sym_tab[c]
             if vInfo[i] in ValueTable.displayName:
                 vInfo[i] = ValueTable.displayName[vInfo[i]]
             i = i + 1
@@ -963,22 +912,22 @@ class ExecutionTask(object):
         command = wholeCommand.split('!')
         cmd = command[2].split(" ")
         logging.debug("..append %s = %s %s using %s"%(command[1], cmd[0], cmd[1], command[3]))
-        if command[1] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-            if cmd[0] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                cmd[0] = TestScriptSymbolTable.capi_cmd_ret_sym_tab[cmd[0]]
-            if cmd[1] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                cmd[1] = TestScriptSymbolTable.capi_cmd_ret_sym_tab[cmd[1]]
-            TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[1]] = "%s%s%s" %(cmd[0], command[3], cmd[1])
+        if command[1] in self.run_context.capi_cmd_ret_sym_tab:
+            if cmd[0] in self.run_context.capi_cmd_ret_sym_tab:
+                cmd[0] = self.run_context.capi_cmd_ret_sym_tab[cmd[0]]
+            if cmd[1] in self.run_context.capi_cmd_ret_sym_tab:
+                cmd[1] = self.run_context.capi_cmd_ret_sym_tab[cmd[1]]
+            self.run_context.capi_cmd_ret_sym_tab[command[1]] = "%s%s%s" %(cmd[0], command[3], cmd[1])
         else:
-            if cmd[0] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                cmd[0] = TestScriptSymbolTable.capi_cmd_ret_sym_tab[cmd[0]]
-            if cmd[1] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                cmd[1] = TestScriptSymbolTable.capi_cmd_ret_sym_tab[cmd[1]]
-            TestScriptSymbolTable.capi_cmd_ret_sym_tab.setdefault(command[1], "%s%s%s" %(cmd[0], command[3], cmd[1]))
+            if cmd[0] in self.run_context.capi_cmd_ret_sym_tab:
+                cmd[0] = self.run_context.capi_cmd_ret_sym_tab[cmd[0]]
+            if cmd[1] in self.run_context.capi_cmd_ret_sym_tab:
+                cmd[1] = self.run_context.capi_cmd_ret_sym_tab[cmd[1]]
+            self.run_context.capi_cmd_ret_sym_tab.setdefault(command[1], "%s%s%s" %(cmd[0], command[3], cmd[1]))
         return
 
     def calculate_ext_listen_values(self):
-        command = self.param.split('!')
+        command = self.get_args('!')
         probe_req_interval = int(command[1]) / 2
         probe_req_count = int(command[0]) / (int(command[1]) / 2)
         self.setRetVal("$PROBE_REQ_INTERVAL", probe_req_interval)
@@ -987,7 +936,7 @@ class ExecutionTask(object):
 
     def cat(self):
         #wholeCommand = self.cmd + "!" + self.param
-        command = self.param.split('!')
+        command = self.get_args('!')
         var = ""
         if len(command) < 3:
             #print "Invalid CAT command"
@@ -997,8 +946,8 @@ class ExecutionTask(object):
 
             for v in varlist:
                 if '$' in v:
-                    if v in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                        v = TestScriptSymbolTable.capi_cmd_ret_sym_tab[v]
+                    if v in self.run_context.capi_cmd_ret_sym_tab:
+                        v = self.run_context.capi_cmd_ret_sym_tab[v]
 
                 if var:
                     var = ("%s%s%s" % (var, command[2], v))
@@ -1007,10 +956,10 @@ class ExecutionTask(object):
 
         logging.debug("VAR=[%s]" % var)
 
-        if command[0] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-            TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[0]] = var
+        if command[0] in self.run_context.capi_cmd_ret_sym_tab:
+            self.run_context.capi_cmd_ret_sym_tab[command[0]] = var
         else:
-            TestScriptSymbolTable.capi_cmd_ret_sym_tab.setdefault(command[0], var)
+            self.run_context.capi_cmd_ret_sym_tab.setdefault(command[0], var)
         return
 
 
@@ -1018,28 +967,28 @@ class ExecutionTask(object):
         wholeCommand = self.cmd + "!" + self.param
         command = wholeCommand.split('!')
         logging.debug("..Define %s = %s"%(command[1], command[2]))
-        if command[1] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-            if command[2] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                command[2] = TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[2]]
-            TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[1]] = command[2]
+        if command[1] in self.run_context.capi_cmd_ret_sym_tab:
+            if command[2] in self.run_context.capi_cmd_ret_sym_tab:
+                command[2] = self.run_context.capi_cmd_ret_sym_tab[command[2]]
+            self.run_context.capi_cmd_ret_sym_tab[command[1]] = command[2]
         else:
-            if command[2] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                command[2] = TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[2]]
-            TestScriptSymbolTable.capi_cmd_ret_sym_tab.setdefault(command[1], command[2])
+            if command[2] in self.run_context.capi_cmd_ret_sym_tab:
+                command[2] = self.run_context.capi_cmd_ret_sym_tab[command[2]]
+            self.run_context.capi_cmd_ret_sym_tab.setdefault(command[1], command[2])
 
         return
 
     def displayname(self):
         command = self.cmd
-        if (command[1] in TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+        if (command[1] in self.run_context.capi_cmd_ret_sym_tab):
             ValueTable.displayName.setdefault(ValueTable[command[1]],command[2])
         else:
             ValueTable.displayName.setdefault(command[1],command[2])
         return
 
     def echo(self):
-        if self.param in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-            print "%s=%s" % (self.param, TestScriptSymbolTable.capi_cmd_ret_sym_tab[self.param])
+        if self.param in self.run_context.capi_cmd_ret_sym_tab:
+            print "%s=%s" % (self.param, self.run_context.capi_cmd_ret_sym_tab[self.param])
         else:
             print "echo -> %s" % self.param
         return
@@ -1047,26 +996,26 @@ class ExecutionTask(object):
     def echo_ifnowts(self):
         wholeCommand = self.cmd + "!" + self.param
         command = wholeCommand.split('!')
-        if TestScriptSymbolTable.get_value_from_sym_tab("$WTS_ControlAgent_Support", TestScriptSymbolTable.test_script_sym_tab) == "0":
+        if TestScriptSymbolTable.get_value_from_sym_tab("$WTS_ControlAgent_Support", self.run_context.test_script_sym_tab) == "0":
             Util.set_color(Util.FOREGROUND_BLUE |Util.FOREGROUND_INTENSITY)
-            if command[1] in  TestScriptSymbolTable.test_script_sym_tab:
-                logging.info("-%s=%s-" % (command[1], TestScriptSymbolTable.test_script_sym_tab[command[1]]))
+            if command[1] in  self.run_context.test_script_sym_tab:
+                logging.info("-%s=%s-" % (command[1], self.run_context.test_script_sym_tab[command[1]]))
             else:
                 logging.info("%s" % command[1])
             Util.set_color(Util.FOREGROUND_WHITE | Util.FOREGROUND_INTENSITY)
             return
 
     def else_statement(self):
-        if TestScriptSymbolTable.test_script_sym_tab["ifCondBit"] == True:
+        if self.run_context.test_script_sym_tab["ifCondBit"] == True:
             #print "else setting to false"
-            TestScriptSymbolTable.test_script_sym_tab["ifCondBit"] = False
+            self.run_context.test_script_sym_tab["ifCondBit"] = False
         else:
             #print "else setting to true"
-            TestScriptSymbolTable.test_script_sym_tab["ifCondBit"] = True
+            self.run_context.test_script_sym_tab["ifCondBit"] = True
         return
 
     def endif_statement(self):
-        TestScriptSymbolTable.test_script_sym_tab["ifCondBit"] = True
+        self.run_context.test_script_sym_tab["ifCondBit"] = True
         #print "endif setting to true"
         return
 
@@ -1079,11 +1028,11 @@ class ExecutionTask(object):
     def extract_p2p_ssid(self):
         wholeCommand = self.cmd + "!" + self.param
         command = wholeCommand.split('!')
-        if command[1] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-            command[1] = TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[1]]
+        if command[1] in self.run_context.capi_cmd_ret_sym_tab:
+            command[1] = self.run_context.capi_cmd_ret_sym_tab[command[1]]
         p2p_ssid = command[1].split(' ')
         if len(p2p_ssid) > 1:
-            TestScriptSymbolTable.capi_cmd_ret_sym_tab.setdefault("$P2P_SSID", "%s" % p2p_ssid[1])
+            self.run_context.capi_cmd_ret_sym_tab.setdefault("$P2P_SSID", "%s" % p2p_ssid[1])
         else:
             #set_color(FOREGROUND_RED | FOREGROUND_INTENSITY)
             print "Test Case Criteria Failure - Invalid P2P Group ID"
@@ -1099,15 +1048,15 @@ class ExecutionTask(object):
         if re.search('null',command[1]):
             cmd1 = "null"
         else:
-            if command[1] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                cmd1 = TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[1]].split(" ")
+            if command[1] in self.run_context.capi_cmd_ret_sym_tab:
+                cmd1 = self.run_context.capi_cmd_ret_sym_tab[command[1]].split(" ")
             else:
                 cmd1 = command[1].split(" ")
 
-        TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[2]] = "0"
+        self.run_context.capi_cmd_ret_sym_tab[command[2]] = "0"
 
-        if command[3] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-            cmd3 = int(TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[3]])
+        if command[3] in self.run_context.capi_cmd_ret_sym_tab:
+            cmd3 = int(self.run_context.capi_cmd_ret_sym_tab[command[3]])
         else:
             cmd3 = int(command[3])
 
@@ -1127,8 +1076,8 @@ class ExecutionTask(object):
             if (i == cmd3):
                 break
 
-        TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[2]] = ' '.join("%d" % x for x in ValueTable.oplist)
-        logging.debug(" %s" % TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[2]])
+        self.run_context.capi_cmd_ret_sym_tab[command[2]] = ' '.join("%d" % x for x in ValueTable.oplist)
+        logging.debug(" %s" % self.run_context.capi_cmd_ret_sym_tab[command[2]])
         ValueTable.oplist = []
 
         return
@@ -1136,53 +1085,53 @@ class ExecutionTask(object):
     def get_rnd_ip_address(self):
         wholeCommand = self.cmd + "!" + self.param
         command = wholeCommand.split('!')
-        if command[1] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-            command[1] = TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[1]]
-        if command[2] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-            command[2] = TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[2]]
+        if command[1] in self.run_context.capi_cmd_ret_sym_tab:
+            command[1] = self.run_context.capi_cmd_ret_sym_tab[command[1]]
+        if command[2] in self.run_context.capi_cmd_ret_sym_tab:
+            command[2] = self.run_context.capi_cmd_ret_sym_tab[command[2]]
         ip1 = command[1].split(".")
         ip2 = command[2].split(".")
         if (int(ip2[3]) + 1) != int(ip1[3]):
             rnd_ip = ("%s.%s.%s.%s" % (ip2[0], ip2[1], ip2[2], int(ip2[3]) + 1))
         else:
             rnd_ip = ("%s.%s.%s.%s" % (ip2[0], ip2[1], ip2[2], int(ip2[3]) + 2))
-        TestScriptSymbolTable.capi_cmd_ret_sym_tab.setdefault(command[3], "%s" % rnd_ip)
+        self.run_context.capi_cmd_ret_sym_tab.setdefault(command[3], "%s" % rnd_ip)
         return
 
     def getuccsystemtime(self):
         timeStr = time.strftime("%H-%M-%S-%m-%d-%Y", time.localtime())
         logging.debug("\n Reading UCC System time %s" % timeStr)
         t = timeStr.split("-")
-        TestScriptSymbolTable.capi_cmd_ret_sym_tab.setdefault("$month", t[3])
-        TestScriptSymbolTable.capi_cmd_ret_sym_tab.setdefault("$date", t[4])
-        TestScriptSymbolTable.capi_cmd_ret_sym_tab.setdefault("$year", t[5])
-        TestScriptSymbolTable.capi_cmd_ret_sym_tab.setdefault("$hours", t[0])
-        TestScriptSymbolTable.capi_cmd_ret_sym_tab.setdefault("$minutes", t[1])
-        TestScriptSymbolTable.capi_cmd_ret_sym_tab.setdefault("$seconds", t[2])
+        self.run_context.capi_cmd_ret_sym_tab.setdefault("$month", t[3])
+        self.run_context.capi_cmd_ret_sym_tab.setdefault("$date", t[4])
+        self.run_context.capi_cmd_ret_sym_tab.setdefault("$year", t[5])
+        self.run_context.capi_cmd_ret_sym_tab.setdefault("$hours", t[0])
+        self.run_context.capi_cmd_ret_sym_tab.setdefault("$minutes", t[1])
+        self.run_context.capi_cmd_ret_sym_tab.setdefault("$seconds", t[2])
         logging.debug("""\n UCC System Time- Month:%s: 
                                             Date:%s: 
                                             Year:%s: 
                                             Hours:%s: 
                                             Minutes:%s: 
                                             Seconds:%s:""" %
-                                            (TestScriptSymbolTable.capi_cmd_ret_sym_tab["$month"],
-                                             TestScriptSymbolTable.capi_cmd_ret_sym_tab["$date"],
-                                             TestScriptSymbolTable.capi_cmd_ret_sym_tab["$year"],
-                                             TestScriptSymbolTable.capi_cmd_ret_sym_tab["$hours"],
-                                             TestScriptSymbolTable.capi_cmd_ret_sym_tab["$minutes"],
-                                             TestScriptSymbolTable.capi_cmd_ret_sym_tab["$seconds"]))
+                                            (self.run_context.capi_cmd_ret_sym_tab["$month"],
+                                             self.run_context.capi_cmd_ret_sym_tab["$date"],
+                                             self.run_context.capi_cmd_ret_sym_tab["$year"],
+                                             self.run_context.capi_cmd_ret_sym_tab["$hours"],
+                                             self.run_context.capi_cmd_ret_sym_tab["$minutes"],
+                                             self.run_context.capi_cmd_ret_sym_tab["$seconds"]))
         return
 
     def getuserinput(self):
         print "[USER INPUT REQUIRED]"
         Util.set_color(Util.FOREGROUND_YELLOW | Util.FOREGROUND_INTENSITY)
         logging.info("[USER INPUT REQUIRED]")
-        paramSplit = self.param.split('!')
+        paramSplit = self.get_args('!')
         udata = raw_input(paramSplit[0])
-        if paramSplit[1] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-            TestScriptSymbolTable.capi_cmd_ret_sym_tab[paramSplit[1]] = udata
+        if paramSplit[1] in self.run_context.capi_cmd_ret_sym_tab:
+            self.run_context.capi_cmd_ret_sym_tab[paramSplit[1]] = udata
         else:
-            TestScriptSymbolTable.capi_cmd_ret_sym_tab.setdefault(paramSplit[1], udata)
+            self.run_context.capi_cmd_ret_sym_tab.setdefault(paramSplit[1], udata)
         Util.set_color(Util.FOREGROUND_INTENSITY)
         return
 
@@ -1192,8 +1141,8 @@ class ExecutionTask(object):
         lhs = []
         rhs = []
         oper = []
-        rtVlTbl = TestScriptSymbolTable.capi_cmd_ret_sym_tab
-        symTbl = TestScriptSymbolTable.test_script_sym_tab
+        rtVlTbl = self.run_context.capi_cmd_ret_sym_tab
+        symTbl = self.run_context.test_script_sym_tab
         wholeCommand = self.cmd + "!" + self.param
         command = wholeCommand.split('!')
         ifcondBit = -1
@@ -1271,20 +1220,20 @@ class ExecutionTask(object):
             #print "ifConBit " + str(ifCondBit)
         if ifCondBit == 0:
             #print "setting to false"
-            TestScriptSymbolTable.test_script_sym_tab["ifCondBit"] = False
+            self.run_context.test_script_sym_tab["ifCondBit"] = False
             return False
         else:
             #print "setting to true"
-            TestScriptSymbolTable.test_script_sym_tab["ifCondBit"] = True
+            self.run_context.test_script_sym_tab["ifCondBit"] = True
             return True
 
     def ifnowts(self):
         wholeCommand = self.cmd + "!" + self.param
         command = wholeCommand.split('!')
-        if TestScriptSymbolTable.get_value_from_sym_tab("$WTS_ControlAgent_Support", TestScriptSymbolTable.test_script_sym_tab) == "0":
+        if TestScriptSymbolTable.get_value_from_sym_tab("$WTS_ControlAgent_Support", self.run_context.test_script_sym_tab) == "0":
             Util.set_color(Util.FOREGROUND_YELLOW | Util.FOREGROUND_INTENSITY)
-            if len(command) > 3 and command[2] in TestScriptSymbolTable.test_script_sym_tab:
-                s = "- %s" % TestScriptSymbolTable.test_script_sym_tab[command[2]]
+            if len(command) > 3 and command[2] in self.run_context.test_script_sym_tab:
+                s = "- %s" % self.run_context.test_script_sym_tab[command[2]]
             else:
                 s = ""
             logging.info("%s %s\n        Press any key to continue after done" % (command[1], s))
@@ -1297,8 +1246,8 @@ class ExecutionTask(object):
         wholeCommand = self.cmd + "!" + self.param
         command = wholeCommand.split('!')
         Util.set_color(Util.FOREGROUND_CYAN | Util.FOREGROUND_INTENSITY)
-        if command[1] in TestScriptSymbolTable.test_script_sym_tab:
-            command[1] = TestScriptSymbolTable.test_script_sym_tab[command[1]]
+        if command[1] in self.run_context.test_script_sym_tab:
+            command[1] = self.run_context.test_script_sym_tab[command[1]]
         #logging.info("\n %7s ~~~~~ %s ~~~~~ \n" %("", command[1]))
         Util.set_color(Util.FOREGROUND_INTENSITY)
         return
@@ -1345,7 +1294,7 @@ class ExecutionTask(object):
             val = []
             for v in temp:
                 if '$' in v:
-                    val.append(TestScriptSymbolTable.capi_cmd_ret_sym_tab[v])
+                    val.append(self.run_context.capi_cmd_ret_sym_tab[v])
                 else:
                     val.append(v)
             try:
@@ -1379,18 +1328,18 @@ class ExecutionTask(object):
             random_index = randrange(0, len(varlist))
             cal_val = "%s" % int(varlist[random_index])
             
-        TestScriptSymbolTable.insert_sym_tab(tmp, cal_val, TestScriptSymbolTable.capi_cmd_ret_sym_tab)
-        #print "after math ---> "  + TestScriptSymbolTable.capi_cmd_ret_sym_tab[tmp]
+        TestScriptSymbolTable.insert_sym_tab(tmp, cal_val, self.run_context.capi_cmd_ret_sym_tab)
+        #print "after math ---> "  + self.run_context.capi_cmd_ret_sym_tab[tmp]
 
     def mexpr(self):
         wholeCommand = self.cmd + "!" + self.param
         command = wholeCommand.split('!')
-        if command[1] not in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
+        if command[1] not in self.run_context.capi_cmd_ret_sym_tab:
             return
-        if command[3] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-            command[3] = TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[3]]
+        if command[3] in self.run_context.capi_cmd_ret_sym_tab:
+            command[3] = self.run_context.capi_cmd_ret_sym_tab[command[3]]
         if command[2] == "%":
-            ValueTable[command[1]].ret = (int(TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[1]]) * int(command[3])) / 100
+            ValueTable[command[1]].ret = (int(self.run_context.capi_cmd_ret_sym_tab[command[1]]) * int(command[3])) / 100
         return
 
     def pause(self):
@@ -1408,8 +1357,10 @@ class ExecutionTask(object):
         time.sleep(3)
         logging.debug("Starting Phase - %s ..." % self.param)
         self.running_phase = self.param
-        TestScriptSymbolTable.test_script_sym_tab["threadCount"] = 0
-        TestScriptSymbolTable.test_script_sym_tab["testRunning"] = 0
+        self.run_context.test_script_sym_tab["threadCount"] = 0
+        self.run_context.test_script_sym_tab["testRunning"] = 0
+        self.run_context.dispatcher.stop()
+        self.run_context.data_strm_mngr.data_strm.drop_pending_results()
         time.sleep(2)
         return
 
@@ -1426,10 +1377,10 @@ class ExecutionTask(object):
     def reopen_conn(self):
         wholeCommand = self.cmd + "!" + self.param
         command = wholeCommand.split('!')
-        if command[1] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-            command[1] = TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[1]]
-        if command[2] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-            command[2] = TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[2]]
+        if command[1] in self.run_context.capi_cmd_ret_sym_tab:
+            command[1] = self.run_context.capi_cmd_ret_sym_tab[command[1]]
+        if command[2] in self.run_context.capi_cmd_ret_sym_tab:
+            command[2] = self.run_context.capi_cmd_ret_sym_tab[command[2]]
 
         #process_ipadd("ipaddr=%s, port=%s" % (command[1], command[2]), 1)
         return
@@ -1455,56 +1406,56 @@ class ExecutionTask(object):
         wholeCommand = self.cmd + "!" + self.param
         command = wholeCommand.split('!')
         if re.search('exact', command[4]):
-            if command[1] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                cmd1 = TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[1]]
+            if command[1] in self.run_context.capi_cmd_ret_sym_tab:
+                cmd1 = self.run_context.capi_cmd_ret_sym_tab[command[1]]
             else:
                 cmd1 = command[1]
 
-            if command[2] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                cmd2 = TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[2]]
+            if command[2] in self.run_context.capi_cmd_ret_sym_tab:
+                cmd2 = self.run_context.capi_cmd_ret_sym_tab[command[2]]
             else:
                 cmd2 = command[2]
 
-            TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[3]] = "0"
+            self.run_context.capi_cmd_ret_sym_tab[command[3]] = "0"
             if (sorted(cmd1) == sorted(cmd2)):
-                TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[3]] = "1"
+                self.run_context.capi_cmd_ret_sym_tab[command[3]] = "1"
             return
 
         elif re.search('diff', command[4]):
-            if command[1] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                cmd1 = TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[1]]
+            if command[1] in self.run_context.capi_cmd_ret_sym_tab:
+                cmd1 = self.run_context.capi_cmd_ret_sym_tab[command[1]]
             else:
                 cmd1 = command[1]
 
-            if command[2] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                cmd2 = TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[2]]
+            if command[2] in self.run_context.capi_cmd_ret_sym_tab:
+                cmd2 = self.run_context.capi_cmd_ret_sym_tab[command[2]]
             else:
                 cmd2 = command[2]
 
-            TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[3]] = "0"
+            self.run_context.capi_cmd_ret_sym_tab[command[3]] = "0"
             if sorted(cmd1) == sorted(cmd2):
-                TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[3]] = "1"
+                self.run_context.capi_cmd_ret_sym_tab[command[3]] = "1"
             else:
                 logging.debug("cmd1 %s, cmd2 %s" %(cmd1, cmd2))
                 cmd1 = set(cmd1.split(' '))
                 cmd2 = set(cmd2.split(' '))
                 cmd3 = cmd1.difference(cmd2)
                 logging.debug("Diff List %s" % cmd3)
-                TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[3]] = "%s" %(' '.join(list(cmd3)))
+                self.run_context.capi_cmd_ret_sym_tab[command[3]] = "%s" %(' '.join(list(cmd3)))
             return
 
         else:
-            if command[1] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                cmd1 = TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[1]]
+            if command[1] in self.run_context.capi_cmd_ret_sym_tab:
+                cmd1 = self.run_context.capi_cmd_ret_sym_tab[command[1]]
             else:
                 cmd1 = command[1]
 
-            if command[2] in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-                cmd2 = TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[2]].split(" ")
+            if command[2] in self.run_context.capi_cmd_ret_sym_tab:
+                cmd2 = self.run_context.capi_cmd_ret_sym_tab[command[2]].split(" ")
             else:
                 cmd2 = command[2].split(" ")
 
-            TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[3]] = "0"
+            self.run_context.capi_cmd_ret_sym_tab[command[3]] = "0"
             i = 0
 
             #Check for NULL before comparison
@@ -1512,7 +1463,7 @@ class ExecutionTask(object):
                 for c in cmd2:
                     logging.info("Search \"%s\" in \"%s\"" %(cmd2[i], cmd1))
                     if re.search('%s' % cmd2[i], cmd1, re.IGNORECASE):
-                        TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[3]] = "1"
+                        self.run_context.capi_cmd_ret_sym_tab[command[3]] = "1"
                     i += 1
             return
 
@@ -1524,7 +1475,7 @@ class ExecutionTask(object):
     def socktimeout(self):
         if int(self.param) > 0:
             logging.info("Setting socket timeout=%d secs" % int(self.param))
-            TestScriptSymbolTable.test_script_sym_tab["socktimeout"] = self.param
+            self.run_context.test_script_sym_tab["socktimeout"] = self.param
         else:
             logging.info("Resetting socket timeout")
             socktimeout = 0
@@ -1533,7 +1484,7 @@ class ExecutionTask(object):
     def storethroughput(self):
         #wholeCommand = self.cmd + "!" + self.param
         #command = wholeCommand.split('!')
-        cmd = self.param.split("!")
+        cmd = self.get_args("!")
         values = cmd[1].split(',')
         streamid = values[0]
         phase = values[1]
@@ -1542,11 +1493,11 @@ class ExecutionTask(object):
         storevar = cmd[0]
         logging.debug("Storing the Throughput(Mbps) value of stream %s[%s %s] in %s  duration=%s p=%s", streamid, percentage, "%", storevar, duration, phase)
         P1 = -1
-        for p in self.test_mngr_initr.test_data_strm_mngr.data_strm.streamRecvResultArray:
-            if p.streamID == streamid and int(p.phase) == int(phase):
-                P1 = p.rxBytes
-                P1 = int(int(P1) / 100) * int(percentage)
-                P1 = ((float(P1) * 8)) / (1000000 * int(duration))
+        p = self.run_context.data_strm_mngr.data_strm.get_recv_result(streamid, phase)
+        if p is not None:
+            P1 = p.rxBytes
+            P1 = int(int(P1) / 100) * int(percentage)
+            P1 = ((float(P1) * 8)) / (1000000 * int(duration))
                 
         logging.info("Storing %s = %s [Mbps]", storevar, P1)
         self.setRetVal(storevar, P1)
@@ -1567,7 +1518,7 @@ class ExecutionTask(object):
         iCn = 0
 
         #Hex SSID
-        SSID = TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[3]].split(" ")[1]
+        SSID = self.run_context.capi_cmd_ret_sym_tab[command[3]].split(" ")[1]
         SSIDLength = len(SSID)
         SSIDLen1 = hex(int(SSIDLength) + 22).split("0x")[1]
         SSIDLen2 = "%s 00" % hex(int(SSIDLength + 6)).split("0x")[1]
@@ -1579,19 +1530,19 @@ class ExecutionTask(object):
             hexSSID = hexSSID + h
         logging.debug("hexSSID = %s hexLength %s" % (hexSSID, SSIDLength))
         FrameData = "%s%s%s%s%s%s%s%s%s%s%s%s" % (f[0],
-                                                  TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[2]],
-                                                  TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[4]],
-                                                  TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[2]],
+                                                  self.run_context.capi_cmd_ret_sym_tab[command[2]],
+                                                  self.run_context.capi_cmd_ret_sym_tab[command[4]],
+                                                  self.run_context.capi_cmd_ret_sym_tab[command[2]],
                                                   f[3],
                                                   SSIDLen1,
                                                   f[4],
-                                                  TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[5]],
+                                                  self.run_context.capi_cmd_ret_sym_tab[command[5]],
                                                   f[5],
                                                   SSIDLen2,
-                                                  TestScriptSymbolTable.capi_cmd_ret_sym_tab[command[2]],
+                                                  self.run_context.capi_cmd_ret_sym_tab[command[2]],
                                                   hexSSID)
         logging.debug (FrameData)
-        TestScriptSymbolTable.capi_cmd_ret_sym_tab.setdefault("$INJECT_FRAME_DATA",FrameData)
+        self.run_context.capi_cmd_ret_sym_tab.setdefault("$INJECT_FRAME_DATA",FrameData)
 
     def userinput(self):
         wholeCommand = self.cmd + "!" + self.param
@@ -1599,10 +1550,10 @@ class ExecutionTask(object):
         Util.set_color(Util.FOREGROUND_YELLOW | Util.FOREGROUND_INTENSITY)
         logging.info("[USER INPUT REQUIRED]")
         udata = raw_input(command[1])
-        if command[2] in TestScriptSymbolTable.test_script_sym_tab:
-            TestScriptSymbolTable.test_script_sym_tab[command[2]] = udata
+        if command[2] in self.run_context.test_script_sym_tab:
+            self.run_context.test_script_sym_tab[command[2]] = udata
         else:
-            TestScriptSymbolTable.test_script_sym_tab.setdefault(command[2], udata)
+            self.run_context.test_script_sym_tab.setdefault(command[2], udata)
 
         Util.set_color(Util.FOREGROUND_WHITE | Util.FOREGROUND_INTENSITY)
         return
@@ -1613,14 +1564,14 @@ class ExecutionTask(object):
 
 
 
-        if TestScriptSymbolTable.get_value_from_sym_tab("$WTS_ControlAgent_Support", TestScriptSymbolTable.test_script_sym_tab) == "0":
+        if TestScriptSymbolTable.get_value_from_sym_tab("$WTS_ControlAgent_Support", self.run_context.test_script_sym_tab) == "0":
             Util.set_color(Util.FOREGROUND_YELLOW | Util.FOREGROUND_INTENSITY)
             logging.info("[USER INPUT REQUIRED]")
             udata = raw_input(command[1])
-            if command[2] in TestScriptSymbolTable.test_script_sym_tab:
-                TestScriptSymbolTable.test_script_sym_tab[command[2]] = udata
+            if command[2] in self.run_context.test_script_sym_tab:
+                self.run_context.test_script_sym_tab[command[2]] = udata
             else:
-                TestScriptSymbolTable.test_script_sym_tab.setdefault(command[2], udata)
+                self.run_context.test_script_sym_tab.setdefault(command[2], udata)
                 
             Util.set_color(Util.FOREGROUND_WHITE | Util.FOREGROUND_INTENSITY)
         return
@@ -1661,8 +1612,8 @@ class ExecutionTask(object):
         return
 
     def wfa_tester(self):
-        if self.cmd in TestScriptSymbolTable.capi_cmd_ret_sym_tab:
-            self.cmd = TestScriptSymbolTable.capi_cmd_ret_sym_tab[self.cmd]
+        if self.cmd in self.run_context.capi_cmd_ret_sym_tab:
+            self.cmd = self.run_context.capi_cmd_ret_sym_tab[self.cmd]
         else:
             return
 
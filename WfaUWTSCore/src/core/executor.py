@@ -28,7 +28,9 @@ from scriptinfo.scriptsource import TestLogFileSource
 from core.executiontask import ExecutionTask
 from core.executionqueue import ExecutionQueue
 from core.resultprocessor import ResultProcessor
+from core.runcontext import RunContext
 from core.symtable import TestScriptSymbolTable
+from core.taskgraph import TaskGraph
 from util.misc import Util
 
 
@@ -36,7 +38,13 @@ from util.misc import Util
 #                     format='(%(threadName)-10s) %(message)s',)
 
 class Executor(object):
-    def __init__(self):
+    # commands changing state other devices depend on are never reordered
+    graph_barrier_prefixes = ("ap_", "sniffer_", "traffic_", "dev_")
+    # actions setting the iDNB/iINV flags read (and reset) by the next CAPI command
+    graph_flag_actions = ("_dnb_", "_inv", "inv_")
+
+    def __init__(self, run_context=None):
+        self.run_context = run_context if run_context is not None else RunContext.get_current()
         self.test_mngr_initr = None
         self.capi_script_parser = None
         self.main_exec_q = None
@@ -61,41 +69,38 @@ class Executor(object):
         self.exe_result = "None"
         self.ap_config_port = 7000
         self.ap_port_map = {}
+        self.graph_enable = False
+        self.graph_lock = threading.Lock()
 
     def init_exec_q(self):
         return ExecutionQueue()
 
+    def get_tuning_value(self, key):
+        """ This function returns the tuning value of the given script symbol table key,
+        the default value if it is not a positive integer"""
+        value = TestScriptSymbolTable.get_value_from_sym_tab(key, self.run_context.test_script_sym_tab)
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            value = 0
+        if value <= 0:
+            value = TestScriptSymbolTable.test_script_sym_tab_defaults[key]
+        return value
+
+    def get_testbed_dev_index(self):
+        """ This function returns the index of the testbed device list"""
+        return self.test_mngr_initr.testbed_dev_mngr.get_testbed_dev_index()
+
     def search_ap_agent_ipport(self):
-        for tbd in self.test_mngr_initr.test_prog_mngr.test_prog.testbed_dev_list:
-            if tbd.alias == 'TestbedAPConfigServer':
-                ipport = tbd.ctrlipaddr + ':' + tbd.ctrlport
-        return ipport
+        return self.get_testbed_dev_index().get_ap_agent_ipport()
     
     def get_ap_agent_port(self):
-        for tbd in self.test_mngr_initr.test_prog_mngr.test_prog.testbed_dev_list:
-            if tbd.alias == 'TestbedAPConfigServer':
-                return tbd.ctrlport
+        return self.get_testbed_dev_index().ap_agent_port
 
     def search_testbed_device(self, dev_name):
         """ This function is searching in the testbed device list
         based on the device name and return the string of IP and port """
-        ipport = None
-        if dev_name.startswith('$'):
-            for tbd in self.test_mngr_initr.test_prog_mngr.test_prog.testbed_dev_list:
-                if tbd.numVarName == dev_name:
-                    ipport = tbd.ctrlipaddr + ':' + tbd.ctrlport
-        else:
-            for tbd in self.test_mngr_initr.test_prog_mngr.test_prog.testbed_dev_list:
-                if not re.search('wfa', dev_name,  re.IGNORECASE) and tbd.dev_type == 'AP':
-                    if tbd.alias == dev_name or tbd.dev_name == re.sub('AP', '', dev_name):
-                        if tbd.ctrlipaddr == '':
-                            ipport = self.search_ap_agent_ipport()
-                        else:
-                            ipport = tbd.ctrlipaddr + ':' + tbd.ctrlport
-                else:
-                    if tbd.alias == dev_name:
-                        ipport = tbd.ctrlipaddr + ':' + tbd.ctrlport
-        return ipport
+        return self.get_testbed_dev_index().search_device_ipport(dev_name)
 
     def storethroughput_converter(self, value):
         """ convert the value from dictionary to string"""
@@ -111,7 +116,7 @@ class Executor(object):
         if node.tag == "END":
             return
         else:
-            new_task = ExecutionTask(self.test_mngr_initr)
+            new_task = ExecutionTask(self.test_mngr_initr, self.run_context)
 
         while node.tag != "END":  # and node.next.tag != 'END':
             if node.tag == "TESTBEDDEVICE":
@@ -201,6 +206,7 @@ class Executor(object):
             else:
                 logging.debug("TBD : %s\n" % node.tag)
             node = node.next
+        new_task.compile()
         return new_task
 
     def add_task(self, active_q, curr_task):
@@ -212,7 +218,7 @@ class Executor(object):
 #         print "check ap involved"
         if self.test_mngr_initr.test_config_info_mngr.test_config_info.var_list.has_key('APUT_state'):
             if self.test_mngr_initr.test_config_info_mngr.test_config_info.var_list['APUT_state'] == 'on':
-                self.aput_name = re.sub('AP', '', TestScriptSymbolTable.test_script_sym_tab["$DUT_Name"])
+                self.aput_name = re.sub('AP', '', self.run_context.test_script_sym_tab["$DUT_Name"])
                 self.aput_flag = 1
                 
         for tbd in self.test_mngr_initr.test_prog_mngr.test_prog.testbed_dev_list:
@@ -332,6 +338,48 @@ class Executor(object):
             else:
                 node = node.next
 
+        if self.graph_enable:
+            self.build_task_graphs()
+
+    def is_graph_task(self, task):
+        """ check the task whether it can run concurrently with the tasks of other devices
+        between two barriers, i.e. a CAPI command which is neither an AP configuration
+        nor a sniffer, traffic or frame command """
+        if type(task) is not ExecutionTask or task.get_type() != "UCCCommand" or task.is_parallel():
+            return False
+        cmd = task.get_cmd().lower()
+        if cmd == "externalfunc" or cmd.startswith(Executor.graph_barrier_prefixes):
+            return False
+        return True
+
+    def build_task_graphs(self):
+        """ Replace the runs of CAPI tasks between barriers in the main Q by dependency graphs,
+        the CAPI command following a flag action stays a barrier so that it is the one reading the flag """
+        items = []
+        while self.main_exec_q.is_empty() == False:
+            items.append(self.main_exec_q.dequeue())
+
+        graph = TaskGraph()
+        flag_pending = False
+        for item in items + [None]:
+            if item is not None and not flag_pending and self.is_graph_task(item):
+                graph.add_task(item)
+                continue
+            if graph.is_concurrent():
+                logging.debug("construct_exec_q: %s tasks of %s devices in a task graph" % (len(graph.nodes), len(graph.devices)))
+                self.main_exec_q.enqueue(graph)
+            else:
+                for task in graph.get_tasks():
+                    self.main_exec_q.enqueue(task)
+            graph = TaskGraph()
+            if item is not None:
+                self.main_exec_q.enqueue(item)
+                if type(item) is ExecutionTask:
+                    if item.get_cmd().lower() in Executor.graph_flag_actions:
+                        flag_pending = True
+                    elif item.get_type() == "UCCCommand":
+                        flag_pending = False
+
     def replace_port(self, ipport, port):
         """ replace the port for parallel configuration """
         ipPortRef = ipport.split(":")[0]
@@ -344,12 +392,18 @@ class Executor(object):
             while completedSubQ.is_empty() == False:
                 self.completed_q.append(completedSubQ.dequeue())
 
-    def proc_subq_task(self, sub_q, port, completed_sub_q):
+    def proc_subq_task(self, sub_q, port, completed_sub_q, cancel_event=None):
         """ This function process task based on a given sub Q and append the 
-        completed task into completed sub Q"""
-
+        completed task into completed sub Q. It returns the (test status,
+        execution result, error flag) tuple of the sub Q, the test status is
+        None if no task was processed"""
+        test_status = None
+        exe_result = "None"
+        curr_task = None
         try:
             while sub_q.is_empty() == False:
+                if cancel_event is not None and cancel_event.isSet():
+                    return (test_status, 'FAIL', True)
                 curr_task = sub_q.dequeue()
                 if (self.search_testbed_device("TestbedAPConfigServer")
                 == self.search_testbed_device(sub_q.name)):
@@ -358,28 +412,32 @@ class Executor(object):
                     curr_task.set_ipport(ipPort)
                     #self.port_offset += 1
                 logging.debug("proc_subq_task: [%s!%s]", curr_task.cmd, curr_task.param)
-                self.exe_result = curr_task.execute()
+                sub_q.curr_ipport = curr_task.get_ipport()
+                exe_result = curr_task.execute()
                 self.log_currObj(curr_task)
-                if self.exe_result == 'FAIL':
-                    self.thread_error_flag = True
+                if exe_result == 'FAIL':
                     completed_sub_q.enqueue(curr_task)
-                    break
+                    return (test_status, exe_result, True)
                 #    self.resultprocess_obj.setTestResult('FAIL')
                 #    self.test_status = 'STOP'
                 # else:
-                self.test_status = ResultProcessor(curr_task).getStatus(self.test_mngr_initr)
+                result_processor = ResultProcessor(curr_task)
+                test_status = result_processor.getStatus(self.test_mngr_initr)
                 #print "subq:test_status : " + self.test_status
-                self.log_exectask(curr_task, ResultProcessor(curr_task))
+                self.log_exectask(curr_task, result_processor)
                 completed_sub_q.enqueue(curr_task)
         except:
-            if self.thread_error_flag == False:
-                self.thread_error_flag = True
-            completed_sub_q.enqueue(curr_task)
+            logging.debug("proc_subq_task: %s failed" % sub_q.name, exc_info=True)
+            if curr_task is not None:
+                completed_sub_q.enqueue(curr_task)
+            return (test_status, exe_result, True)
+        return (test_status, exe_result, False)
 
     def proc_subQ_tasks_parallel(self, para_q_list):
-        """ This is a multi-thread function to spwan threads"""
+        """ This function runs the sub Qs on the worker pool and aggregates their
+        results in sub Q order, a sub Q overrunning $subqTimeout is cancelled"""
         length = len(para_q_list)
-        threads = []
+        futures = []
         completed_subq_list = []
         
         if self.search_testbed_device("PowerSwitch"):
@@ -395,10 +453,14 @@ class Executor(object):
                 tmp = ExecutionQueue()
                 completed_subq_list.append(tmp)
 
-        for curr_subq in para_q_list:
-            thread = threading.Thread(target=self.proc_subq_task,
-                                        args=[curr_subq, self.ap_config_port + self.port_offset,
-                                        completed_subq_list[self.offset]])
+        pool = self.run_context.get_worker_pool(self.get_tuning_value("$subqPoolSize"))
+        subq_timeout = self.get_tuning_value("$subqTimeout")
+        for index, curr_subq in enumerate(para_q_list):
+            cancel_event = threading.Event()
+            future = pool.submit(curr_subq.name, self.proc_subq_task, curr_subq,
+                                 self.ap_config_port + self.port_offset,
+                                 completed_subq_list[index], cancel_event)
+            futures.append((curr_subq, future, cancel_event))
             self.offset += 1
             if (self.search_testbed_device("TestbedAPConfigServer")
                 == self.search_testbed_device(curr_subq.name)):
@@ -407,14 +469,33 @@ class Executor(object):
                         self.ap_port_map[ap_name] =  self.ap_config_port + self.port_offset
                 self.port_offset += 1
 
-            thread.start()
-            threads.append(thread)
+        for curr_subq, future, cancel_event in futures:
+            if not future.wait(subq_timeout):
+                cancel_event.set()
+                pool.abandon(future)
+                if not future.started.isSet():
+                    logging.info("Error: %s did not start within %s seconds, cancelled\n" % (curr_subq.name, subq_timeout))
+                    self.thread_error_flag = True
+                    continue
+                # fail the blocked receive, the next test case reconnects to the agent
+                if curr_subq.curr_ipport is not None:
+                    self.run_context.conn_pool.release(curr_subq.curr_ipport)
+                logging.info("Error: %s did not complete within %s seconds, cancelled\n" % (curr_subq.name, subq_timeout))
+                self.thread_error_flag = True
+                continue
+            if future.result is None:
+                self.thread_error_flag = True
+                continue
+            test_status, exe_result, error_flag = future.result
+            if test_status is not None and self.test_status != 'STOP':
+                self.test_status = test_status
+            self.exe_result = exe_result
+            if error_flag:
+                self.thread_error_flag = True
 
-        for thread in threads:
-            if self.thread_error_flag == True and self.is_validation == False:
-                self.test_status = 'STOP'
-                self.exe_result = 'FAIL'
-            thread.join()
+        if self.thread_error_flag == True and self.is_validation == False:
+            self.test_status = 'STOP'
+            self.exe_result = 'FAIL'
         if self.thread_error_flag == True:
             logging.info("Error: one or more parallel execution failed\n")
         
@@ -467,9 +548,7 @@ class Executor(object):
         except IndexError:
             ip = None
             port = None
-        for tbd in self.test_mngr_initr.test_prog_mngr.test_prog.testbed_dev_list:
-            if tbd.ctrlipaddr == ip:
-                displaynamevalue = tbd.displayname
+        displaynamevalue = self.get_testbed_dev_index().get_displayname(ip)
         if displaynamevalue is not None:
             return displaynamevalue
         else:
@@ -513,9 +592,55 @@ class Executor(object):
                 TestLogFileSource.log_file_source_obj_list[2].write_log_message("%s <-- %s\n" % (displaynamevalue, recv), TestLogFileSource.log_file_hdl_list[2], "SNIFFERLOG")
 
 
+    def proc_graph_task(self, curr_obj):
+        """ This function processes a task of a task graph, it returns False
+        once the remaining tasks must not be started anymore"""
+        if self.ap_port_map.has_key(curr_obj.get_ap_name()):
+            curr_obj.set_ipport(self.replace_port(curr_obj.get_ipport(), self.ap_port_map.get(curr_obj.get_ap_name())))
+        exe_result = curr_obj.execute()
+        self.log_currObj(curr_obj)
+        logging.debug("proc_graph_task: [%s!%s]", curr_obj.cmd, curr_obj.param)
+
+        result_processor = ResultProcessor(curr_obj)
+        if exe_result == 'FAIL':
+            with self.graph_lock:
+                if self.exe_result != 'FAIL' or self.test_status != 'STOP':
+                    self.exe_result = exe_result
+                    self.resultprocess_obj = result_processor
+                self.test_status = 'STOP'
+            return False
+        if self.run_context.test_script_sym_tab["ifCondBit"] == True:
+            test_status = result_processor.getStatus(self.test_mngr_initr)
+            self.log_exectask(curr_obj, result_processor)
+            with self.graph_lock:
+                # the first task stopping the test keeps its result
+                if self.test_status != 'STOP':
+                    self.exe_result = exe_result
+                    self.resultprocess_obj = result_processor
+                    self.test_status = test_status
+            return test_status != 'STOP'
+        return True
+
+    def proc_task_graph(self, graph):
+        """ This function runs the independent device chains of a task graph concurrently"""
+        executed = graph.run(self.proc_graph_task, self.get_tuning_value("$graphMaxWorkers"))
+        self.completed_q.extend(executed)
+        if self.test_status == 'STOP' and self.exe_result == 'FAIL':
+            logging.info("Error: one or more concurrent CAPI commands failed\n")
+
     def proc_mainQ_task(self, curr_obj):
         """ This is a function to process task in the main Q"""
-        self.resultprocess_obj = ResultProcessor(curr_obj)
+        if type(curr_obj) is TaskGraph:
+            if len(self.sub_q_list) > 0 and len(self.sub_q_list) < self.ap_counter:
+                self.proc_subQ_tasks_parallel(self.sub_q_list)
+                self.ap_counter = self.ap_counter - len(self.sub_q_list)
+                self.sub_q_list[:] = []
+            self.proc_task_graph(curr_obj)
+            return
+
+        # sub queues get their result processors in proc_subq_task
+        if type(curr_obj) is ExecutionTask or self.resultprocess_obj is None:
+            self.resultprocess_obj = ResultProcessor(curr_obj)
         if type(curr_obj) is ExecutionQueue:
             self.sub_q_list.append(curr_obj)
             if len(self.sub_q_list) == self.ap_counter:
@@ -545,7 +670,7 @@ class Executor(object):
                 self.resultprocess_obj.setTestResult('FAIL')
                 self.test_status = 'STOP'
             else:
-                if TestScriptSymbolTable.test_script_sym_tab["ifCondBit"] == True:
+                if self.run_context.test_script_sym_tab["ifCondBit"] == True:
                     self.test_status = self.resultprocess_obj.getStatus(self.test_mngr_initr)
                     #print "mainq:test_status : " + self.test_status
                     self.log_exectask(curr_obj, self.resultprocess_obj)
@@ -557,6 +682,7 @@ class Executor(object):
             #    print "TEST ENDS"
 
     def process_exec_q(self):
+        self.run_context.conn_pool.reset_stats()
         while self.main_exec_q.is_empty() == False:
             obj = self.main_exec_q.dequeue()
             self.proc_mainQ_task(obj)
@@ -564,11 +690,21 @@ class Executor(object):
                 if self.exe_result == 'FAIL':
                     self.resultprocess_obj.setTestResult('FAIL')
                 self.resultprocess_obj.generateFinalResult()
+                self.run_context.dispatcher.stop()
+                self.log_conn_pool_stats()
                 return
         if self.main_exec_q.is_empty() == True:
             if self.exe_result == 'FAIL':
                 self.resultprocess_obj.setTestResult('FAIL')
             self.resultprocess_obj.generateFinalResult()
+        self.run_context.dispatcher.stop()
+        self.log_conn_pool_stats()
+
+    def log_conn_pool_stats(self):
+        """ This is an API to log the CAPI connection pool counters of the test case"""
+        stats = self.run_context.conn_pool.get_stats()
+        logging.debug("CAPI connection pool: %s reused connections, %s misses, %s reconnects" %
+                      (stats['hits'], stats['misses'], stats['reconnects']))
 
     def display_completed_q(self):
         """ This is an API to display the completed Q"""
@@ -22,7 +22,6 @@ import re
 from testinfo.testprogram import TestProgramManager
 import testinfo.testbeddevice
 
-from testinfo.datastream import DataStreamManager
 from testinfo.testcase import TestCaseManager, TestCase
 from testinfo.testfeature import TestProgramFeatureManager
 from testinfo.testconfig import (TestConfigInfoManager, TestConfigInfo, Decorator_N, Decorator_TDLS, Decorator_HS2R2, Decorator_WFD, Decorator_P2P, Decorator_HS2,
@@ -31,6 +30,7 @@ from testinfo.testconfig import (TestConfigInfoManager, TestConfigInfo, Decorato
 from core.configurator import TestConfigurator, TestConfigContext
 from scriptinfo.scriptsource import TestFileManager
 from core.configservice import TestConfigService
+from core.runcontext import RunContext
 import common
 
 
@@ -53,11 +53,13 @@ class TestManagerInitializer(object):
         test_config_service (object): The object of test config service class.
         test_config_info_class_list (list): The test config infor class list.
         testbed_dev_file_dict (dictionary): The testbed device file dictionary.
+        run_context (object): The RunContext object owning the data stream manager and the symbol tables.
 
     """
-    def __init__(self, prog_name, tc_name):
+    def __init__(self, prog_name, tc_name, run_context=None):
         self.prog_name = prog_name
         self.tc_name = tc_name
+        self.run_context = run_context if run_context is not None else RunContext.get_current()
 
         self.test_prog_mngr = None
         self.test_case_mngr = None
@@ -101,7 +103,7 @@ class TestManagerInitializer(object):
         self.testbed_dev_mngr = testinfo.testbeddevice.TestbedDeviceManager(self.prog_name)
         self.test_feat_mngr = TestProgramFeatureManager(self.prog_name)
 
-        self.test_data_strm_mngr = DataStreamManager()
+        self.test_data_strm_mngr = self.run_context.create_data_strm_mngr()
 
         test_config_info = TestConfigInfo()
         # search class name in test_config_info_class_list and initialize it if some class is found
@@ -0,0 +1,167 @@
+###############################################################################
+#
+# Copyright (c) 2016 Wi-Fi Alliance
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER
+# RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT,
+# NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE
+# USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+###############################################################################
+
+#!/usr/bin/env python
+
+"""
+Compiled variable substitution templates for CAPI parameter strings
+"""
+
+import re
+
+
+class CapiParamTemplate(object):
+    """The class that substitutes the variables of a parameter string in a single pass.
+
+    The parameter string is split once into tokens and delimiters. Only whole
+    tokens are substituted, so that e.g. $STA1 never rewrites a part of $STA10,
+    and substituted values are never scanned again.
+
+    Attributes:
+        templates (dictionary): The compiled templates keyed by source string and layout.
+        param_layouts (dictionary): The (outer delimiter, field index, inner delimiter) tuple
+            describing where the variables of a command are found, None disables substitution.
+        source (str): The parameter string.
+        parts (list): The tokens at even and the delimiters at odd positions.
+        names (list): The variable names in order of their first appearance.
+        slots (list): The (part position, variable name) tuples to be substituted.
+        render_cache (dictionary): The rendered strings keyed by the tuple of variable values.
+
+    """
+    MAX_CACHED_TEMPLATES = 4096
+    MAX_CACHED_RENDERS = 64
+
+    templates = {}
+    param_layouts = {"if" : ("!", None, None),
+                     "ResultCheck" : ("!", 1, ","),
+                     "CheckThroughput" : ("!", 1, ","),
+                     "StoreThroughput" : ("!", 1, ","),
+                     "traffic_agent_send" : (",", 1, " "),
+                     "traffic_agent_receive_stop" : (",", 1, " "),
+                     "define" : None,
+                     "math" : None,
+                     "config_multi_subresults" : None,
+                     "cat" : None,
+                     "getuserinput" : None}
+    default_layout = (",", None, None)
+
+    def __init__(self, source, outer, index=None, inner=None, dollar_only=True):
+        self.source = source
+        self.parts = re.split("([%s])" % re.escape(outer + (inner or "")), source)
+
+        if index is None:
+            candidates = source.split(outer)
+        else:
+            fields = source.split(outer)
+            candidates = fields[index].split(inner) if index < len(fields) else []
+
+        self.names = []
+        for token in candidates:
+            if token == "" or token in self.names:
+                continue
+            if dollar_only and token.find("$") == -1:
+                continue
+            self.names.append(token)
+
+        self.slots = [(i, self.parts[i]) for i in range(0, len(self.parts), 2) if self.parts[i] in self.names]
+        self.render_cache = {}
+
+
+    @staticmethod
+    def compile(source, outer, index=None, inner=None, dollar_only=True):
+        """Gets the compiled template of a parameter string, compiling it only once.
+
+        Args:
+            source (str): The parameter string.
+            outer (str): The delimiter of the fields.
+            index (int): The field holding the variables, None for all fields.
+            inner (str): The delimiter of the variables inside the field.
+            dollar_only (boolean): The flag to only treat tokens containing $ as variables.
+        """
+        key = (source, outer, index, inner, dollar_only)
+        template = CapiParamTemplate.templates.get(key)
+        if template is None:
+            if len(CapiParamTemplate.templates) >= CapiParamTemplate.MAX_CACHED_TEMPLATES:
+                CapiParamTemplate.templates.clear()
+            template = CapiParamTemplate(source, outer, index, inner, dollar_only)
+            CapiParamTemplate.templates[key] = template
+        return template
+
+
+    @staticmethod
+    def normalize(cmd, param):
+        """Rewrites the operators of an if condition into ! separated tokens.
+
+        Args:
+            cmd (str): The command name.
+            param (str): The parameter string.
+        """
+        if cmd == "if":
+            param = param.replace(" or ", "!or!")
+            param = param.replace(" and ", "!and!")
+            param = param.replace("=", "!=!")
+            param = param.replace("<", "!<!")
+            param = param.replace(">", "!>!")
+            param = param.replace("!!", "")
+        return param
+
+
+    @staticmethod
+    def get_for_command(cmd, param):
+        """Gets the template of a normalized command parameter string.
+
+        Args:
+            cmd (str): The command name.
+            param (str): The normalized parameter string.
+
+        Returns None if the command does not substitute its variables.
+        """
+        if not isinstance(param, basestring) or param.find("$") == -1:
+            return None
+        layout = CapiParamTemplate.param_layouts.get(cmd, CapiParamTemplate.default_layout)
+        if layout is None:
+            return None
+        return CapiParamTemplate.compile(param, *layout)
+
+
+    def render(self, resolve):
+        """Substitutes all variables in a single pass.
+
+        Args:
+            resolve (function): The callback returning the value string of a variable
+                name, or None to leave the variable as it is.
+        """
+        if not self.slots:
+            return self.source
+
+        values = {}
+        for name in self.names:
+            values[name] = resolve(name)
+
+        key = tuple([values[name] for name in self.names])
+        rendered = self.render_cache.get(key)
+        if rendered is None:
+            parts = list(self.parts)
+            for i, name in self.slots:
+                if values[name] is not None:
+                    parts[i] = values[name]
+            rendered = "".join(parts)
+            if len(self.render_cache) >= CapiParamTemplate.MAX_CACHED_RENDERS:
+                self.render_cache.clear()
+            self.render_cache[key] = rendered
+        return rendered
@@ -21,14 +21,15 @@
 import logging
 import random
 from operator import itemgetter
-from xml.dom.minidom import Node
 from scriptinfo.scriptelement import (TestScriptElementType, ScriptReservedWordsElement, ScriptSpecialSymbolElement,
 CAPICommandElement, ScriptStringElement, ScriptVariableElement, TestbedDeviceElement, TestFeatureElement, CAPIReturnElement, EndOfLineElement)
 import common
 from symtable import TestScriptSymbolTable
 from scriptinfo.scriptsource import TestFileSourceFacotry
 from scanner import TestScriptScanner, LexicaError, SyntaxError
-from util.linkedlist import SingleLinkedList
+from scriptcache import TestScriptCache
+from paramtemplate import CapiParamTemplate
+from util.linkedlist import IndexedSingleLinkedList
 from util.misc import Util
 
 
@@ -70,17 +71,19 @@ class XmlFileParser:
     Attributes:
         xml_file_source (object): The object of TestXmlFileSource class.
         sll (object): The object of SingleLinkedList class.
+        test_info_index (object): The MasterTestInfoIndex object of the xml file.
 
     """
     def __init__(self, xml_file_source):
         self.xml_file_source = xml_file_source
         self.sll = None #SingleLinkedList()
+        self.test_info_index = None
 
 
     def init_parser(self):
         """Initializes the SingleLinkedList object.
         """
-        self.sll = SingleLinkedList()
+        self.sll = IndexedSingleLinkedList()
 
 
     def build_sll_from_xml_tree_node(self, node_name, node_value=""):
@@ -94,59 +97,47 @@ class XmlFileParser:
 
 
     def parse(self):
-        """Parses the DOM tree of XML file.
+        """Parses the test case subtree of XML file from the shared index.
         """
         try:
             if self.xml_file_source.xml_file_name == common.GlobalConfigFiles.master_test_info_file:
-                self.xml_file_source.load_xml_file()
+                self.test_info_index = self.xml_file_source.get_test_info_index()
                 
+                tc_record = self.get_test_case_node(common.GlobalConfigFiles.curr_tc_name)
                 root = self.parse_root_node()
                 logging.info("Testplan version=%s" % root)
-                tc_node = self.get_test_case_node(common.GlobalConfigFiles.curr_tc_name)
-                self.parse_tc_tree_node(tc_node)
+                self.parse_tc_tree_node(tc_record)
 
         except Exception, e1:
             raise e1
 
 
     def parse_root_node(self):
-        """Gets the root node.
+        """Gets the root node name.
         """
-        return self.xml_file_source.get_root_node_name()
+        return self.test_info_index.get_root_name()
 
 
     def get_test_case_node(self, tc_tag):
-        """Gets the test case node based on the given test case name tag.
+        """Gets the test case record based on the given test case name tag.
 
         Args:
             tc_tag (str): The test case name tag.
         """
-        nodes = self.xml_file_source.get_nodes_by_tag_name(tc_tag)
-        if len(nodes) == 0:
+        tc_record = self.xml_file_source.load_test_case(tc_tag)
+        if tc_record is None:
             raise Exception('Test Case ID not exist - %s' % common.GlobalConfigFiles.curr_tc_name)
-        if len(nodes) > 1:
-            raise Exception('Duplicate Test Case ID - %s' % common.GlobalConfigFiles.curr_tc_name)
-        return nodes[0]
+        return tc_record
 
 
-    def parse_tc_tree_node(self, tc_node):
-        """Parses the test case subtree based on the given node.
+    def parse_tc_tree_node(self, tc_record):
+        """Stores the test case subtree on the sll.
 
         Args:
-            tc_node (str): The node whose subtree to be parsed.
+            tc_record (object): The MasterTestInfoRecord object of the test case.
         """
-        for child in tc_node.childNodes:
-            if child.nodeType == Node.ELEMENT_NODE:
-                if child.firstChild is None:
-                    continue
-                if child.firstChild.nodeType == Node.TEXT_NODE:
-                    self.build_sll_from_xml_tree_node(child.nodeName, child.firstChild.nodeValue)
-                else:
-                    self.build_sll_from_xml_tree_node(child.nodeName)
-        
-                self.parse_tc_tree_node(child)
-            elif child.nodeType == Node.TEXT_NODE:
-                pass
+        for node_name, node_value in tc_record.entries:
+            self.build_sll_from_xml_tree_node(node_name, node_value)
                 
 
 
@@ -160,6 +151,7 @@ class TestScriptParser:
         group_tag_name (str): The file name added to indicate the start of sub file calling.
         add_end_flag (boolean): The indicator for adding the END element.
         sub_file_call_dict (dictionary): The dictionary to store the script calling sequence.
+        script_cache (object): The object of TestScriptCache class storing the compiled scripts.
 
     """
     qll = None # for parsing test case script files
@@ -169,6 +161,7 @@ class TestScriptParser:
     add_end_flag = False
     sub_file_call_dict = {}
     device_alias_list = []
+    script_cache = TestScriptCache()
 
     def __init__(self, test_script_scanner, test_mngr_initr):
         self.test_script_scanner = test_script_scanner
@@ -176,6 +169,27 @@ class TestScriptParser:
         self.test_mngr_initr = test_mngr_initr
 
 
+    def lookup_sym_tab(self, key, which_table):
+        """Looks up the dictionary for a key and tells the scanner's read listener.
+
+        Args:
+            key (str): The entry key.
+            which_table (dictionary): The dictionary to look up.
+        """
+        self.test_script_scanner.notify_read(key, which_table)
+        return TestScriptSymbolTable.lookup_sym_tab(key, which_table)
+
+
+    def get_value_from_sym_tab(self, key, which_table):
+        """Gets the entry value from the dictionary and tells the scanner's read listener.
+
+        Args:
+            key (str): The entry key.
+            which_table (dictionary): The dictionary to get the entry from.
+        """
+        return self.test_script_scanner.get_value_from_sym_tab(key, which_table)
+
+
     def build_sll_from_xml_tree_node(self, key_name, key_value, tag):
         """Constructs the ill or sll node from the given key, value and tag.
 
@@ -195,18 +209,42 @@ class TestScriptParser:
         """
         if self.test_mngr_initr.test_config_cxt.is_test_case_file or self.test_mngr_initr.test_config_cxt.is_all_init_command_file:
             if TestScriptParser.qll is None:
-                TestScriptParser.qll = SingleLinkedList()
+                TestScriptParser.qll = IndexedSingleLinkedList()
 
             if self.test_mngr_initr.test_config_cxt.is_test_case_file:
                 TestScriptParser.qll.insert("MAINSCRIPT", None, "SEPRATROR", TestScriptParser.group_tag_name)
 
         elif self.test_mngr_initr.test_config_cxt.is_all_init_config_file:
-            TestScriptParser.ill = SingleLinkedList()
+            TestScriptParser.ill = IndexedSingleLinkedList()
         else:
-            self.sll = SingleLinkedList()
+            self.sll = IndexedSingleLinkedList()
 
 
     def parse(self):
+        """Parses the test source file, or loads its compiled form if it has not changed.
+        """
+        if TestScriptParser.script_cache.is_compiling():
+            # sub-file called by the script being compiled
+            TestScriptParser.script_cache.add_source(self.test_script_scanner.test_script_source)
+            self.parse_script()
+            return
+
+        if TestScriptParser.script_cache.load(self):
+            return
+
+        TestScriptParser.script_cache.start(self)
+        self.test_script_scanner.read_listener = TestScriptParser.script_cache.record_read
+        try:
+            self.parse_script()
+        except:
+            TestScriptParser.script_cache.abort()
+            raise
+        finally:
+            self.test_script_scanner.read_listener = None
+        TestScriptParser.script_cache.store(self)
+
+
+    def parse_script(self):
         """Parses the test source file through the underlying scanner.
         """
         try:
@@ -250,7 +288,7 @@ class TestScriptParser:
 
                 #"sta_preset_testparameters"
                 if common.GlobalConfigFiles.curr_prog_name == "PMF" and self.test_script_scanner.current_elmt.segment_text == TestScriptElementType.get_capi_name_from_val(TestScriptElementType.TRAFFIC_STOP_PING):
-                    if not TestScriptSymbolTable.lookup_sym_tab("$pingResp", TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+                    if not self.lookup_sym_tab("$pingResp", TestScriptSymbolTable.capi_cmd_ret_sym_tab):
                         TestScriptSymbolTable.insert_sym_tab("$pingResp", "", TestScriptSymbolTable.capi_cmd_ret_sym_tab)
                 
                 if self.test_script_scanner.current_elmt.paramstr != "":
@@ -291,7 +329,7 @@ class TestScriptParser:
                 for item in self.test_script_scanner.current_elmt.paramstr.split(','):
                     if item.startswith('$'):
                         TestScriptSymbolTable.insert_sym_tab(item, "", TestScriptSymbolTable.capi_cmd_ret_sym_tab)
-                        if TestScriptSymbolTable.lookup_sym_tab(item, TestScriptSymbolTable.test_script_sym_tab):
+                        if self.lookup_sym_tab(item, TestScriptSymbolTable.test_script_sym_tab):
                             TestScriptSymbolTable.delete_key_from_sym_tab(item, TestScriptSymbolTable.test_script_sym_tab)
         else:
             raise SyntaxError
@@ -300,38 +338,37 @@ class TestScriptParser:
     def replace_capi_variable_by_value(self, paramstr):
         """Replaces the dollar variables with their actual values if possible.
 
+        Each comma separated field is looked up as a whole, so a variable is never
+        replaced inside a longer field or inside a value substituted before it.
+
         Args:
             paramstr (str): The parameter string to be replaced.
         """
-        for var in paramstr.split(','):
-            if var.startswith('$'):
-                val = TestScriptSymbolTable.get_value_from_sym_tab(var, TestScriptSymbolTable.test_script_sym_tab)
-                if val is not None:
-                    val1 = TestScriptSymbolTable.get_value_from_sym_tab(val, TestScriptSymbolTable.test_script_sym_tab)
-                    if val1 is not None:
-                        paramstr = paramstr.replace(var, val1, 1)
-                    else:
-                        if TestScriptSymbolTable.lookup_sym_tab(var, TestScriptSymbolTable.capi_cmd_ret_sym_tab) and not TestScriptSymbolTable.lookup_sym_tab(var, TestScriptSymbolTable.test_script_sym_tab):
-                            continue                        
-                        else:
-                            #===================================================
-                            # if TestScriptSymbolTable.lookup_sym_tab(var, TestScriptSymbolTable.capi_cmd_ret_sym_tab) and TestScriptSymbolTable.lookup_sym_tab(var, TestScriptSymbolTable.test_script_sym_tab):
-                            #     value = TestScriptSymbolTable.get_value_from_sym_tab(var, TestScriptSymbolTable.test_script_sym_tab)
-                            #     if value.startswith('$'):
-                            #         continue
-                            #===================================================
-                            paramstr = paramstr.replace(var, val, 1)
-            else:
-                val = TestScriptSymbolTable.get_value_from_sym_tab(var, TestScriptSymbolTable.test_script_sym_tab)
-                if val is not None:
-                    if isinstance(val, dict):
-                        if "ipaddr" in val:
-                            ipaddr = val["ipaddr"]                        
-                        paramstr = paramstr.replace(var, ipaddr, 1)
-                    else:
-                        paramstr = paramstr.replace(var, val, 1)
-                
-        return paramstr
+        template = CapiParamTemplate.compile(paramstr, ",", dollar_only=False)
+        return template.render(self.get_capi_variable_value)
+
+
+    def get_capi_variable_value(self, var):
+        """Gets the parsing time value of a CAPI parameter field, None if it is kept as it is.
+
+        Args:
+            var (str): The parameter field.
+        """
+        val = self.get_value_from_sym_tab(var, TestScriptSymbolTable.test_script_sym_tab)
+        if val is None:
+            return None
+
+        if var.startswith('$') and isinstance(val, basestring):
+            val1 = self.get_value_from_sym_tab(val, TestScriptSymbolTable.test_script_sym_tab)
+            if val1 is not None:
+                return str(val1)
+            return val
+
+        if isinstance(val, dict):
+            if "ipaddr" in val:
+                return val["ipaddr"]
+            return None
+        return str(val)
 
 
     def parse_reserved_words(self, element_type):
@@ -379,8 +416,8 @@ class TestScriptParser:
             self.test_script_scanner.next_element()
             sub_rslt = self.test_script_scanner.current_elmt.segment_text.split(',')
             if len(sub_rslt) == 2:
-                num_req = TestScriptSymbolTable.get_value_from_sym_tab(sub_rslt[0], TestScriptSymbolTable.test_script_sym_tab)
-                num_chk = TestScriptSymbolTable.get_value_from_sym_tab(sub_rslt[1], TestScriptSymbolTable.test_script_sym_tab)
+                num_req = self.get_value_from_sym_tab(sub_rslt[0], TestScriptSymbolTable.test_script_sym_tab)
+                num_chk = self.get_value_from_sym_tab(sub_rslt[1], TestScriptSymbolTable.test_script_sym_tab)
                 TestScriptParser.qll.insert(keyword, {"NUMOFPASSREQ": num_req, "NUMOFCHECK" : num_chk}, "UCCACTION", TestScriptParser.group_tag_name)
                 TestScriptParser.add_end_flag = True
             else:
@@ -426,6 +463,7 @@ class TestScriptParser:
             txtFileFactory = TestFileSourceFacotry(filename, self.test_mngr_initr.test_script_mngr.prog_script_folder_path)
             txtFileSource = txtFileFactory.file_factory_method()
             txt_parser = TestScriptParserFactory.create_parser(txtFileSource, self.test_mngr_initr)
+            txt_parser.test_script_scanner.read_listener = self.test_script_scanner.read_listener
 
             TestScriptParser.group_tag_name = filename
             txt_parser.parse()
@@ -464,17 +502,17 @@ class TestScriptParser:
         cmd = []
 
         for item in cmd2.split(" "):
-            if TestScriptSymbolTable.lookup_sym_tab(item, TestScriptSymbolTable.test_script_sym_tab):
-                cmd.append(TestScriptSymbolTable.get_value_from_sym_tab(item, TestScriptSymbolTable.test_script_sym_tab))
+            if self.lookup_sym_tab(item, TestScriptSymbolTable.test_script_sym_tab):
+                cmd.append(self.get_value_from_sym_tab(item, TestScriptSymbolTable.test_script_sym_tab))
             else:
                 cmd.append("$$$")
 
         common.logging.debug("..append %s = %s %s using %s" % (cmd1, cmd[0] if cmd[0] != "$$$" else cmd2.split(" ")[0], cmd[1] if cmd[1] != "$$$" else cmd2.split(" ")[1], "space" if cmd3 == " " else cmd3))
 
-        if TestScriptSymbolTable.lookup_sym_tab(cmd1, TestScriptSymbolTable.test_script_sym_tab):
+        if self.lookup_sym_tab(cmd1, TestScriptSymbolTable.test_script_sym_tab):
             TestScriptSymbolTable.insert_sym_tab(cmd1, "%s%s%s" % (cmd[0], cmd3, cmd[1]), TestScriptSymbolTable.test_script_sym_tab)
         else:
-            if not TestScriptSymbolTable.lookup_sym_tab(cmd1, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+            if not self.lookup_sym_tab(cmd1, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
                 TestScriptSymbolTable.insert_sym_tab(cmd1, "", TestScriptSymbolTable.capi_cmd_ret_sym_tab)
             TestScriptParser.qll.insert(cmd0, {"LISTNAME" : cmd1, "LISTITEM" : {cmd2.split(" ")[0] : cmd[0], cmd2.split(" ")[1] : cmd[1]}, "ITEMDELIMITER" : cmd3}, "UCCACTION", TestScriptParser.group_tag_name)
             TestScriptParser.add_end_flag = True
@@ -490,7 +528,7 @@ class TestScriptParser:
         
         self.test_script_scanner.next_element()
         cmdvar = self.test_script_scanner.next_segment
-        if not TestScriptSymbolTable.lookup_sym_tab(cmdvar, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+        if not self.lookup_sym_tab(cmdvar, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
             TestScriptSymbolTable.insert_sym_tab(cmdvar, "", TestScriptSymbolTable.capi_cmd_ret_sym_tab)
 
         TestScriptParser.qll.insert(cmd0, {"MSG" : cmdval, "INPUTVAL" : cmdvar}, "UCCACTION", TestScriptParser.group_tag_name)
@@ -502,6 +540,7 @@ class TestScriptParser:
         """Parses the SnifferEnable keyword.
         """
         snf_val = self.test_script_scanner.get_next_segment_value()
+        TestScriptParser.script_cache.depends_on_test_case()
         TestScriptSymbolTable.insert_sym_tab("$SnifferFileName", "%s_%s" % ("SnifferTrace", common.GlobalConfigFiles.curr_tc_name), TestScriptSymbolTable.test_script_sym_tab)
         if snf_val == '1':
             TestScriptSymbolTable.insert_sym_tab("$StartSniffer", "Sniffer-Start.txt", TestScriptSymbolTable.test_script_sym_tab)
@@ -536,13 +575,13 @@ class TestScriptParser:
         """
         ucckey = self.test_script_scanner.current_elmt.segment_text
         uccval = self.test_script_scanner.get_next_segment_value()
-        if uccval == "" and TestScriptSymbolTable.lookup_sym_tab(self.test_script_scanner.next_segment, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+        if uccval == "" and self.lookup_sym_tab(self.test_script_scanner.next_segment, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
             uccval = self.test_script_scanner.next_segment
         else:
-            if TestScriptSymbolTable.lookup_sym_tab(self.test_script_scanner.next_segment, TestScriptSymbolTable.test_script_sym_tab):
-                uccval = TestScriptSymbolTable.get_value_from_sym_tab(self.test_script_scanner.next_segment, TestScriptSymbolTable.test_script_sym_tab)
-                if TestScriptSymbolTable.lookup_sym_tab(uccval, TestScriptSymbolTable.test_script_sym_tab):
-                    uccval = TestScriptSymbolTable.get_value_from_sym_tab(uccval, TestScriptSymbolTable.test_script_sym_tab)
+            if self.lookup_sym_tab(self.test_script_scanner.next_segment, TestScriptSymbolTable.test_script_sym_tab):
+                uccval = self.get_value_from_sym_tab(self.test_script_scanner.next_segment, TestScriptSymbolTable.test_script_sym_tab)
+                if self.lookup_sym_tab(uccval, TestScriptSymbolTable.test_script_sym_tab):
+                    uccval = self.get_value_from_sym_tab(uccval, TestScriptSymbolTable.test_script_sym_tab)
 
         if element_type == TestScriptElementType.SLEEP:
             TestScriptParser.qll.insert(ucckey, uccval, "UCCACTION", TestScriptParser.group_tag_name)
@@ -562,10 +601,10 @@ class TestScriptParser:
         cmd0 = self.test_script_scanner.current_elmt.segment_text
         first_mex_var = self.test_script_scanner.next_segment
         first_mex_var_val = ""
-        if TestScriptSymbolTable.lookup_sym_tab(first_mex_var, TestScriptSymbolTable.test_script_sym_tab):
-            first_mex_var_val = TestScriptSymbolTable.get_value_from_sym_tab(first_mex_var, TestScriptSymbolTable.test_script_sym_tab)
+        if self.lookup_sym_tab(first_mex_var, TestScriptSymbolTable.test_script_sym_tab):
+            first_mex_var_val = self.get_value_from_sym_tab(first_mex_var, TestScriptSymbolTable.test_script_sym_tab)
         else:
-            if not TestScriptSymbolTable.lookup_sym_tab(first_mex_var, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+            if not self.lookup_sym_tab(first_mex_var, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
                 TestScriptSymbolTable.insert_sym_tab(first_mex_var, "", TestScriptSymbolTable.capi_cmd_ret_sym_tab)
 
         self.test_script_scanner.next_element()
@@ -579,7 +618,7 @@ class TestScriptParser:
             if first_mex_var_val != "" and third_mex_var_val != "":
                 TestScriptSymbolTable.insert_sym_tab(first_mex_var, (int(first_mex_var_val) * int(third_mex_var_val)) / 100, TestScriptSymbolTable.test_script_sym_tab)
             else:
-                if TestScriptElementType.get_element_type(third_mex_var) == "VARIABLE" and not TestScriptSymbolTable.lookup_sym_tab(third_mex_var, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+                if TestScriptElementType.get_element_type(third_mex_var) == "VARIABLE" and not self.lookup_sym_tab(third_mex_var, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
                     TestScriptSymbolTable.insert_sym_tab(third_mex_var, "", TestScriptSymbolTable.capi_cmd_ret_sym_tab)
                 TestScriptParser.qll.insert(cmd0, {"FIRSTVAR" : first_mex_var, "OPERATOR" : second_mex_var, "SECONDVAR" : third_mex_var_val}, "UCCACTION", TestScriptParser.group_tag_name)
                 TestScriptParser.add_end_flag = True
@@ -592,13 +631,13 @@ class TestScriptParser:
         """        
         rslt_chk = self.test_script_scanner.next_segment.split(',')
 
-        rslt_var_val = TestScriptSymbolTable.get_value_from_sym_tab(rslt_chk[0], TestScriptSymbolTable.test_script_sym_tab)
+        rslt_var_val = self.get_value_from_sym_tab(rslt_chk[0], TestScriptSymbolTable.test_script_sym_tab)
         if rslt_var_val:
             final_str = self.test_script_scanner.next_segment.replace(rslt_chk[0], rslt_var_val)
             TestScriptParser.qll.insert(self.test_script_scanner.current_elmt.segment_text, final_str, "RESULTCHECK", TestScriptParser.group_tag_name)
             TestScriptParser.add_end_flag = True
         else:
-            rslt_var_val1 = TestScriptSymbolTable.get_value_from_sym_tab(rslt_chk[0], TestScriptSymbolTable.capi_cmd_ret_sym_tab)
+            rslt_var_val1 = self.get_value_from_sym_tab(rslt_chk[0], TestScriptSymbolTable.capi_cmd_ret_sym_tab)
             if rslt_var_val1 or rslt_var_val1 == "":
                 TestScriptParser.qll.insert(self.test_script_scanner.current_elmt.segment_text, self.test_script_scanner.next_segment, "RESULTCHECK", TestScriptParser.group_tag_name)
                 TestScriptParser.add_end_flag = True
@@ -625,10 +664,10 @@ class TestScriptParser:
         third_cat_var = self.test_script_scanner.next_segment
 
         for v in varlist:
-            if TestScriptSymbolTable.lookup_sym_tab(v, TestScriptSymbolTable.test_script_sym_tab):
-                second_cat_val = TestScriptSymbolTable.get_value_from_sym_tab(v, TestScriptSymbolTable.test_script_sym_tab)
-                if TestScriptSymbolTable.lookup_sym_tab(second_cat_val, TestScriptSymbolTable.test_script_sym_tab):
-                    second_cat_val = TestScriptSymbolTable.get_value_from_sym_tab(second_cat_val, TestScriptSymbolTable.test_script_sym_tab)
+            if self.lookup_sym_tab(v, TestScriptSymbolTable.test_script_sym_tab):
+                second_cat_val = self.get_value_from_sym_tab(v, TestScriptSymbolTable.test_script_sym_tab)
+                if self.lookup_sym_tab(second_cat_val, TestScriptSymbolTable.test_script_sym_tab):
+                    second_cat_val = self.get_value_from_sym_tab(second_cat_val, TestScriptSymbolTable.test_script_sym_tab)
                 if second_cat_val:
                     if var:
                         var = ("%s%s%s" % (var, third_cat_var, v))
@@ -638,14 +677,14 @@ class TestScriptParser:
                 else:
                     comma_list.append(v)
             else:
-                if not TestScriptSymbolTable.lookup_sym_tab(v, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+                if not self.lookup_sym_tab(v, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
                     TestScriptSymbolTable.insert_sym_tab(v, "", TestScriptSymbolTable.capi_cmd_ret_sym_tab)
         # end of for loop
 
-        if TestScriptSymbolTable.lookup_sym_tab(first_cat_var, TestScriptSymbolTable.test_script_sym_tab):
+        if self.lookup_sym_tab(first_cat_var, TestScriptSymbolTable.test_script_sym_tab):
             TestScriptSymbolTable.insert_sym_tab(first_cat_var, var, TestScriptSymbolTable.test_script_sym_tab)
         else:
-            if not TestScriptSymbolTable.lookup_sym_tab(first_cat_var, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+            if not self.lookup_sym_tab(first_cat_var, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
                 TestScriptSymbolTable.insert_sym_tab(first_cat_var, "", TestScriptSymbolTable.capi_cmd_ret_sym_tab)
             TestScriptParser.qll.insert(cmd0, {"FIRSTVAR" : first_cat_var, "VARLIST" : ','.join(comma_list), "DELIMITER" : third_cat_var}, "UCCACTION", TestScriptParser.group_tag_name)
             TestScriptParser.add_end_flag = True
@@ -662,10 +701,10 @@ class TestScriptParser:
 
         st_var2 = self.test_script_scanner.next_segment
         cmd = st_var2.split(",")
-        cmd2_val = TestScriptSymbolTable.get_value_from_sym_tab(cmd[2], TestScriptSymbolTable.test_script_sym_tab)
+        cmd2_val = self.get_value_from_sym_tab(cmd[2], TestScriptSymbolTable.test_script_sym_tab)
         common.logging.debug("Storing the Throughput(Mbps) value of stream %s[%s %s] in %s  duration=%s phase=%s", cmd[0], cmd[3], "%", st_var1, cmd2_val, cmd[1])
 
-        if TestScriptSymbolTable.lookup_sym_tab(cmd[0], TestScriptSymbolTable.capi_cmd_ret_sym_tab) and not TestScriptSymbolTable.lookup_sym_tab(st_var1, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+        if self.lookup_sym_tab(cmd[0], TestScriptSymbolTable.capi_cmd_ret_sym_tab) and not self.lookup_sym_tab(st_var1, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
             TestScriptSymbolTable.insert_sym_tab(st_var1, "", TestScriptSymbolTable.capi_cmd_ret_sym_tab)
         else:
             TestScriptSymbolTable.insert_sym_tab(st_var1, "", TestScriptSymbolTable.test_script_sym_tab)
@@ -678,12 +717,12 @@ class TestScriptParser:
     def process_echoIfNoWTS(self):
         """Parses the EchoIfnowts keyword.
         """       
-        if TestScriptSymbolTable.get_value_from_sym_tab("$" + TestScriptElementType.WTS_CONTROLAGENT_SUPPORT, TestScriptSymbolTable.test_script_sym_tab) == "0":
+        if self.get_value_from_sym_tab("$" + TestScriptElementType.WTS_CONTROLAGENT_SUPPORT, TestScriptSymbolTable.test_script_sym_tab) == "0":
             keyword = self.test_script_scanner.current_elmt.segment_text
             if self.test_script_scanner.next_segment.startswith('$'):
                 var1 = self.test_script_scanner.next_segment
                 var1_val = self.test_script_scanner.get_next_segment_value()
-                if var1_val == "" and TestScriptSymbolTable.lookup_sym_tab(var1, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+                if var1_val == "" and self.lookup_sym_tab(var1, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
                     TestScriptParser.qll.insert(keyword, {"MSG" : var1}, "UCCACTION", TestScriptParser.group_tag_name)
                     TestScriptParser.add_end_flag = True
                 elif var1_val != "":
@@ -697,14 +736,14 @@ class TestScriptParser:
         else:
             self.test_script_scanner.skip_next_segment()
             if isinstance(self.test_script_scanner.current_elmt, ScriptVariableElement):
-                if not (TestScriptSymbolTable.lookup_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.capi_cmd_ret_sym_tab) and TestScriptSymbolTable.lookup_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.test_script_sym_tab)):
+                if not (self.lookup_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.capi_cmd_ret_sym_tab) and self.lookup_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.test_script_sym_tab)):
                     raise common.TestConfigError("Not recognized variable - %s" % self.test_script_scanner.current_elmt.segment_text)
 
 
     def process_ifNoWTS(self):
         """Parses the Ifnowts keyword.
         """        
-        if TestScriptSymbolTable.get_value_from_sym_tab("$" + TestScriptElementType.WTS_CONTROLAGENT_SUPPORT, TestScriptSymbolTable.test_script_sym_tab) == "0":
+        if self.get_value_from_sym_tab("$" + TestScriptElementType.WTS_CONTROLAGENT_SUPPORT, TestScriptSymbolTable.test_script_sym_tab) == "0":
             keyword = self.test_script_scanner.current_elmt.segment_text
             last_var = ""
             var2 = self.test_script_scanner.next_segment
@@ -712,7 +751,7 @@ class TestScriptParser:
             if self.test_script_scanner.next_segment != "EOL":
                 var3 = self.test_script_scanner.next_segment
                 var3_val = self.test_script_scanner.get_next_segment_value()
-                if var3_val == "" and TestScriptSymbolTable.lookup_sym_tab(var3, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+                if var3_val == "" and self.lookup_sym_tab(var3, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
                     last_var = var3
                 elif var3_val != "":
                     last_var = var3_val
@@ -736,7 +775,7 @@ class TestScriptParser:
         self.test_script_scanner.next_element()
         rand_var1 = self.test_script_scanner.current_elmt.segment_text
         if isinstance(self.test_script_scanner.current_elmt, ScriptVariableElement):
-            if TestScriptSymbolTable.lookup_sym_tab(rand_var1, TestScriptSymbolTable.test_script_sym_tab):
+            if self.lookup_sym_tab(rand_var1, TestScriptSymbolTable.test_script_sym_tab):
                 if re.search('null', rand_var1):
                     cmd1 = "null"
                 else:
@@ -746,16 +785,16 @@ class TestScriptParser:
                     else:
                         cmd1 = rand_var1_val.split(" ")
             else:
-                if not TestScriptSymbolTable.lookup_sym_tab(rand_var1, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+                if not self.lookup_sym_tab(rand_var1, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
                     TestScriptSymbolTable.insert_sym_tab(rand_var1, "", TestScriptSymbolTable.capi_cmd_ret_sym_tab)
 
         self.test_script_scanner.next_element()
         rand_var2 = self.test_script_scanner.current_elmt.segment_text
         if isinstance(self.test_script_scanner.current_elmt, ScriptVariableElement):
-            if TestScriptSymbolTable.lookup_sym_tab(rand_var2, TestScriptSymbolTable.test_script_sym_tab):
+            if self.lookup_sym_tab(rand_var2, TestScriptSymbolTable.test_script_sym_tab):
                 TestScriptSymbolTable.insert_sym_tab(rand_var2, "0", TestScriptSymbolTable.test_script_sym_tab)
             else:
-                if not TestScriptSymbolTable.lookup_sym_tab(rand_var1, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+                if not self.lookup_sym_tab(rand_var1, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
                     TestScriptSymbolTable.insert_sym_tab(rand_var1, "", TestScriptSymbolTable.capi_cmd_ret_sym_tab)
 
         rand_var3 = self.test_script_scanner.next_segment
@@ -769,6 +808,8 @@ class TestScriptParser:
             i = 0
             oplist = []
 
+            # random values must not be frozen into the compiled script
+            TestScriptParser.script_cache.set_uncacheable()
             while True:
                 randnum = random.randint(0, 65535)
                 for c in cmd1:
@@ -785,7 +826,7 @@ class TestScriptParser:
                     break
 
             TestScriptSymbolTable.insert_sym_tab(rand_var2, ' '.join("%d" % x for x in oplist), TestScriptSymbolTable.test_script_sym_tab)
-            common.logging.debug(" %s" % TestScriptSymbolTable.get_value_from_sym_tab(rand_var2, TestScriptSymbolTable.test_script_sym_tab))
+            common.logging.debug(" %s" % self.get_value_from_sym_tab(rand_var2, TestScriptSymbolTable.test_script_sym_tab))
         else:
             TestScriptParser.qll.insert(cmd0, {"FIRSTVAR" : rand_var1, "RANDVAR" : rand_var2, "RANDMAX" : rand_var3}, "UCCACTION", TestScriptParser.group_tag_name)
             TestScriptParser.add_end_flag = True
@@ -801,7 +842,7 @@ class TestScriptParser:
         rslt_list1 = self.test_script_scanner.next_segment.split(',')
         for i, item in enumerate(rslt_list):
             if item.startswith('$'):
-                item_val = TestScriptSymbolTable.get_value_from_sym_tab(item, TestScriptSymbolTable.test_script_sym_tab)
+                item_val = self.get_value_from_sym_tab(item, TestScriptSymbolTable.test_script_sym_tab)
                 if item_val is not None:
                     rslt_list1[i] = item_val                  
 
@@ -819,19 +860,19 @@ class TestScriptParser:
         cmd1 = []
         cmd2 = ""
         first_seg_var = self.test_script_scanner.next_segment
-        if TestScriptSymbolTable.lookup_sym_tab(first_seg_var, TestScriptSymbolTable.test_script_sym_tab):
-            first_seg_val = TestScriptSymbolTable.get_value_from_sym_tab(first_seg_var, TestScriptSymbolTable.test_script_sym_tab)
+        if self.lookup_sym_tab(first_seg_var, TestScriptSymbolTable.test_script_sym_tab):
+            first_seg_val = self.get_value_from_sym_tab(first_seg_var, TestScriptSymbolTable.test_script_sym_tab)
             if first_seg_val is not None:
                 cmd1 = first_seg_val
         else:
-            if not TestScriptSymbolTable.lookup_sym_tab(first_seg_var, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+            if not self.lookup_sym_tab(first_seg_var, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
                 TestScriptSymbolTable.insert_sym_tab(first_seg_var, "", TestScriptSymbolTable.capi_cmd_ret_sym_tab)
 
         self.test_script_scanner.next_element()
 
         second_seg_var = self.test_script_scanner.next_segment
-        if TestScriptSymbolTable.lookup_sym_tab(second_seg_var, TestScriptSymbolTable.test_script_sym_tab):
-            second_seg_val = TestScriptSymbolTable.get_value_from_sym_tab(second_seg_var, TestScriptSymbolTable.test_script_sym_tab)
+        if self.lookup_sym_tab(second_seg_var, TestScriptSymbolTable.test_script_sym_tab):
+            second_seg_val = self.get_value_from_sym_tab(second_seg_var, TestScriptSymbolTable.test_script_sym_tab)
             if second_seg_val is not None:
                 cmd2 = second_seg_val
         else:
@@ -897,7 +938,7 @@ class TestScriptParser:
 
         if isinstance(self.test_script_scanner.current_elmt, ScriptVariableElement):
             first_var = self.test_script_scanner.current_elmt.segment_text
-            first_var_val = TestScriptSymbolTable.get_value_from_sym_tab(first_var, TestScriptSymbolTable.test_script_sym_tab)
+            first_var_val = self.get_value_from_sym_tab(first_var, TestScriptSymbolTable.test_script_sym_tab)
 
             oper_sym = self.test_script_scanner.next_segment
             self.test_script_scanner.next_element()
@@ -911,16 +952,17 @@ class TestScriptParser:
             #if (not Util.str_to_type(first_var_val) is int) and (not Util.str_to_type(first_var_val) is float):
             #    raise SyntaxError
             varlist = third_var_val.split(":")
+            TestScriptParser.script_cache.set_uncacheable()
             random_index = random.randrange(0, len(varlist))
             TestScriptSymbolTable.insert_sym_tab(first_var, "%s" % int(varlist[random_index]), TestScriptSymbolTable.test_script_sym_tab)
             self.test_script_scanner.next_element()
             return
 
-        if (first_var_val == "" or first_var_val is None) and TestScriptSymbolTable.lookup_sym_tab(first_var, TestScriptSymbolTable.capi_cmd_ret_sym_tab) and third_var_val:
+        if (first_var_val == "" or first_var_val is None) and self.lookup_sym_tab(first_var, TestScriptSymbolTable.capi_cmd_ret_sym_tab) and third_var_val:
             TestScriptParser.qll.insert(keyword, first_var + oper_sym + third_var_val, "UCCACTION", TestScriptParser.group_tag_name)
             TestScriptParser.add_end_flag = True
             TestScriptSymbolTable.insert_sym_tab(first_var, "", TestScriptSymbolTable.capi_cmd_ret_sym_tab)
-        elif (third_var_val == "" or third_var_val is None) and TestScriptSymbolTable.lookup_sym_tab(third_var, TestScriptSymbolTable.capi_cmd_ret_sym_tab) and first_var_val:
+        elif (third_var_val == "" or third_var_val is None) and self.lookup_sym_tab(third_var, TestScriptSymbolTable.capi_cmd_ret_sym_tab) and first_var_val:
             TestScriptParser.qll.insert(keyword, first_var_val + oper_sym + third_var, "UCCACTION", TestScriptParser.group_tag_name)
             TestScriptParser.add_end_flag = True
             TestScriptSymbolTable.insert_sym_tab(third_var, "", TestScriptSymbolTable.capi_cmd_ret_sym_tab)
@@ -1077,7 +1119,7 @@ class ExpressionStatementParser(TestScriptParser):
         while self.test_script_scanner.next_segment != "EOL":
             value1 = None
             if isinstance(self.test_script_scanner.current_elmt, ScriptVariableElement) or isinstance(self.test_script_scanner.current_elmt, ScriptStringElement) or isinstance(self.test_script_scanner.current_elmt, TestbedDeviceElement):
-                if TestScriptSymbolTable.lookup_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.capi_cmd_ret_sym_tab) and (self.test_mngr_initr.test_config_cxt.is_test_case_file or self.test_mngr_initr.test_config_cxt.is_all_init_command_file):                
+                if self.lookup_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.capi_cmd_ret_sym_tab) and (self.test_mngr_initr.test_config_cxt.is_test_case_file or self.test_mngr_initr.test_config_cxt.is_all_init_command_file):                
                     if_eval_str = if_eval_str + self.test_script_scanner.current_elmt.segment_text + self.test_script_scanner.next_segment
 
                     is_capi_ret_var_found = True                    
@@ -1093,13 +1135,14 @@ class ExpressionStatementParser(TestScriptParser):
                         self.test_script_scanner.next_element()
                     continue
                 
-                value1 = TestScriptSymbolTable.get_value_from_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.test_script_sym_tab)
+                value1 = self.get_value_from_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.test_script_sym_tab)
                 if value1 is None:
                     # for those dollar variables that are used in AllInitConfig.txt file before they are present in the initEnv file which is generated after parsing AllInitConfig file
                     if self.test_mngr_initr.test_config_cxt.is_all_init_config_file:
                         no_dollar_var = self.test_script_scanner.current_elmt.segment_text.replace("$", "")
-                        if no_dollar_var in self.test_mngr_initr.test_config_info_mngr.test_config_info.var_list:
-                            value1 = self.test_mngr_initr.test_config_info_mngr.test_config_info.var_list[no_dollar_var]
+                        var_list = self.test_mngr_initr.test_config_info_mngr.test_config_info.var_list
+                        if self.lookup_sym_tab(no_dollar_var, var_list):
+                            value1 = self.get_value_from_sym_tab(no_dollar_var, var_list)
                         else:
                             raise common.TestConfigError("Value of %s doesn't exist and returns None" % self.test_script_scanner.current_elmt.segment_text)
                     else:
@@ -1163,7 +1206,7 @@ class ExpressionStatementParser(TestScriptParser):
                 self.test_script_scanner.next_element()
                 #element_type1 = self.test_script_scanner.current_elmt.element_type
                 if isinstance(self.test_script_scanner.current_elmt, ScriptVariableElement) or isinstance(self.test_script_scanner.current_elmt, TestbedDeviceElement):
-                    value2 = TestScriptSymbolTable.get_value_from_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.test_script_sym_tab)
+                    value2 = self.get_value_from_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.test_script_sym_tab)
                 elif isinstance(self.test_script_scanner.current_elmt, ScriptStringElement):
                     value2 = self.test_script_scanner.current_elmt.segment_text
                 
@@ -1230,31 +1273,28 @@ class DefineStatementParser(TestScriptParser):
 
             if isinstance(self.test_script_scanner.current_elmt, ScriptVariableElement):
                 value = self.test_script_scanner.next_segment
-                if TestScriptSymbolTable.lookup_sym_tab(self.test_script_scanner.next_segment, TestScriptSymbolTable.test_script_sym_tab):
-                    value = TestScriptSymbolTable.get_value_from_sym_tab(self.test_script_scanner.next_segment, TestScriptSymbolTable.test_script_sym_tab)
+                if self.lookup_sym_tab(self.test_script_scanner.next_segment, TestScriptSymbolTable.test_script_sym_tab):
+                    value = self.get_value_from_sym_tab(self.test_script_scanner.next_segment, TestScriptSymbolTable.test_script_sym_tab)
 
                 #define!$AP1!Marvell11nAP!                
                 for tbd in self.test_mngr_initr.test_prog_mngr.test_prog.testbed_dev_list:
                     if tbd.dev_name in value:
-                        for key2 in TestScriptElementType.script_testbed_devices:
-                            if re.search(key2, value, re.I):
-                                TestScriptParser.device_alias_list.append(self.test_script_scanner.current_elmt.segment_text)
-                                device_alias_found = True
-                                break                                    
+                        if TestScriptElementType.search_testbed_device_key(value) is not None:
+                            TestScriptParser.device_alias_list.append(self.test_script_scanner.current_elmt.segment_text)
+                            device_alias_found = True
                         break
                     
                 if not device_alias_found:
                     for item in TestScriptParser.device_alias_list:
                         if item in self.test_script_scanner.current_elmt.segment_text:
-                            item_val = TestScriptSymbolTable.get_value_from_sym_tab(item, TestScriptSymbolTable.test_script_sym_tab)
+                            item_val = self.get_value_from_sym_tab(item, TestScriptSymbolTable.test_script_sym_tab)
                             dev_val = self.test_script_scanner.current_elmt.segment_text.replace(item, item_val)
                             TestScriptSymbolTable.insert_sym_tab(self.test_script_scanner.current_elmt.segment_text, value, TestScriptSymbolTable.test_script_sym_tab)
                             return self.parse_testbed_device_element(value, dev_val)                            
                 
                     no_dollar_var = self.test_script_scanner.current_elmt.segment_text.replace("$", "")
-                    for key1 in TestScriptElementType.script_testbed_devices:
-                        if re.search(key1, no_dollar_var, re.I):                  
-                            return self.parse_testbed_device_element(value, self.test_script_scanner.current_elmt.segment_text, True)
+                    if TestScriptElementType.search_testbed_device_key(no_dollar_var) is not None:
+                        return self.parse_testbed_device_element(value, self.test_script_scanner.current_elmt.segment_text, True)
 
         if self.test_mngr_initr.test_config_cxt.is_test_case_file:
             if isinstance(self.test_script_scanner.current_elmt, ScriptReservedWordsElement):
@@ -1271,14 +1311,14 @@ class DefineStatementParser(TestScriptParser):
                 keyvalue = self.test_script_scanner.current_elmt.segment_text
                 
                 # redefine occurs and delete the previous define
-                if TestScriptSymbolTable.lookup_sym_tab(keyvalue, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
-                    if TestScriptSymbolTable.lookup_sym_tab(keyword, TestScriptSymbolTable.test_script_sym_tab):
+                if self.lookup_sym_tab(keyvalue, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+                    if self.lookup_sym_tab(keyword, TestScriptSymbolTable.test_script_sym_tab):
                         TestScriptSymbolTable.delete_key_from_sym_tab(keyword, TestScriptSymbolTable.test_script_sym_tab)
-                    if TestScriptSymbolTable.lookup_sym_tab(keyvalue, TestScriptSymbolTable.test_script_sym_tab):
+                    if self.lookup_sym_tab(keyvalue, TestScriptSymbolTable.test_script_sym_tab):
                         TestScriptSymbolTable.delete_key_from_sym_tab(keyvalue, TestScriptSymbolTable.test_script_sym_tab)
                     TestScriptSymbolTable.insert_sym_tab(keyword, keyvalue, TestScriptSymbolTable.capi_cmd_ret_sym_tab)
                     
-                if TestScriptSymbolTable.lookup_sym_tab(keyword, TestScriptSymbolTable.test_script_sym_tab):
+                if self.lookup_sym_tab(keyword, TestScriptSymbolTable.test_script_sym_tab):
                     TestScriptSymbolTable.insert_sym_tab(keyword, keyvalue, TestScriptSymbolTable.test_script_sym_tab)
                     
                 TestScriptParser.qll.insert(keyword, keyvalue, "UCCDEFINEVAR", TestScriptParser.group_tag_name)
@@ -1286,12 +1326,12 @@ class DefineStatementParser(TestScriptParser):
                 return
             
             if isinstance(self.test_script_scanner.current_elmt, ScriptVariableElement):
-                if TestScriptSymbolTable.lookup_sym_tab(self.test_script_scanner.next_segment, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
+                if self.lookup_sym_tab(self.test_script_scanner.next_segment, TestScriptSymbolTable.capi_cmd_ret_sym_tab):
                     
                     #redefine occurs and delete the previous define
-                    if TestScriptSymbolTable.lookup_sym_tab(self.test_script_scanner.next_segment, TestScriptSymbolTable.test_script_sym_tab):
+                    if self.lookup_sym_tab(self.test_script_scanner.next_segment, TestScriptSymbolTable.test_script_sym_tab):
                         TestScriptSymbolTable.delete_key_from_sym_tab(self.test_script_scanner.next_segment, TestScriptSymbolTable.test_script_sym_tab)
-                    if TestScriptSymbolTable.lookup_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.test_script_sym_tab):
+                    if self.lookup_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.test_script_sym_tab):
                         TestScriptSymbolTable.delete_key_from_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.test_script_sym_tab)
                 
                     keyword = self.test_script_scanner.current_elmt.segment_text
@@ -1307,8 +1347,8 @@ class DefineStatementParser(TestScriptParser):
         element_type = self.test_script_scanner.current_elmt.element_type
         
         if element_type == "VARIABLE":
-            if TestScriptSymbolTable.lookup_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.test_script_sym_tab):
-                value = TestScriptSymbolTable.get_value_from_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.test_script_sym_tab)
+            if self.lookup_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.test_script_sym_tab):
+                value = self.get_value_from_sym_tab(self.test_script_scanner.current_elmt.segment_text, TestScriptSymbolTable.test_script_sym_tab)
             else:
                 value = self.test_script_scanner.current_elmt.segment_text
         else:            
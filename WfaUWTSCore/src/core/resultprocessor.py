@@ -26,6 +26,7 @@ import logging
 import time
 import sys
 import re
+import threading
 
 from core.executiontask import ExecutionTask
 from core.symtable import TestScriptSymbolTable
@@ -35,24 +36,35 @@ from util.misc import Util
 from testinfo.datastream import streamInfo
 from common import GlobalConfigFiles
 
-#tms setting
-tmsPacket = TMSProcessor()
+#tms setting, created on first use
+tmsPacket = None
+tmsPacketLock = threading.Lock()
 
-def setRetVal(key, val):
+def getTMSPacket():
     """
-    set capi return to global ValueTable
+    return the TMS packet shared by all result processors, creating it on first use
+    """
+    global tmsPacket
+    with tmsPacketLock:
+        if tmsPacket is None:
+            tmsPacket = TMSProcessor()
+    return tmsPacket
+
+def setRetVal(key, val, which_table):
+    """
+    set capi return to the execution time symbol table of the run
     """
     if isinstance(key, str):
-        TestScriptSymbolTable.insert_sym_tab(key, val, TestScriptSymbolTable.capi_cmd_ret_sym_tab)
+        TestScriptSymbolTable.insert_sym_tab(key, val, which_table)
     elif isinstance(key, dict):
         if key:
             for i in len(key):
-                TestScriptSymbolTable.insert_sym_tab(key[i], val[i], TestScriptSymbolTable.capi_cmd_ret_sym_tab)
+                TestScriptSymbolTable.insert_sym_tab(key[i], val[i], which_table)
     elif isinstance(key, list):
         if key:
             i = 0
             for kVal in key:
-                TestScriptSymbolTable.insert_sym_tab(kVal, val[i], TestScriptSymbolTable.capi_cmd_ret_sym_tab)
+                TestScriptSymbolTable.insert_sym_tab(kVal, val[i], which_table)
                 i = i+1
     else:
         logging.debug("setRetVal error : wrong type..")
@@ -84,11 +96,16 @@ class ResultProcessor(object):
         #result => FAIL or PASS
         self.__testResult = 'NONE'
 
-        self.tmsPacket = tmsPacket
         self.ExecutionTask = param
 
+        self.run_context = param.run_context
+
         self.test_mngr_initr = None
 
+    @property
+    def tmsPacket(self):
+        return getTMSPacket()
+
     def getStatus(self, test_mngr_initr):
         """
         get status of process stop/proceed will be return after call anayzeTask()
@@ -111,15 +128,12 @@ class ResultProcessor(object):
         """
         self.__testResult = rlt
 
-        total_count = TestScriptSymbolTable.get_value_from_sym_tab("total_count", TestScriptSymbolTable.test_result_tab) + 1
-        TestScriptSymbolTable.insert_sym_tab("total_count", total_count, TestScriptSymbolTable.test_result_tab)
+        TestScriptSymbolTable.increment_sym_tab("total_count", self.run_context.test_result_tab)
         #if rlt == 'PASS':
         if 'PASS' in rlt:
-            pass_count = TestScriptSymbolTable.get_value_from_sym_tab("pass_count", TestScriptSymbolTable.test_result_tab) + 1
-            TestScriptSymbolTable.insert_sym_tab("pass_count", pass_count, TestScriptSymbolTable.test_result_tab)
+            TestScriptSymbolTable.increment_sym_tab("pass_count", self.run_context.test_result_tab)
         else:
-            fail_count = TestScriptSymbolTable.get_value_from_sym_tab("fail_count", TestScriptSymbolTable.test_result_tab) + 1
-            TestScriptSymbolTable.insert_sym_tab("fail_count", fail_count, TestScriptSymbolTable.test_result_tab)
+            TestScriptSymbolTable.increment_sym_tab("fail_count", self.run_context.test_result_tab)
         
         #self.generateFinalResult()
 
@@ -127,22 +141,18 @@ class ResultProcessor(object):
         """
         set check result, and this will save each sub-result, and not print final test result..
         """
-        total_count = TestScriptSymbolTable.get_value_from_sym_tab("total_count", TestScriptSymbolTable.test_result_tab) + 1
-        TestScriptSymbolTable.insert_sym_tab("total_count", total_count, TestScriptSymbolTable.test_result_tab)
+        TestScriptSymbolTable.increment_sym_tab("total_count", self.run_context.test_result_tab)
         
         #if rlt == 'PASS':
         if 'PASS' in rlt:
-            pass_count = TestScriptSymbolTable.get_value_from_sym_tab("pass_count", TestScriptSymbolTable.test_result_tab) + 1
-            TestScriptSymbolTable.insert_sym_tab("pass_count", pass_count, TestScriptSymbolTable.test_result_tab)
+            TestScriptSymbolTable.increment_sym_tab("pass_count", self.run_context.test_result_tab)
         else:
-            fail_count = TestScriptSymbolTable.get_value_from_sym_tab("fail_count", TestScriptSymbolTable.test_result_tab) + 1
-            TestScriptSymbolTable.insert_sym_tab("fail_count", fail_count, TestScriptSymbolTable.test_result_tab)
+            TestScriptSymbolTable.increment_sym_tab("fail_count", self.run_context.test_result_tab)
         
-    def setValidationInfo(self, displayname, recvstring):
+    def setValidationInfo(self, displayname, response):
         """
         set testbed information after receving return from capi call
         """
-        response = recvstring
         companyTestBed = ""
         modelTestBed = ""
         firmwareTestBed = ""
@@ -155,60 +165,23 @@ class ResultProcessor(object):
         if displayname.lower() == 'sniffer':
             #wfa_sniffer!sniffer_get_info!ID,$Sniffer_WTS_VER,$Sniffer_VendorName,$Sniffer_DeviceModel,$Sniffer_DeviceFirmware
             #status,COMPLETE,WfaSnifferVersion,$WfaSnifferVersion,SnifferSTA,$SnifferSTA,SwInfo,$DeviceSwInfo\_$kernel_Ver,WiresharkVersion,$WiresharkInfo\r\n
-            ret_items = response.split(',')
-            
-            
+            ret_items = response.items
+
             if len(ret_items) > 9:
                 Sniffer_WTS_VER = ret_items[3]
                 Sniffer_VendorName = ret_items[5]
                 Sniffer_DeviceModel = ret_items[7]
                 Sniffer_DeviceFirmware = ret_items[9]
-            else:
-                if re.search(r"status,COMPLETE", response):
-                    if re.search(r"WfaSnifferVersion", response):
-                        posVendor = response.index('WfaSnifferVersion,') + len('WfaSnifferVersion,')
-                        data = response[posVendor:]
-                        data = data.lstrip()
-                        try:
-                            posSym = data.index(',')
-                            Sniffer_WTS_VER = data[:posSym]
-                        except Exception:
-                            Sniffer_WTS_VER = data.rstrip('\n')
-
-                    if re.search(r"SnifferSTA", response):
-                        posVendor = response.index('SnifferSTA,') + len('SnifferSTA,')
-                        data = response[posVendor:]
-                        data = data.lstrip()
-                        try:
-                            posSym = data.index(',')
-                            Sniffer_VendorName = data[:posSym]
-                        except Exception:
-                            Sniffer_VendorName = data.rstrip('\n')
-
-                    if re.search(r"SwInfo", response):
-                        posVendor = response.index('SwInfo,') + len('SwInfo,')
-                        data = response[posVendor:]
-                        data = data.lstrip()
-                        try:
-                            posSym = data.index(',')
-                            Sniffer_DeviceModel = data[:posSym]
-                        except Exception:
-                            Sniffer_DeviceModel = data.rstrip('\n')
-
-                    if re.search(r"WiresharkVersion", response):
-                        posVendor = response.index('WiresharkVersion,') + len('WiresharkVersion,')
-                        data = response[posVendor:]
-                        data = data.lstrip()
-                        try:
-                            posSym = data.index(',')
-                            Sniffer_DeviceFirmware = data[:posSym]
-                        except Exception:
-                            Sniffer_DeviceFirmware = data.rstrip('\n')
-
-            setRetVal('$ca_version', Sniffer_WTS_VER)
-            setRetVal('$tbd_info1', Sniffer_VendorName)
-            setRetVal('$sw_version', Sniffer_DeviceModel)
-            setRetVal('$tbd_info2', Sniffer_DeviceFirmware)                            
+            elif response.is_complete():
+                Sniffer_WTS_VER = response.get('WfaSnifferVersion', "")
+                Sniffer_VendorName = response.get('SnifferSTA', "")
+                Sniffer_DeviceModel = response.get('SwInfo', "")
+                Sniffer_DeviceFirmware = response.get('WiresharkVersion', "")
+
+            setRetVal('$ca_version', Sniffer_WTS_VER, self.run_context.capi_cmd_ret_sym_tab)
+            setRetVal('$tbd_info1', Sniffer_VendorName, self.run_context.capi_cmd_ret_sym_tab)
+            setRetVal('$sw_version', Sniffer_DeviceModel, self.run_context.capi_cmd_ret_sym_tab)
+            setRetVal('$tbd_info2', Sniffer_DeviceFirmware, self.run_context.capi_cmd_ret_sym_tab)                            
 
             ret_dict['ca_version'] = Sniffer_WTS_VER
             ret_dict['tbd_info1'] = Sniffer_VendorName
@@ -228,49 +201,11 @@ class ResultProcessor(object):
 
 
         else:
-            if re.search(r"status,COMPLETE", response):
-                if re.search(r"vendor", response):
-                    posVendor = response.index('vendor,') + 7
-                    data = response[posVendor:]
-                    data = data.lstrip()
-                    try:
-                        posSym = data.index(',')
-                        companyTestBed = data[:posSym]
-                    except Exception:
-                        companyTestBed = data.rstrip('\n')
-
-                if re.search(r"model", response):
-                    posVendor = response.index('model,') + 6
-                    data = response[posVendor:]
-                    data = data.lstrip()
-                    try:
-                        posSym = data.index(',')
-                        modelTestBed = data[:posSym]
-                    except Exception:
-                        modelTestBed = data.rstrip('\n')
-
-                if re.search(r"version", response):
-                    posVendor = response.index('version,') + 8
-                    data = response[posVendor:]
-                    data = data.lstrip()
-                    try:
-                        posSym = data.index(',')
-                        firmwareTestBed = data[:posSym]
-                    except Exception:
-                        firmwareTestBed = data.rstrip('\n')
-                        
-                if re.search(r"firmware", response):
-                    posVendor = response.index('firmware,') + 9
-                    data = response[posVendor:]
-                    data = data.lstrip()
-                    try:
-                        posSym = data.index(',')
-                        firmwareTestBed = data[:posSym]
-                    except Exception:
-                        firmwareTestBed = data.rstrip('\n')
-                                                                            
-                                                    
-                                                            
+            if response.is_complete():
+                companyTestBed = response.get('vendor', "")
+                modelTestBed = response.get('model', "")
+                firmwareTestBed = response.get('firmware', response.get('version', ""))
+
             for tbd in self.test_mngr_initr.test_prog_mngr.test_prog.testbed_dev_list:
                 
                 
@@ -329,12 +264,12 @@ class ResultProcessor(object):
             return
 
         if self.ExecutionTask.get_cmd() == 'ResultCheck':
-            time.sleep(5)
+            self.wait_stream_results(None)
             self.process_ResultCheck()
             return
 
         if self.ExecutionTask.get_cmd() == 'CheckThroughput':
-            time.sleep(5)
+            self.wait_stream_results(StreamHandler.get_check_phase(self.ExecutionTask.get_param()))
             throughputChk = StreamHandler(self.test_mngr_initr)
             chk_result = throughputChk.processStreamResults(self.ExecutionTask.get_param())
             self.setCheckResult(chk_result)
@@ -351,10 +286,8 @@ class ResultProcessor(object):
         ##############################################################
         status = ""
         retDict = self.ExecutionTask.get_ret()
-        recvStr = ""
-        if self.ExecutionTask.recv:
-            recvStr = self.ExecutionTask.recv.rstrip('\r\n')
-            #print "recv : " + recvStr
+        response = self.ExecutionTask.get_response()
+        recvStr = response.line
         
         if GlobalConfigFiles.curr_prog_name == "WMMPS" and "sniffer_control_subtask" in self.ExecutionTask.get_cmd():
             logging.debug('In WMMPS, before parsing the recvStr: %s' % recvStr)
@@ -372,14 +305,14 @@ class ResultProcessor(object):
                         return
             return
         
-        stitems = recvStr.split(',')        
+        stitems = response.items
         if len(stitems) < 2:
             #logging.debug("Bypassing this cmd..")
             return
 
-        status = stitems[1]
-        iDNB = TestScriptSymbolTable.get_value_from_sym_tab("iDNB", TestScriptSymbolTable.test_script_sym_tab)
-        iINV = TestScriptSymbolTable.get_value_from_sym_tab("iINV", TestScriptSymbolTable.test_script_sym_tab) 
+        status = response.status
+        iDNB = TestScriptSymbolTable.get_value_from_sym_tab("iDNB", self.run_context.test_script_sym_tab)
+        iINV = TestScriptSymbolTable.get_value_from_sym_tab("iINV", self.run_context.test_script_sym_tab) 
                 
         if iINV is None:
             iINV = 0
@@ -408,20 +341,20 @@ class ResultProcessor(object):
             elif self.ExecutionTask.get_cmd() == 'device_get_info':
                 try:
                     if displayname == '':
-                        self.tmsPacket.setDutDeviceInfo(recvStr)
+                        self.tmsPacket.setDutDeviceInfo(response)
                     else:
-                        self.tmsPacket.setTestbedInfo(displayname, recvStr)
+                        self.tmsPacket.setTestbedInfo(displayname, response)
 
                     #for validation
-                    self.setValidationInfo(displayname, recvStr)
+                    self.setValidationInfo(displayname, response)
 
                 except OSError:
                     logging.debug("exception -- device_get_info capi call")
             elif self.ExecutionTask.get_cmd() == 'ca_get_version':
-                self.setValidationInfo(displayname, recvStr)
+                self.setValidationInfo(displayname, response)
 
             elif self.ExecutionTask.get_cmd() == 'sniffer_get_info':
-                self.setValidationInfo('sniffer', recvStr)
+                self.setValidationInfo('sniffer', response)
 
             elif self.ExecutionTask.get_cmd() == 'sta_associate':
                 time.sleep(10)
@@ -460,23 +393,23 @@ class ResultProcessor(object):
                     if self.ExecutionTask.get_cmd() != "traffic_agent_send":
                         ret_val = "%s" %(stitems[3].strip())
                         logging.debug("traffic config - ret_val : %s", ret_val)
-                        setRetVal(getRetKey(retDict), ret_val)
+                        setRetVal(getRetKey(retDict), ret_val, self.run_context.capi_cmd_ret_sym_tab)
 
                 elif stitems[2].lower() == 'interfacetype':
                     ret_val = ("%s" %(stitems[5]))
-                    setRetVal(getRetKey(retDict), ret_val)
+                    setRetVal(getRetKey(retDict), ret_val, self.run_context.capi_cmd_ret_sym_tab)
 
                 elif stitems[2].lower() == 'interfaceid':
                     ret_val = stitems[3].split('_')[0]
-                    setRetVal(getRetKey(retDict), ret_val)
+                    setRetVal(getRetKey(retDict), ret_val, self.run_context.capi_cmd_ret_sym_tab)
 
                 elif self.ExecutionTask.get_cmd() == 'traffic_stop_ping':
 
                     keyVal = retParam[1]
                     #"%s;%s"%(retParam[1], self.ExecutionTask.get_ipport())
-                    setRetVal(keyVal, stitems[5])
+                    setRetVal(keyVal, stitems[5], self.run_context.capi_cmd_ret_sym_tab)
                     #print("%s = %s" %  (retParam[1], stitems[5]))
-                    pinginternalchk = TestScriptSymbolTable.get_value_from_sym_tab("PingInternalChk", TestScriptSymbolTable.test_script_sym_tab)
+                    pinginternalchk = TestScriptSymbolTable.get_value_from_sym_tab("PingInternalChk", self.run_context.test_script_sym_tab)
                     temp_key = getRetKey(self.ExecutionTask.get_ret())
                     
                     if "$" in temp_key:
@@ -484,10 +417,10 @@ class ResultProcessor(object):
                         #print "SLIM==> ping result save..."
                         #print sent_reply[0]
                         #print sent_reply[1]
-                        setRetVal(sent_reply[0], stitems[3])
-                        setRetVal(sent_reply[1], stitems[5])    
+                        setRetVal(sent_reply[0], stitems[3], self.run_context.capi_cmd_ret_sym_tab)
+                        setRetVal(sent_reply[1], stitems[5], self.run_context.capi_cmd_ret_sym_tab)    
 
-                    setRetVal("$pingResp", stitems[5])
+                    setRetVal("$pingResp", stitems[5], self.run_context.capi_cmd_ret_sym_tab)
                     if pinginternalchk == '0':
                         logging.debug("Ping Internal Check")
                         
@@ -508,7 +441,7 @@ class ResultProcessor(object):
                         item_len = len(stitems)
                         for i in temp_val:
                             if item_len > count + 3:
-                                setRetVal(i, stitems[3+count])
+                                setRetVal(i, stitems[3+count], self.run_context.capi_cmd_ret_sym_tab)
                                 count = count + 2
 
         if self.__status == 'STOP':
@@ -519,6 +452,22 @@ class ResultProcessor(object):
             #logging.debug("Continue---")
         return
 
+    def wait_stream_results(self, phase):
+        """
+        wait until the traffic agents reported all expected stream results of the phase
+        """
+        data_strm = self.test_mngr_initr.test_data_strm_mngr.data_strm
+        if data_strm is None:
+            return
+
+        timeout = self.test_mngr_initr.test_prog_mngr.test_prog.stream_result_timeout
+        start = time.time()
+        missing = data_strm.wait_results(phase, timeout)
+        if missing:
+            logging.debug("%s waited %.2f seconds, %d stream results still missing" % (self.ExecutionTask.get_cmd(), time.time() - start, missing))
+        else:
+            logging.debug("%s waited %.2f seconds for the stream results" % (self.ExecutionTask.get_cmd(), time.time() - start))
+
     def generateFinalResult(self):
         """
         Print ending result to console
@@ -531,11 +480,11 @@ class ResultProcessor(object):
             Util.set_color(Util.FOREGROUND_GREEN | Util.FOREGROUND_INTENSITY) 
             self.__testResult = 'PASS'
         #else:
-        total_count = int(TestScriptSymbolTable.get_value_from_sym_tab("total_count", TestScriptSymbolTable.test_result_tab))
-        pass_count = int(TestScriptSymbolTable.get_value_from_sym_tab("pass_count", TestScriptSymbolTable.test_result_tab))
-        fail_count = int(TestScriptSymbolTable.get_value_from_sym_tab("fail_count", TestScriptSymbolTable.test_result_tab))
-        conditional_chk_flag = int(TestScriptSymbolTable.get_value_from_sym_tab("conditional_chk_flag", TestScriptSymbolTable.test_result_tab))
-        num_of_pass_required = int(TestScriptSymbolTable.get_value_from_sym_tab("num_of_pass_required", TestScriptSymbolTable.test_result_tab))
+        total_count = int(TestScriptSymbolTable.get_value_from_sym_tab("total_count", self.run_context.test_result_tab))
+        pass_count = int(TestScriptSymbolTable.get_value_from_sym_tab("pass_count", self.run_context.test_result_tab))
+        fail_count = int(TestScriptSymbolTable.get_value_from_sym_tab("fail_count", self.run_context.test_result_tab))
+        conditional_chk_flag = int(TestScriptSymbolTable.get_value_from_sym_tab("conditional_chk_flag", self.run_context.test_result_tab))
+        num_of_pass_required = int(TestScriptSymbolTable.get_value_from_sym_tab("num_of_pass_required", self.run_context.test_result_tab))
             
         if total_count >= 1:
             if conditional_chk_flag == 1:
@@ -577,11 +526,11 @@ class ResultProcessor(object):
         """Determines pass or fail at the end of the test run"""
         try:
             cmd = self.ExecutionTask.get_param().split(',')
-            logging.debug("%s-%s-%s-%s-%s" % ( TestScriptSymbolTable.get_value_from_sym_tab(cmd[0], TestScriptSymbolTable.test_script_sym_tab),cmd[0], cmd[1], cmd[2], cmd[3]))
+            logging.debug("%s-%s-%s-%s-%s" % ( TestScriptSymbolTable.get_value_from_sym_tab(cmd[0], self.run_context.test_script_sym_tab),cmd[0], cmd[1], cmd[2], cmd[3]))
 
             checkval = cmd[0].split('!') 
             
-            cval = TestScriptSymbolTable.get_value_from_sym_tab(checkval[1], TestScriptSymbolTable.capi_cmd_ret_sym_tab)
+            cval = TestScriptSymbolTable.get_value_from_sym_tab(checkval[1], self.run_context.capi_cmd_ret_sym_tab)
 
             if int(cval) >= int(cmd[1]):
                 result = cmd[2]
@@ -609,19 +558,19 @@ class ResultProcessor(object):
             total_checks = cmd.get('NUMOFCHECK')
 
             #reset previous results..
-            TestScriptSymbolTable.insert_sym_tab("pass_count", 0, TestScriptSymbolTable.test_result_tab)
-            TestScriptSymbolTable.insert_sym_tab("fail_count", 0, TestScriptSymbolTable.test_result_tab)
+            TestScriptSymbolTable.insert_sym_tab("pass_count", 0, self.run_context.test_result_tab)
+            TestScriptSymbolTable.insert_sym_tab("fail_count", 0, self.run_context.test_result_tab)
 
             logging.info("\n----------------Pass condition---------------------------\n")
             logging.info("Total number of checks = %s", total_checks)
             logging.info("Number of pass required = %s", pass_required)
 
             if pass_required == total_checks:
-                TestScriptSymbolTable.insert_sym_tab("conditional_chk_flag", 1, TestScriptSymbolTable.test_result_tab)
-                TestScriptSymbolTable.insert_sym_tab("num_of_pass_required", total_checks, TestScriptSymbolTable.test_result_tab)
+                TestScriptSymbolTable.insert_sym_tab("conditional_chk_flag", 1, self.run_context.test_result_tab)
+                TestScriptSymbolTable.insert_sym_tab("num_of_pass_required", total_checks, self.run_context.test_result_tab)
             elif pass_required < total_checks:
-                TestScriptSymbolTable.insert_sym_tab("conditional_chk_flag", 1, TestScriptSymbolTable.test_result_tab)
-                TestScriptSymbolTable.insert_sym_tab("num_of_pass_required", pass_required, TestScriptSymbolTable.test_result_tab)
+                TestScriptSymbolTable.insert_sym_tab("conditional_chk_flag", 1, self.run_context.test_result_tab)
+                TestScriptSymbolTable.insert_sym_tab("num_of_pass_required", pass_required, self.run_context.test_result_tab)
             
         except:
             exc_info = sys.exc_info( )
@@ -0,0 +1,141 @@
+###############################################################################
+#
+# Copyright (c) 2016 Wi-Fi Alliance
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER
+# RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT,
+# NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE
+# USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+###############################################################################
+
+#!/usr/bin/env python
+
+"""
+State shared by the parser and the execution threads of a test run
+"""
+
+import logging
+import threading
+from core.symtable import TestScriptSymbolTable, SymbolTable
+from netcomm.connpool import CapiConnectionPool
+from netcomm.dispatcher import CapiResponseDispatcher
+from testinfo.datastream import DataStreamManager
+from core.workerpool import WorkerPool
+
+
+class RunContext(object):
+    """The class that owns the state of a test run.
+
+    The executor hands its context to every ExecutionTask, and the result
+    processor and stream handler work on the context of their task, so the
+    execution threads never reach for process-wide tables themselves. The
+    parser and the test config classes still use the TestScriptSymbolTable
+    names, which activate() binds to the tables of this context, so only one
+    context can be parsing at a time in a process.
+
+    Attributes:
+        current (object): The RunContext object bound to TestScriptSymbolTable.
+        test_script_sym_tab (object): The SymbolTable of parsing time variables.
+        capi_cmd_ret_sym_tab (object): The SymbolTable of execution time variables.
+        test_result_tab (object): The SymbolTable of test result counters.
+        data_strm_mngr (object): The DataStreamManager object of the current test case.
+        conn_pool (object): The CapiConnectionPool object, kept across test cases.
+        dispatcher (object): The CapiResponseDispatcher object watching the pooled connections.
+        worker_pool (object): The WorkerPool object running the parallel sub queues.
+        lock (object): The lock protecting the replacement of the data stream manager.
+
+    """
+    current = None
+    current_lock = threading.Lock()
+
+    def __init__(self):
+        self.test_script_sym_tab = SymbolTable(TestScriptSymbolTable.test_script_sym_tab_defaults)
+        self.capi_cmd_ret_sym_tab = SymbolTable(TestScriptSymbolTable.capi_cmd_ret_sym_tab_defaults)
+        self.test_result_tab = SymbolTable(TestScriptSymbolTable.test_result_tab_defaults)
+        self.data_strm_mngr = None
+        self.conn_pool = CapiConnectionPool()
+        self.dispatcher = CapiResponseDispatcher(self.conn_pool)
+        self.worker_pool = None
+        self.lock = threading.RLock()
+
+
+    @staticmethod
+    def get_current():
+        """Gets the active run context, creating one on the bound symbol tables if required.
+        """
+        with RunContext.current_lock:
+            if RunContext.current is None:
+                RunContext.current = RunContext()
+                RunContext.current.adopt_sym_tabs()
+            return RunContext.current
+
+
+    def activate(self):
+        """Makes this context the one the parser and the script classes work on.
+        """
+        with RunContext.current_lock:
+            RunContext.current = self
+            self.bind_sym_tabs()
+        return self
+
+
+    def adopt_sym_tabs(self):
+        """Takes over the symbol tables currently bound to the TestScriptSymbolTable names.
+        """
+        self.test_script_sym_tab = TestScriptSymbolTable.test_script_sym_tab
+        self.capi_cmd_ret_sym_tab = TestScriptSymbolTable.capi_cmd_ret_sym_tab
+        self.test_result_tab = TestScriptSymbolTable.test_result_tab
+
+
+    def bind_sym_tabs(self):
+        """Binds the symbol tables of this context to the TestScriptSymbolTable names.
+        """
+        TestScriptSymbolTable.test_script_sym_tab = self.test_script_sym_tab
+        TestScriptSymbolTable.capi_cmd_ret_sym_tab = self.capi_cmd_ret_sym_tab
+        TestScriptSymbolTable.test_result_tab = self.test_result_tab
+
+
+    def get_worker_pool(self, size):
+        """Gets the worker pool, it is created on first use and kept across test cases.
+
+        Args:
+            size (int): The number of workers of a new pool.
+        """
+        with self.lock:
+            if self.worker_pool is None:
+                self.worker_pool = WorkerPool(size, "subq")
+            return self.worker_pool
+
+
+    def create_data_strm_mngr(self):
+        """Creates the data stream manager of a new test case.
+        """
+        with self.lock:
+            self.data_strm_mngr = DataStreamManager()
+            return self.data_strm_mngr
+
+
+    def reset(self):
+        """Restores the symbol tables and drops the test case state before the next test case.
+
+        The connection pool is kept so that the control agent connections are
+        reused by the next test case of a group. The dispatch loop of the test
+        case is stopped and waited for, since its listeners belong to the test
+        case, and the next test case starts its own loop.
+        """
+        if not self.dispatcher.stop():
+            # the old loop exits on its own once it sees the new generation
+            logging.info("Response dispatcher of the previous test case is still busy")
+        self.test_script_sym_tab.reset(TestScriptSymbolTable.test_script_sym_tab_defaults)
+        self.capi_cmd_ret_sym_tab.reset(TestScriptSymbolTable.capi_cmd_ret_sym_tab_defaults)
+        self.test_result_tab.reset(TestScriptSymbolTable.test_result_tab_defaults)
+        with self.lock:
+            self.data_strm_mngr = None
@@ -53,6 +53,30 @@ class TestScriptScanner:
         self.test_script_source = test_script_source
         self.current_elmt = ""
         self.next_segment = ""
+        # called with (key, which_table) on each symbol lookup while the script is compiled
+        self.read_listener = None
+
+
+    def notify_read(self, key, which_table):
+        """Tells the read listener, if any, that a symbol is looked up.
+
+        Args:
+            key (str): The entry key.
+            which_table (dictionary): The dictionary looked up.
+        """
+        if self.read_listener is not None:
+            self.read_listener(key, which_table)
+
+
+    def get_value_from_sym_tab(self, key, which_table):
+        """Gets the entry value from the dictionary and tells the read listener.
+
+        Args:
+            key (str): The entry key.
+            which_table (dictionary): The dictionary to get the entry from.
+        """
+        self.notify_read(key, which_table)
+        return TestScriptSymbolTable.get_value_from_sym_tab(key, which_table)
 
 
     def skipWhiteSpace(self):
@@ -95,7 +119,7 @@ class TestScriptScanner:
         """
         segval = ""
         if TestScriptElementType.get_element_type(self.next_segment) == "VARIABLE":
-            segval = TestScriptSymbolTable.get_value_from_sym_tab(self.next_segment, TestScriptSymbolTable.test_script_sym_tab)
+            segval = self.get_value_from_sym_tab(self.next_segment, TestScriptSymbolTable.test_script_sym_tab)
             segval = segval if segval else ""
         elif TestScriptElementType.get_element_type(self.next_segment) == "STRING":
             segval = self.next_segment
@@ -118,37 +142,31 @@ class TestScriptScanner:
         elif segment.startswith('$'):
             self.current_elmt = ScriptVariableElement(self.test_script_source)
             if self.test_script_source.current_pos == 0:
-                segval = TestScriptSymbolTable.get_value_from_sym_tab(segment, TestScriptSymbolTable.test_script_sym_tab)
+                segval = self.get_value_from_sym_tab(segment, TestScriptSymbolTable.test_script_sym_tab)
                 if segval is not None and segval != "":
-                    for key in TestScriptElementType.script_testbed_devices:
-                        if re.search(key, segval, re.I):
-                            self.current_elmt = TestbedDeviceElement(self.test_script_source)
-                            self.current_elmt.segment_text = segval
-                            self.current_elmt.element_type = TestScriptElementType.get_element_type(segval)
-                            break
+                    if TestScriptElementType.search_testbed_device_key(segval) is not None:
+                        self.current_elmt = TestbedDeviceElement(self.test_script_source)
+                        self.current_elmt.segment_text = segval
+                        self.current_elmt.element_type = TestScriptElementType.get_element_type(segval)
         else:
             # capi commands
-            for cmd in TestScriptElementType.script_capi_commands:
-                if re.search(cmd, segment, re.I):                
-                    self.current_elmt = CAPICommandElement(self.test_script_source)
-                    self.test_script_source.line_attr = "CAPI"
+            if TestScriptElementType.is_capi_command(segment):
+                self.current_elmt = CAPICommandElement(self.test_script_source)
+                self.test_script_source.line_attr = "CAPI"
 
-                    self.next_segment = self.test_script_source.next_segment()
-                    return self.next_segment
+                self.next_segment = self.test_script_source.next_segment()
+                return self.next_segment
 
             is_testbed_device_elem = False
             
             # use regular expression to search the testbed device vendor name
             if not self.test_script_source.test_script_source_name == common.GlobalConfigFiles.dut_info_file:
-                for key in TestScriptElementType.script_testbed_devices:
-                    if re.search(key, segment, re.I):                    
-                        # skip the variable such as $DUT_IF which causes it is recognized as testbed DUT
-                        if self.test_script_source.current_pos == self.test_script_source.total_num_seg - 1 and key != segment:
-                            break
-
+                key = TestScriptElementType.search_testbed_device_key(segment)
+                if key is not None:
+                    # skip the variable such as $DUT_IF which causes it is recognized as testbed DUT
+                    if not (self.test_script_source.current_pos == self.test_script_source.total_num_seg - 1 and key != segment):
                         self.current_elmt = TestbedDeviceElement(self.test_script_source)
                         is_testbed_device_elem = True
-                        break
 
             if not is_testbed_device_elem:
                 # based on the name of the file - DUTInfo.txt, we classify the current element into Feature element
@@ -0,0 +1,460 @@
+###############################################################################
+#
+# Copyright (c) 2016 Wi-Fi Alliance
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER
+# RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT,
+# NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE
+# USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+###############################################################################
+
+#!/usr/bin/env python
+
+"""
+On-disk cache of compiled test scripts
+"""
+
+import os
+import copy
+import time
+import hashlib
+import logging
+import cPickle
+
+import common
+from core.symtable import TestScriptSymbolTable
+
+
+class TestScriptCache(object):
+    """The class that caches the result of parsing a script and its sub-files.
+
+    Parsing a script appends nodes to the parser linked lists and changes the
+    symbol tables and parser class state. The compiled form records exactly
+    these changes, so that a cache hit can replay them without scanning and
+    parsing the files again.
+
+    An entry is keyed by the program, the script content and a fingerprint of
+    the parser state. The symbol tables are not part of the key, since they
+    hold per-run values such as $logDir. Instead the entry records the symbols
+    the parser looked up, including the init config variables an AllInitConfig
+    file reads before they are in the symbol table, and is only used while
+    these still hold the values they had before compiling, and while the
+    content of every sub-file it called is unchanged. Entries not used for MAX_AGE seconds are removed, and
+    the least recently used ones once the directory exceeds MAX_SIZE bytes.
+
+    Attributes:
+        cache_dir (str): The cache directory, the cache/scripts folder next to the src folder by default.
+        is_enabled (boolean): The flag to indicate the cache is used.
+        is_pruned (boolean): The flag to indicate the cache directory has been pruned.
+        hits (int): The number of scripts loaded from the cache.
+        misses (int): The number of scripts compiled.
+        compiling (dictionary): The state recorded while compiling a script, None otherwise.
+
+    """
+    VERSION = 3
+    SYM_TABS = ("test_script_sym_tab", "capi_cmd_ret_sym_tab", "test_result_tab")
+    LISTS = ("qll", "ill", "sll")
+    MAX_AGE = 30 * 24 * 3600
+    MAX_SIZE = 64 * 1024 * 1024
+    DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "cache", "scripts")
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.is_enabled = True
+        self.is_pruned = False
+        self.hits = 0
+        self.misses = 0
+        self.compiling = None
+
+
+    @staticmethod
+    def get_source_path(test_script_source):
+        """Gets the full path of the script file.
+
+        Args:
+            test_script_source (object): The object of TestScriptSource class.
+        """
+        return test_script_source.test_script_file_path + "\\" + test_script_source.test_script_source_name
+
+
+    @staticmethod
+    def get_file_hash(file_path):
+        """Gets the MD5 hash of the file content.
+
+        Args:
+            file_path (str): The file path.
+        """
+        with open(file_path, 'rb') as f:
+            return hashlib.md5(f.read()).hexdigest()
+
+
+    @staticmethod
+    def canonical(value):
+        """Converts the value into a form whose repr does not depend on dictionary ordering.
+
+        Args:
+            value (object): The value to be converted.
+        """
+        if isinstance(value, dict):
+            return tuple(sorted((repr(k), TestScriptCache.canonical(v)) for k, v in value.items()))
+        if isinstance(value, (list, tuple)):
+            return tuple(TestScriptCache.canonical(v) for v in value)
+        return repr(value)
+
+
+    def get_lists(self, parser):
+        """Gets the linked lists the parser appends nodes to.
+
+        Args:
+            parser (object): The object of TestScriptParser class.
+        """
+        return {"qll" : parser.__class__.qll, "ill" : parser.__class__.ill, "sll" : parser.sll}
+
+
+    def get_read_tables(self, parser):
+        """Gets the dictionaries whose lookups are recorded, by name.
+
+        Args:
+            parser (object): The object of TestScriptParser class.
+        """
+        tables = dict((name, getattr(TestScriptSymbolTable, name)) for name in TestScriptCache.SYM_TABS)
+        test_config_info_mngr = parser.test_mngr_initr.test_config_info_mngr
+        if test_config_info_mngr is not None:
+            # AllInitConfig variables looked up before they are in the symbol table
+            var_list = getattr(test_config_info_mngr.test_config_info, "var_list", None)
+            if var_list is not None:
+                tables["var_list"] = var_list
+        return tables
+
+
+    def get_state_fingerprint(self, parser):
+        """Gets the hash of the parser state that affects the result of parsing.
+
+        Args:
+            parser (object): The object of TestScriptParser class.
+        """
+        parser_cls = parser.__class__
+        test_config_cxt = parser.test_mngr_initr.test_config_cxt
+        # the calls seeded for the test case file itself cannot form a loop with the called files
+        sub_file_calls = sorted(set(':'.join(k.split(':')[:2]) for k in parser_cls.sub_file_call_dict.keys()
+                                    if k.split(':')[0] != k.split(':')[1]))
+        dev_names = [tbd.dev_name for tbd in parser.test_mngr_initr.test_prog_mngr.test_prog.testbed_dev_list]
+
+        state = (TestScriptCache.VERSION,
+                 common.GlobalConfigFiles.curr_prog_name,
+                 test_config_cxt.is_test_case_file,
+                 test_config_cxt.is_all_init_config_file,
+                 test_config_cxt.is_all_init_command_file,
+                 parser_cls.ignore_if_else,
+                 parser_cls.group_tag_name,
+                 parser_cls.add_end_flag,
+                 tuple(parser_cls.device_alias_list),
+                 tuple(sub_file_calls),
+                 tuple(dev_names),
+                 tuple(name for name in TestScriptCache.LISTS if self.get_lists(parser)[name] is not None))
+        return hashlib.md5(repr(state)).hexdigest()
+
+
+    def get_entry_file(self, parser, source_path, source_hash):
+        """Gets the cache file name of the script in the current parser state.
+
+        Args:
+            parser (object): The object of TestScriptParser class.
+            source_path (str): The script file path.
+            source_hash (str): The MD5 hash of the script content.
+        """
+        key = hashlib.md5("%s|%s|%s|%s" % (common.GlobalConfigFiles.curr_prog_name, source_path, source_hash,
+                                           self.get_state_fingerprint(parser))).hexdigest()
+        return os.path.join(self.cache_dir, key + ".pkl")
+
+
+    def is_compiling(self):
+        """Checks if a script is being compiled, i.e. the parser is parsing a sub-file.
+        """
+        return self.compiling is not None
+
+
+    def add_source(self, test_script_source):
+        """Records a sub-file parsed while compiling.
+
+        Args:
+            test_script_source (object): The object of TestScriptSource class.
+        """
+        if self.compiling is not None:
+            source_path = TestScriptCache.get_source_path(test_script_source)
+            self.compiling["sources"].append((source_path, TestScriptCache.get_file_hash(source_path)))
+
+
+    def record_read(self, key, which_table):
+        """Records the value a symbol had before compiling when the parser looks it up.
+
+        Args:
+            key (str): The entry key.
+            which_table (dictionary): The dictionary looked up.
+        """
+        compiling = self.compiling
+        if compiling is None:
+            return
+        for name, table in compiling["read_tables"].items():
+            if table is which_table:
+                break
+        else:
+            return
+        if (name, key) in compiling["reads"]:
+            return
+        before = compiling["sym_tabs"][name]
+        compiling["reads"][(name, key)] = (key in before, TestScriptCache.canonical(before.get(key)))
+
+
+    def set_uncacheable(self):
+        """Marks the script being compiled as not cacheable, e.g. it uses random numbers.
+        """
+        if self.compiling is not None:
+            self.compiling["is_cacheable"] = False
+
+
+    def depends_on_test_case(self):
+        """Records that the compiled script depends on the current test case name.
+        """
+        if self.compiling is not None:
+            self.compiling["tc_name"] = common.GlobalConfigFiles.curr_tc_name
+
+
+    def load(self, parser):
+        """Replays the cached compiled form of the parser's script.
+
+        Args:
+            parser (object): The object of TestScriptParser class.
+
+        Returns True on a cache hit, False if the script must be parsed.
+        """
+        if not self.is_enabled:
+            return False
+
+        test_script_source = parser.test_script_scanner.test_script_source
+        source_path = TestScriptCache.get_source_path(test_script_source)
+        try:
+            entry_file = self.get_entry_file(parser, source_path, TestScriptCache.get_file_hash(source_path))
+            if not os.path.exists(entry_file):
+                self.misses += 1
+                return False
+            with open(entry_file, 'rb') as f:
+                entry = cPickle.load(f)
+        except Exception, e:
+            logging.debug("Unable to read compiled script of %s - %s" % (source_path, e))
+            self.misses += 1
+            return False
+
+        if not self.is_entry_valid(entry, parser):
+            self.misses += 1
+            return False
+
+        self.replay(entry, parser)
+        test_script_source.close_test_script(test_script_source.test_script_file_hdl)
+        try:
+            # the modification time tells the pruning when the entry was last used
+            os.utime(entry_file, None)
+        except OSError:
+            pass
+        self.hits += 1
+        logging.debug("Loaded compiled script %s" % source_path)
+        return True
+
+
+    def is_entry_valid(self, entry, parser):
+        """Checks if the cache entry can be used.
+
+        Args:
+            entry (dictionary): The cache entry.
+            parser (object): The object of TestScriptParser class.
+        """
+        if entry.get("version") != TestScriptCache.VERSION:
+            return False
+        if entry["tc_name"] is not None and entry["tc_name"] != common.GlobalConfigFiles.curr_tc_name:
+            return False
+
+        lists = self.get_lists(parser)
+        for name in entry["nodes"]:
+            if entry["nodes"][name] and lists[name] is None:
+                return False
+
+        read_tables = self.get_read_tables(parser)
+        for name, key, is_present, value in entry["reads"]:
+            which_table = read_tables.get(name, {})
+            if (key in which_table) != is_present or TestScriptCache.canonical(which_table.get(key)) != value:
+                return False
+
+        for source_path, source_hash in entry["sources"]:
+            try:
+                if TestScriptCache.get_file_hash(source_path) != source_hash:
+                    return False
+            except IOError:
+                return False
+        return True
+
+
+    def replay(self, entry, parser):
+        """Applies the recorded changes of the cache entry.
+
+        Args:
+            entry (dictionary): The cache entry.
+            parser (object): The object of TestScriptParser class.
+        """
+        parser_cls = parser.__class__
+        lists = self.get_lists(parser)
+        for name in TestScriptCache.LISTS:
+            for key, value, tag, group_tag in entry["nodes"][name]:
+                lists[name].insert(key, value, tag, group_tag)
+
+        for name in TestScriptCache.SYM_TABS:
+            which_table = getattr(TestScriptSymbolTable, name)
+            for key in entry["sym_tab_deleted"][name]:
+                which_table.pop(key, None)
+            which_table.update(copy.deepcopy(entry["sym_tab_set"][name]))
+
+        for call in entry["sub_file_calls"]:
+            parser_cls.sub_file_call_dict["%s:%s" % (call, len(parser_cls.sub_file_call_dict) + 1)] = len(parser_cls.sub_file_call_dict) + 1
+
+        parser_cls.device_alias_list[:] = entry["device_alias_list"]
+        parser_cls.ignore_if_else = entry["ignore_if_else"]
+        parser_cls.group_tag_name = entry["group_tag_name"]
+        parser_cls.add_end_flag = entry["add_end_flag"]
+
+
+    def start(self, parser):
+        """Starts recording the changes made by parsing the parser's script.
+
+        Args:
+            parser (object): The object of TestScriptParser class.
+        """
+        if not self.is_enabled:
+            return
+
+        test_script_source = parser.test_script_scanner.test_script_source
+        source_path = TestScriptCache.get_source_path(test_script_source)
+        source_hash = TestScriptCache.get_file_hash(source_path)
+        lists = self.get_lists(parser)
+        read_tables = self.get_read_tables(parser)
+
+        self.compiling = {"entry_file" : self.get_entry_file(parser, source_path, source_hash),
+                          "sources" : [(source_path, source_hash)],
+                          "is_cacheable" : True,
+                          "tc_name" : None,
+                          "lists" : lists,
+                          "tails" : dict((name, lists[name].tail if lists[name] is not None else None) for name in lists),
+                          "read_tables" : read_tables,
+                          "sym_tabs" : dict((name, copy.deepcopy(read_tables[name])) for name in read_tables),
+                          "reads" : {},
+                          "sub_file_calls" : set(parser.__class__.sub_file_call_dict.keys())}
+
+
+    def abort(self):
+        """Stops recording without storing anything, e.g. on a parse error.
+        """
+        self.compiling = None
+
+
+    def store(self, parser):
+        """Stops recording and writes the compiled form of the parser's script.
+
+        Args:
+            parser (object): The object of TestScriptParser class.
+        """
+        compiling = self.compiling
+        self.compiling = None
+        if compiling is None or not compiling["is_cacheable"]:
+            return
+
+        parser_cls = parser.__class__
+        entry = {"version" : TestScriptCache.VERSION,
+                 "sources" : compiling["sources"],
+                 "tc_name" : compiling["tc_name"],
+                 "reads" : sorted((name, key, is_present, value) for (name, key), (is_present, value) in compiling["reads"].items()),
+                 "nodes" : {},
+                 "sym_tab_set" : {},
+                 "sym_tab_deleted" : {},
+                 "device_alias_list" : list(parser_cls.device_alias_list),
+                 "ignore_if_else" : parser_cls.ignore_if_else,
+                 "group_tag_name" : parser_cls.group_tag_name,
+                 "add_end_flag" : parser_cls.add_end_flag}
+
+        for name, sll in compiling["lists"].items():
+            nodes = []
+            if sll is not None:
+                tail = compiling["tails"][name]
+                curr_node = tail.next if tail is not None else sll.head
+                while curr_node is not None:
+                    key = curr_node.data.keys()[0]
+                    nodes.append((key, curr_node.data[key], curr_node.tag, curr_node.group_tag))
+                    curr_node = curr_node.next
+            entry["nodes"][name] = nodes
+
+        for name in TestScriptCache.SYM_TABS:
+            before = compiling["sym_tabs"][name]
+            after = getattr(TestScriptSymbolTable, name)
+            entry["sym_tab_set"][name] = dict((k, v) for k, v in after.items() if k not in before or before[k] != v)
+            entry["sym_tab_deleted"][name] = [k for k in before if k not in after]
+
+        calls = [(v, k) for k, v in parser_cls.sub_file_call_dict.items() if k not in compiling["sub_file_calls"]]
+        entry["sub_file_calls"] = [k.rsplit(':', 1)[0] for v, k in sorted(calls)]
+
+        try:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir)
+            if not self.is_pruned:
+                self.is_pruned = True
+                self.prune()
+            tmp_file = compiling["entry_file"] + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                cPickle.dump(entry, f, cPickle.HIGHEST_PROTOCOL)
+            if os.path.exists(compiling["entry_file"]):
+                os.remove(compiling["entry_file"])
+            os.rename(tmp_file, compiling["entry_file"])
+        except Exception, e:
+            logging.debug("Unable to write compiled script to %s - %s" % (self.cache_dir, e))
+
+
+    def prune(self):
+        """Removes the entries not used for MAX_AGE seconds, then the least recently
+        used ones until the cache directory is no larger than MAX_SIZE bytes.
+        """
+        now = time.time()
+        entries = []
+        for file_name in os.listdir(self.cache_dir):
+            if not (file_name.endswith(".pkl") or file_name.endswith(".tmp")):
+                continue
+            entry_file = os.path.join(self.cache_dir, file_name)
+            try:
+                stat = os.stat(entry_file)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_file))
+
+        entries.sort()
+        total_size = sum(size for mtime, size, entry_file in entries)
+        removed = 0
+        for mtime, size, entry_file in entries:
+            if now - mtime <= TestScriptCache.MAX_AGE and total_size <= TestScriptCache.MAX_SIZE:
+                break
+            try:
+                os.remove(entry_file)
+            except OSError:
+                continue
+            total_size -= size
+            removed += 1
+        if removed:
+            logging.debug("Removed %d compiled scripts from %s" % (removed, self.cache_dir))
+
+
+    def get_stats(self):
+        """Gets the cache counters as a dictionary.
+        """
+        return {'hits' : self.hits, 'misses' : self.misses}
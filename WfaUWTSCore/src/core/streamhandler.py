@@ -36,6 +36,7 @@ class StreamHandler(object):
 
     def __init__(self, test_mngr_initr=None):
         self.test_mngr_initr = test_mngr_initr
+        self.run_context = test_mngr_initr.run_context
         self.ProgName = test_mngr_initr.prog_name
         self.DisplayNameTable = {}
         #self.streamSendResultArray = test_mngr_initr.test_data_strm_mngr.data_strm.streamSendResultArray
@@ -76,7 +77,25 @@ class StreamHandler(object):
 
 
     def add_streamInfo(self, streamInfoClass):
-        self.test_mngr_initr.test_data_strm_mngr.data_strm.streamInfoArray.append(streamInfoClass)
+        self.test_mngr_initr.test_data_strm_mngr.data_strm.add_stream_info(streamInfoClass)
+
+    @staticmethod
+    def get_check_phase(command):
+        """Gets the data transfer phase referenced by a stream check, None if it may use any phase.
+
+        Args:
+            command (str): The check command, e.g. CheckThroughput!streamID,phase,duration,...
+        """
+        cmdFilter = command.split('!')
+        if len(cmdFilter) < 2:
+            return None
+        values = cmdFilter[1].split(',')
+        check = cmdFilter[0].lower()
+        if (check == 'checkthroughput' or check == 'transactionthroughput') and len(values) > 1:
+            return values[1]
+        if check == 'checkmcsthroughput':
+            return values[0]
+        return None
 
     def processStreamResults(self, command):
         """process stream results..."""
@@ -93,7 +112,7 @@ class StreamHandler(object):
                 logging.debug("skip if program is P2P")
                 return
     
-            checkWPA2 = TestScriptSymbolTable.lookup_sym_tab("WPA2Test", TestScriptSymbolTable.capi_cmd_ret_sym_tab)
+            checkWPA2 = TestScriptSymbolTable.lookup_sym_tab("WPA2Test", self.run_context.capi_cmd_ret_sym_tab)
     
             if checkWPA2 == True:
                 logging.debug("WPA2 Results")
@@ -145,28 +164,25 @@ class StreamHandler(object):
         for tbd in self.test_mngr_initr.test_prog_mngr.test_prog.testbed_dev_list:
             self.DisplayNameTable.setdefault(tbd.ctrlipaddr, tbd.displayname)
 
-        for s in self.test_mngr_initr.test_data_strm_mngr.data_strm.streamSendResultArray:
+        data_strm = self.test_mngr_initr.test_data_strm_mngr.data_strm
+        for s in data_strm.streamSendResultArray:
             sDisplayAddress = s.IPAddress
             if s.IPAddress in self.DisplayNameTable:
                 sDisplayAddress = self.DisplayNameTable[s.IPAddress]
-            for r in self.test_mngr_initr.test_data_strm_mngr.data_strm.streamInfoArray:
-                if r.streamID == s.streamID and r.IPAddress == s.IPAddress and r.phase == s.phase:
-                    recv_id = r.pairID
-                    trafficClass = r.trafficClass
-                    phase = r.phase
-                    break
-            for p in self.test_mngr_initr.test_data_strm_mngr.data_strm.streamRecvResultArray:
+            r = data_strm.get_stream_info(s.streamID, s.IPAddress, s.phase)
+            if r is None:
+                continue
+            p = data_strm.get_recv_result(r.pairID, s.phase, first=True)
+            if p is not None:
                 pDisplayAddress = p.IPAddress
                 if p.IPAddress in self.DisplayNameTable:
                     pDisplayAddress = self.DisplayNameTable[p.IPAddress]
-                if p.streamID == recv_id and p.phase == s.phase:
-                    logging.info("\n\r %-7s -----  %s --> %s -----" %
-                                 ("", sDisplayAddress, pDisplayAddress))
-                    logging.info("\n%s" % s)
-                    if maxRTP < int(r.RTPID):
-                        maxRTP = int(r.RTPID)
-                    logging.info("\n%s" % p)
-                    break
+                logging.info("\n\r %-7s -----  %s --> %s -----" %
+                             ("", sDisplayAddress, pDisplayAddress))
+                logging.info("\n%s" % s)
+                if maxRTP < int(r.RTPID):
+                    maxRTP = int(r.RTPID)
+                logging.info("\n%s" % p)
         Util.set_color(Util.FOREGROUND_INTENSITY)
 
     def printStreamResults_WMM(self):
@@ -186,29 +202,28 @@ class StreamHandler(object):
 
         logging.info("\n\r %-7s --------------------STREAM RESULTS-----------------------" % "")
 
-        for s in self.test_mngr_initr.test_data_strm_mngr.data_strm.streamSendResultArray:
+        data_strm = self.test_mngr_initr.test_data_strm_mngr.data_strm
+        for s in data_strm.streamSendResultArray:
             sDisplayAddress = s.IPAddress
             if s.IPAddress in self.DisplayNameTable:
                 sDisplayAddress = self.DisplayNameTable[s.IPAddress]
-            for r in self.test_mngr_initr.test_data_strm_mngr.data_strm.streamInfoArray:
-                if r.streamID == s.streamID and r.IPAddress == s.IPAddress and r.phase == s.phase:
-                    recv_id = r.pairID
-                    trafficClass = r.trafficClass
-                    phase = r.phase
-                    break
-            for p in self.test_mngr_initr.test_data_strm_mngr.data_strm.streamRecvResultArray:
+            r = data_strm.get_stream_info(s.streamID, s.IPAddress, s.phase)
+            if r is None:
+                continue
+            trafficClass = r.trafficClass
+            phase = r.phase
+            p = data_strm.get_recv_result(r.pairID, s.phase, first=True)
+            if p is not None:
                 pDisplayAddress = p.IPAddress
                 if p.IPAddress in self.DisplayNameTable:
                     pDisplayAddress = self.DisplayNameTable[p.IPAddress]
-                if p.streamID == recv_id and p.phase == s.phase:
-                    logging.info("\n\r %-7s ----- RTP_%s-%s ( %s --> %s ) PHASE  = %s -----" %("", r.RTPID, trafficClass, sDisplayAddress, pDisplayAddress, p.phase))
-                    logging.info("\n%s" % s)
-                    summaryList.setdefault("%s:%s"%(int(r.RTPID), int(phase)), p.rxBytes)
-                    summaryStreamDisplay.setdefault("%s:%s" % (int(r.RTPID), int(phase)), "RTP%-1s_%-10s [%s-->%s]" % (r.RTPID, trafficClass, sDisplayAddress, pDisplayAddress))
-                    if maxRTP < int(r.RTPID):
-                        maxRTP = int(r.RTPID)
-                    logging.info("\n%s" % p)
-                    break
+                logging.info("\n\r %-7s ----- RTP_%s-%s ( %s --> %s ) PHASE  = %s -----" %("", r.RTPID, trafficClass, sDisplayAddress, pDisplayAddress, p.phase))
+                logging.info("\n%s" % s)
+                summaryList.setdefault("%s:%s"%(int(r.RTPID), int(phase)), p.rxBytes)
+                summaryStreamDisplay.setdefault("%s:%s" % (int(r.RTPID), int(phase)), "RTP%-1s_%-10s [%s-->%s]" % (r.RTPID, trafficClass, sDisplayAddress, pDisplayAddress))
+                if maxRTP < int(r.RTPID):
+                    maxRTP = int(r.RTPID)
+                logging.info("\n%s" % p)
         Util.set_color(Util.FOREGROUND_WHITE)
         logging.info("--------------------------SUMMARY----------------------------------")
         logging.info(" %46s %10s | %10s" % ("|", "Phase1 (Bytes)", "Phase2 (Bytes)"))
@@ -240,12 +255,13 @@ class StreamHandler(object):
             id1 = cmd[1]
             expectedVal = cmd[2]
             #print "wmm stream ids and expectedval:%s***%s***%s" % (id,id1,expectedVal)
-            for p in self.test_mngr_initr.test_data_strm_mngr.data_strm.streamRecvResultArray:
-                #print "in for loop ---> p.streamID / p.phase / p.rxBytes :" + str(p.streamID) +'/'+  p.phase + '/' + str(p.rxBytes)
-                if p.streamID == id and int(p.phase) == 1:#int(self.running_phase):
-                    P1 = p.rxBytes
-                elif p.streamID == id1 and int(p.phase) == 2:#int(self.running_phase):
-                    P2 = p.rxBytes
+            data_strm = self.test_mngr_initr.test_data_strm_mngr.data_strm
+            p = data_strm.get_recv_result(id, 1)
+            if p is not None:
+                P1 = p.rxBytes
+            p = data_strm.get_recv_result(id1, 2)
+            if p is not None:
+                P2 = p.rxBytes
 
             if (int(P2) <= 0) or (int(P1) <= 0):
                 actual = -1
@@ -345,18 +361,17 @@ class StreamHandler(object):
 
             P1 = -1
             logging.debug("Processing Throughput Check...")
+            data_strm = self.test_mngr_initr.test_data_strm_mngr.data_strm
             if Trans:
-                for p in self.test_mngr_initr.test_data_strm_mngr.data_strm.streamSendResultArray:
-                    if p.streamID == id and int(p.phase) == int(cmd[1]):
-                        P1 = p.rxBytes
-                        break
+                p = data_strm.get_send_result(id, cmd[1], first=True)
+                if p is not None:
+                    P1 = p.rxBytes
             else:
-                for p in self.test_mngr_initr.test_data_strm_mngr.data_strm.streamRecvResultArray:
-                    if p.streamID == id and int(p.phase) == int(cmd[1]):
-                        P1 = p.rxBytes
-                        if not P1:
-                            P1 = -1
-                        break
+                p = data_strm.get_recv_result(id, cmd[1], first=True)
+                if p is not None:
+                    P1 = p.rxBytes
+                    if not P1:
+                        P1 = -1
 
             if int(P1) <= 0:
                 actual = -1
@@ -400,15 +415,16 @@ class StreamHandler(object):
             RX2 = -1
 
             logging.debug("Processing Throughput Check...")
-            for p in self.test_mngr_initr.test_data_strm_mngr.data_strm.streamSendResultArray:
-                if p.streamID ==  cmd[1] and int(p.phase) == int(cmd[0]):
-                    TX = long(p.txBytes)
-                    break
-            for p in self.test_mngr_initr.test_data_strm_mngr.data_strm.streamRecvResultArray:
-                if p.streamID == cmd[2] and int(p.phase) == int(cmd[0]):
-                    RX1 = long(p.rxBytes)
-                if p.streamID == cmd[3] and int(p.phase) == int(cmd[0]):
-                    RX2 = long(p.rxBytes)
+            data_strm = self.test_mngr_initr.test_data_strm_mngr.data_strm
+            p = data_strm.get_send_result(cmd[1], cmd[0], first=True)
+            if p is not None:
+                TX = long(p.txBytes)
+            p = data_strm.get_recv_result(cmd[2], cmd[0])
+            if p is not None:
+                RX1 = long(p.rxBytes)
+            p = data_strm.get_recv_result(cmd[3], cmd[0])
+            if p is not None:
+                RX2 = long(p.rxBytes)
 
             logging.debug("-%s-%s-%s-%s" % (TX, RX1, RX2, cmd[4]))
             TX = (long(TX)* (float(cmd[4])/100))
@@ -436,13 +452,13 @@ class StreamHandler(object):
         try:
             cmd = line.split(',')
             logging.debug("process_Check DT4 Results")
-            logging.debug("-%s-%s-%s-%s-%s-%s" % (cmd[0], cmd[1], TestScriptSymbolTable.get_value_from_sym_tab(cmd[1], TestScriptSymbolTable.capi_cmd_ret_sym_tab), cmd[2], cmd[3], cmd[4]))
+            logging.debug("-%s-%s-%s-%s-%s-%s" % (cmd[0], cmd[1], TestScriptSymbolTable.get_value_from_sym_tab(cmd[1], self.run_context.capi_cmd_ret_sym_tab), cmd[2], cmd[3], cmd[4]))
             RX = -1
 
             id = cmd[1]
-            for p in self.test_mngr_initr.test_data_strm_mngr.data_strm.streamSendResultArray:
-                if p.streamID == id and int(p.phase) == int(cmd[0]):
-                    RX = long(p.rxFrames)
+            p = self.test_mngr_initr.test_data_strm_mngr.data_strm.get_send_result(id, cmd[0])
+            if p is not None:
+                RX = long(p.rxFrames)
 
             logging.debug("-%s-%s" % (RX, cmd[2]))
 
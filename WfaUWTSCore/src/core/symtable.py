@@ -19,18 +19,71 @@
 #!/usr/bin/env python
 ﻿
 
+import copy
+import threading
+
+
+class SymbolTable(dict):
+    """The dictionary class of a symbol table shared by the parser and the execution threads.
+
+    Single reads and writes are atomic, the lock serializes read-modify-write
+    operations such as TestScriptSymbolTable.increment_sym_tab.
+
+    Attributes:
+        lock (object): The lock protecting compound operations on the table.
+
+    """
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self.lock = threading.RLock()
+
+
+    def reset(self, defaults):
+        """Replaces all entries with the default entries.
+
+        Args:
+            defaults (dictionary): The default entries.
+        """
+        with self.lock:
+            self.clear()
+            self.update(defaults)
+
+
+    def __deepcopy__(self, memo):
+        # snapshots are plain dictionaries, the lock is not copied
+        with self.lock:
+            return copy.deepcopy(dict(self), memo)
+
+
+
 class TestScriptSymbolTable(object):
     """The class that manages the global dictionary data structures.
 
+    The tables are owned by the active RunContext, which binds them here so
+    that the parser and the script classes keep using the same names.
+
+    Besides socktimeout, the script symbol table holds the executor tuning
+    keys, which an init environment file or a script can override with define:
+    $subqPoolSize is the number of worker threads running the sub queues of a
+    parallel section, read when the pool is created on first use, and
+    $subqTimeout is the number of seconds a sub queue may run before it is
+    cancelled, and $graphMaxWorkers is the number of device command chains of
+    a task graph run at once.
+
     Attributes:
         test_script_sym_tab (dictionary): The dictionary to store parsing time variables in the scripts.
         capi_cmd_ret_sym_tab (dictionary): The dictionary to store execution time variables in the scripts.
         test_result_tab (dictionary): The dictionary to store test results variables in the scripts.
 
     """
-    test_script_sym_tab = {"ifCondBit" : True, "socktimeout" : 600, "iDNB" : 0, "testRunning" : 0, "threadCount" : 0}
-    capi_cmd_ret_sym_tab = {}
-    test_result_tab = {'total_count' : 0, 'pass_count' : 0, 'fail_count' : 0, 'num_of_pass_required' : 0, 'conditional_chk_flag' : 0}
+    test_script_sym_tab_defaults = {"ifCondBit" : True, "socktimeout" : 600, "iDNB" : 0, "testRunning" : 0, "threadCount" : 0,
+                                   "$subqPoolSize" : 8, "$subqTimeout" : 600, "$graphMaxWorkers" : 4}
+    capi_cmd_ret_sym_tab_defaults = {}
+    test_result_tab_defaults = {'total_count' : 0, 'pass_count' : 0, 'fail_count' : 0, 'num_of_pass_required' : 0, 'conditional_chk_flag' : 0}
+
+    test_script_sym_tab = SymbolTable(test_script_sym_tab_defaults)
+    capi_cmd_ret_sym_tab = SymbolTable(capi_cmd_ret_sym_tab_defaults)
+    test_result_tab = SymbolTable(test_result_tab_defaults)
 
 
     @staticmethod
@@ -55,10 +108,7 @@ class TestScriptSymbolTable(object):
             key (str): The entry key.
             which_table (dictionary): The dictionary to get the entry from.
         """
-        if TestScriptSymbolTable.lookup_sym_tab(key, which_table):
-            return which_table[key]
-        else:
-            return None
+        return which_table.get(key)
 
 
     @staticmethod
@@ -72,6 +122,24 @@ class TestScriptSymbolTable(object):
         which_table[key] = value
 
 
+    @staticmethod
+    def increment_sym_tab(key, which_table, step=1):
+        """Adds the step to the entry value atomically and returns the new value.
+
+        Args:
+            key (str): The entry key.
+            which_table (dictionary): The dictionary holding the entry.
+            step (int): The value to be added.
+        """
+        lock = getattr(which_table, "lock", None)
+        if lock is None:
+            which_table[key] = which_table.get(key, 0) + step
+            return which_table[key]
+        with lock:
+            which_table[key] = which_table.get(key, 0) + step
+            return which_table[key]
+
+
     @staticmethod
     def delete_key_from_sym_tab(key, which_table):
         """Deletes the entry from the dictionary based on the given key.
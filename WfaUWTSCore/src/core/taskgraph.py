@@ -0,0 +1,203 @@
+###############################################################################
+#
+# Copyright (c) 2016 Wi-Fi Alliance
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER
+# RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT,
+# NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE
+# USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+###############################################################################
+
+#!/usr/bin/env python
+
+"""
+Dependency graph of the CAPI tasks between two barriers
+"""
+
+import logging
+import threading
+
+
+class TaskGraphNode(object):
+    """The class that holds a task and its dependency edges.
+
+    Attributes:
+        index (int): The position of the task in the script.
+        task (object): The ExecutionTask object.
+        pending (int): The number of predecessors that have not completed yet.
+        dependents (list): The indexes of the nodes waiting for this node.
+
+    """
+    def __init__(self, index, task):
+        self.index = index
+        self.task = task
+        self.pending = 0
+        self.dependents = []
+
+
+
+class TaskGraph(object):
+    """The class that runs independent device chains of CAPI tasks concurrently.
+
+    A task depends on the previous task sent to the same control agent, on
+    the last task writing a $variable it reads and, for a task writing a
+    $variable, on the earlier readers and writer of that variable. The graph
+    only ever holds the tasks between two barriers, i.e. between two tasks
+    that the executor runs on its own in the main queue.
+
+    Attributes:
+        nodes (list): The TaskGraphNode objects in script order.
+        last_by_device (dictionary): The index of the last node keyed by "ip:port".
+        last_writer (dictionary): The index of the last node writing a variable.
+        readers (dictionary): The indexes of the nodes reading a variable since its last write.
+        devices (set): The "ip:port" strings of the control agents involved.
+
+    """
+    def __init__(self):
+        self.nodes = []
+        self.last_by_device = {}
+        self.last_writer = {}
+        self.readers = {}
+        self.devices = set()
+
+
+    @staticmethod
+    def get_read_vars(task):
+        """Gets the variables substituted into the parameters of a task.
+
+        Args:
+            task (object): The ExecutionTask object.
+        """
+        if task.param_template is None:
+            return []
+        return [name for name in task.param_template.names if name.startswith("$")]
+
+
+    @staticmethod
+    def get_write_vars(task):
+        """Gets the variables a task stores its return values into.
+
+        Args:
+            task (object): The ExecutionTask object.
+        """
+        write_vars = []
+        for ret_def in task.ret.values():
+            for ret_vars in ret_def.keys():
+                for item in ret_vars.replace(' ', ',').split(','):
+                    if item.startswith('$'):
+                        write_vars.append(item)
+        return write_vars
+
+
+    def add_edge(self, before, after):
+        """Makes a node wait for an earlier one.
+
+        Args:
+            before (int): The index of the earlier node.
+            after (int): The index of the waiting node.
+        """
+        if before is None or before == after or after in self.nodes[before].dependents:
+            return
+        self.nodes[before].dependents.append(after)
+        self.nodes[after].pending += 1
+
+
+    def add_task(self, task):
+        """Appends a task to the graph and links it to the tasks it depends on.
+
+        Args:
+            task (object): The ExecutionTask object.
+        """
+        index = len(self.nodes)
+        self.nodes.append(TaskGraphNode(index, task))
+
+        device = task.get_ipport()
+        self.devices.add(device)
+        self.add_edge(self.last_by_device.get(device), index)
+        self.last_by_device[device] = index
+
+        for var in TaskGraph.get_read_vars(task):
+            self.add_edge(self.last_writer.get(var), index)
+            self.readers.setdefault(var, []).append(index)
+
+        for var in TaskGraph.get_write_vars(task):
+            self.add_edge(self.last_writer.get(var), index)
+            for reader in self.readers.pop(var, []):
+                self.add_edge(reader, index)
+            self.last_writer[var] = index
+
+
+    def get_tasks(self):
+        """Gets the tasks in script order.
+        """
+        return [node.task for node in self.nodes]
+
+
+    def is_concurrent(self):
+        """Checks if at least two device chains can run at the same time.
+        """
+        return len(self.devices) > 1
+
+
+    def run(self, run_task, max_workers):
+        """Runs the tasks on at most max_workers threads in dependency order.
+
+        Args:
+            run_task (function): The callback executing a task, it returns False to
+                stop scheduling the tasks which have not been started yet.
+            max_workers (int): The maximum number of tasks running at the same time.
+
+        Returns the executed tasks in script order.
+        """
+        cond = threading.Condition()
+        pending = dict((node.index, node.pending) for node in self.nodes)
+        ready = [node.index for node in self.nodes if node.pending == 0]
+        state = {"running" : 0, "stopped" : False}
+        executed = []
+
+        def worker():
+            while True:
+                with cond:
+                    while not ready and state["running"] > 0 and not state["stopped"]:
+                        cond.wait()
+                    if not ready or state["stopped"]:
+                        cond.notifyAll()
+                        return
+                    index = ready.pop(0)
+                    state["running"] += 1
+
+                keep_going = False
+                try:
+                    keep_going = run_task(self.nodes[index].task)
+                except Exception:
+                    logging.error("Task %s failed" % self.nodes[index].task.cmd, exc_info=True)
+
+                with cond:
+                    state["running"] -= 1
+                    executed.append(index)
+                    if not keep_going:
+                        state["stopped"] = True
+                    for dependent in self.nodes[index].dependents:
+                        pending[dependent] -= 1
+                        if pending[dependent] == 0:
+                            ready.append(dependent)
+                    ready.sort()
+                    cond.notifyAll()
+
+        workers = []
+        for i in range(max(1, min(max_workers, len(self.nodes)))):
+            thread = threading.Thread(target=worker, name="taskgraph-%d" % i)
+            thread.start()
+            workers.append(thread)
+        for thread in workers:
+            thread.join()
+
+        return [self.nodes[index].task for index in sorted(executed)]
@@ -26,17 +26,20 @@ import os
 import re
 import string
 import sys
-import xml.dom.minidom
-from xml.dom.minidom import Node
 from difflib import SequenceMatcher
 from common import GlobalConfigFiles
 from scriptinfo.scriptsource import TestFileManager
+from scriptinfo.mastertestinfo import MasterTestInfoIndex
 
 
 
 #TMS response packet
 class TMSProcessor(object):
     """ TMS class """
+    #characters not allowed in the TMS device names
+    specials = "$#&*()[]{};:,//<>?/\/|`~=+"
+    trans = string.maketrans(specials, '.' * len(specials))
+
     #Init variables
     def __init__(self, TestResult="N/A", Mode="Sigma", DutParticipantName="Unknown", PrimaryTestbedParticipantName="Unknown"):
         self.TmsEventId = ""
@@ -83,19 +86,7 @@ class TMSProcessor(object):
             
 
             #print "path : " + path
-            doc = xml.dom.minidom.parse(path)
-            #print "after parse xml...."
-            if doc.getElementsByTagName(self.TestCaseId) is not None:
-                
-                for node in doc.getElementsByTagName(self.TestCaseId):
-                    L = node.getElementsByTagName(tag)
-                    if L is not None:
-                        for node2 in L:
-                            if node2.childNodes is not None:
-                                for node3 in node2.childNodes:
-                                    if node3.nodeType == Node.TEXT_NODE:
-                                        result = node3.nodeValue
-                                        break
+            result = MasterTestInfoIndex.get_index(path).get_value(self.TestCaseId, tag)
 
         except Exception:
             logging.debug("Unexpected error:", sys.exc_info())
@@ -182,6 +173,11 @@ class TMSProcessor(object):
         tmsFile.close()
 
 
+    @staticmethod
+    def getDeviceInfoValue(response, key):
+        """Gets a device_get_info value of the parsed CapiResponse with special characters replaced"""
+        return response.get(key, "").translate(TMSProcessor.trans)
+
     #func to get device_get_info capi resonse
     def setDutDeviceInfo(self, response):
         category = self.Search_MasterTestInfo(self.TestCaseId, "DUT_CAT")
@@ -189,47 +185,10 @@ class TMSProcessor(object):
         dutModel = ""
         dutVersion = ""
 
-
-        specials = "$#&*()[]{};:,//<>?/\/|`~=+"
-        trans = string.maketrans(specials, '.'*len(specials))
-
         try:
-            if re.search(r"vendor", response):
-                posVendor = response.index('vendor,') + 7
-                data = response[posVendor:]
-                data = data.lstrip()
-                try:
-                    posSym = data.index(',')
-                    tempStr = data[:posSym]
-                    dutName = tempStr.translate(trans)
-                except Exception:
-                    dutName = data.rstrip('\n')
-                    dutName = tempStr.translate(trans)
-
-            if re.search(r"model", response):
-                posVendor = response.index('model,') + 6
-                data = response[posVendor:]
-                data = data.lstrip()
-                try:
-                    posSym = data.index(',')
-                    tempStr = data[:posSym]
-                    dutModel = tempStr.translate(trans)
-                except Exception:
-                    dutModel = data.rstrip('\n')
-                    dutModel = dutModel.translate(trans)
-
-            if re.search(r"version", response):
-                posVendor = response.index('version,') + 8
-                data = response[posVendor:]
-                data = data.lstrip()
-                try:
-                    posSym = data.index(',')
-                    tempStr = data[:posSym]
-                    dutVersion = tempStr.translate(trans)
-                except Exception:
-                    dutVersion = data.rstrip('\n')
-                    dutVersion = dutVersion.translate(trans)
-
+            dutName = self.getDeviceInfoValue(response, 'vendor')
+            dutModel = self.getDeviceInfoValue(response, 'model')
+            dutVersion = self.getDeviceInfoValue(response, 'version')
         except Exception:
             #logging.info("couldn't create device info...")
             logging.debug("couldn't create device info...")
@@ -303,47 +262,10 @@ class TMSProcessor(object):
         modelTestBed = ""
         firmwareTestBed = ""
 
-        specials = "$#&*()[]{};:,//<>?/\/|`~=+"
-        trans = string.maketrans(specials, '.' * len(specials))
-
-        if re.search(r"status,COMPLETE", response):
-            if re.search(r"vendor", response):
-                posVendor = response.index('vendor,') + 7
-                data = response[posVendor:]
-                data = data.lstrip()
-                try:
-                    posSym = data.index(',')
-                    tempStr = data[:posSym]
-                    companyTestBed = tempStr.translate(trans)
-                except Exception:
-                    companyTestBed = data.rstrip('\n')
-                    companyTestBed = companyTestBed.translate(trans)
-
-            if re.search(r"model", response):
-                posVendor = response.index('model,') + 6
-                data = response[posVendor:]
-                data = data.lstrip()
-                try:
-                    posSym = data.index(',')
-                    tempStr = data[:posSym]
-                    modelTestBed = tempStr.translate(trans)
-                except Exception:
-                    modelTestBed = data.rstrip('\n')
-                    modelTestBed = modelTestBed.translate(trans)
-
-            if re.search(r"version", response):
-                posVendor = response.index('version,') + 8
-                data = response[posVendor:]
-                data = data.lstrip()
-                try:
-                    posSym = data.index(',')
-                    tempStr = data[:posSym]
-                    firmwareTestBed = tempStr.translate(trans)
-                except Exception:
-                    firmwareTestBed = data.rstrip('\n')
-                    firmwareTestBed = firmwareTestBed.translate(trans)
-
-
+        if response.is_complete():
+            companyTestBed = self.getDeviceInfoValue(response, 'vendor')
+            modelTestBed = self.getDeviceInfoValue(response, 'model')
+            firmwareTestBed = self.getDeviceInfoValue(response, 'version')
 
             companyTestBed = companyTestBed.replace(" ", ".")
             modelTestBed = modelTestBed.replace(" ", ".")
@@ -0,0 +1,163 @@
+###############################################################################
+#
+# Copyright (c) 2016 Wi-Fi Alliance
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER
+# RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT,
+# NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE
+# USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+###############################################################################
+
+#!/usr/bin/env python
+
+"""
+Reusable pool of worker threads returning futures
+"""
+
+import sys
+import time
+import logging
+import threading
+from Queue import Queue
+
+
+class TaskFuture(object):
+    """The class that carries the outcome of a function run by the worker pool.
+
+    Attributes:
+        name (str): The name used in the log messages.
+        result (object): The return value of the function.
+        exc_info (tuple): The exception information if the function raised.
+        started_at (float): The time the function was started, None while queued.
+        is_cancelled (boolean): The flag to indicate the caller gave up on the function.
+        started (object): The event set once the function was started.
+        done (object): The event set once the function returned or raised.
+
+    """
+    def __init__(self, name):
+        self.name = name
+        self.result = None
+        self.exc_info = None
+        self.started_at = None
+        self.is_cancelled = False
+        self.started = threading.Event()
+        self.done = threading.Event()
+
+
+    def cancel(self):
+        """Marks the function as abandoned, a queued function is not started anymore.
+        """
+        self.is_cancelled = True
+
+
+    def wait(self, timeout=None):
+        """Waits for the function to complete, the timeout counts from its start.
+
+        A function still queued when the timeout expires counts as timed out,
+        the caller cancels it so that it is not started anymore.
+
+        Args:
+            timeout (float): The maximum run time in seconds, None to wait forever.
+
+        Returns True if the function completed in time.
+        """
+        if timeout is None:
+            self.started.wait()
+            self.done.wait()
+        else:
+            self.started.wait(timeout)
+            if not self.started.isSet():
+                return False
+            self.done.wait(max(0, self.started_at + timeout - time.time()))
+        return self.done.isSet()
+
+
+
+class WorkerPool(object):
+    """The class that runs functions on a bounded set of long living threads.
+
+    A worker blocked by an abandoned function is replaced, so that a hung
+    device never reduces the number of functions that can run at once.
+
+    Attributes:
+        size (int): The number of workers available for new functions.
+        name (str): The prefix of the worker thread names.
+        jobs (object): The queue of (future, function, args) tuples.
+        workers (list): The worker threads.
+        lock (object): The lock protecting the worker list.
+
+    """
+    def __init__(self, size, name="worker"):
+        self.size = size
+        self.name = name
+        self.jobs = Queue()
+        self.workers = []
+        self.lock = threading.Lock()
+        for i in range(size):
+            self.add_worker()
+
+
+    def add_worker(self):
+        """Starts one more worker thread.
+        """
+        with self.lock:
+            worker = threading.Thread(target=self.run_jobs, name="%s-%d" % (self.name, len(self.workers)))
+            worker.setDaemon(True)
+            self.workers.append(worker)
+        worker.start()
+
+
+    def submit(self, name, func, *args):
+        """Queues a function and returns its future.
+
+        Args:
+            name (str): The name used in the log messages.
+            func (function): The function to be run.
+            args (list): The function arguments.
+        """
+        future = TaskFuture(name)
+        self.jobs.put((future, func, args))
+        return future
+
+
+    def abandon(self, future):
+        """Gives up on a function which overran its deadline and replaces its worker.
+
+        Args:
+            future (object): The TaskFuture object of the function.
+        """
+        future.cancel()
+        if future.started.isSet() and not future.done.isSet():
+            logging.debug("Worker running %s abandoned, starting a new worker" % future.name)
+            self.add_worker()
+
+
+    def run_jobs(self):
+        """Runs queued functions until the process exits.
+        """
+        while True:
+            future, func, args = self.jobs.get()
+            future.started_at = time.time()
+            if future.is_cancelled:
+                future.started.set()
+                future.done.set()
+                continue
+            future.started.set()
+            try:
+                future.result = func(*args)
+            except Exception:
+                future.exc_info = sys.exc_info()
+            future.done.set()
+            if future.is_cancelled and len(self.workers) > self.size:
+                # a replacement was started meanwhile, keep the pool bounded
+                with self.lock:
+                    self.workers.remove(threading.currentThread())
+                return
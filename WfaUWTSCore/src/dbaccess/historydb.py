@@ -36,7 +36,16 @@ class HistoryDB(DB):
     then use logid to add_line to the entry or update the entry at once
     with add_entry. See other APIs for storing other elements in the db
     such as initenv, status, user_mode, etc.
+
+    Lines given to add_line are stored as compressed chunks in the log_chunk
+    table, one chunk per FLUSH_LINES lines or FLUSH_SECONDS seconds, so that
+    a log is written in linear time. The time based flush is lazy, it only
+    happens when the next line is added, and close_entry flushes the rest.
+    get_log_output joins the chunks again, followed by the pending lines of
+    an entry that is still open.
     """
+    FLUSH_LINES = 200
+    FLUSH_SECONDS = 5
 
     def __init__(self, dbpath):
         super(HistoryDB, self).__init__(dbpath)
@@ -44,7 +53,10 @@ class HistoryDB(DB):
         self.conn = None
         self.c = None
         self.connect()
+        self.create_chunk_table()
         self.currentlog = {}
+        self.chunkseq = {}
+        self.lastflush = {}
         self.columns = {'logid',
                         'testcase',
                         'program',
@@ -81,6 +93,15 @@ class HistoryDB(DB):
         except (sqlite3.Error) as emsg:
             print(emsg)
 
+    def create_chunk_table(self):
+        """Creates the log_chunk table, it is missing in databases created by older releases"""
+        self.execute("""CREATE TABLE IF NOT EXISTS "log_chunk" (
+                "logid" INTEGER NOT NULL,
+                "seq" INTEGER NOT NULL,
+                "chunk" BLOB NOT NULL,
+                PRIMARY KEY ("logid", "seq")
+                );""", commit=True)
+
     def create_entry(self, testcase, program, user_mode, storage=None):
         """Returns log entry descriptor"""
         L = []
@@ -110,24 +131,45 @@ class HistoryDB(DB):
         last = self.c.lastrowid
         if [] != self.currentlog.setdefault(last, []):
             print("Error: Already opened database entry %d" % (last))
+        self.chunkseq[last] = 0
+        self.lastflush[last] = time.time()
         return last
 
     def add_line(self, logid, line):
-        """Add a line to this history entry"""
-        #Attempt to add this to to the currentlog[logid], compress, and commit
+        """Add a line to this history entry, flushing the pending lines once
+        FLUSH_LINES are pending or FLUSH_SECONDS passed since the last flush"""
+        #Attempt to add this to to the currentlog[logid], the lines are committed in chunks
         if logid in self.currentlog:
-            try:
-                self.currentlog[logid].append(line)
-            except (AttributeError):
-                self.currentlog[logid].append(line)
+            self.currentlog[logid].append(line)
         else:
             return False
-        c = ''.join(self.currentlog[logid]).encode('utf-8')
+        if (len(self.currentlog[logid]) >= self.FLUSH_LINES or
+                time.time() - self.lastflush.get(logid, 0) >= self.FLUSH_SECONDS):
+            self.flush_lines(logid)
+        return True
+
+    def flush_lines(self, logid):
+        """Store the pending lines of this history entry as one compressed chunk"""
+        lines = self.currentlog.get(logid)
+        self.lastflush[logid] = time.time()
+        if not lines:
+            return False
+        c = ''.join(lines)
+        if isinstance(c, unicode):
+            c = c.encode('utf-8')
+        seq = self.chunkseq.get(logid, 0)
         z = sqlite3.Binary(zlib.compress(c))
-        self.execute('UPDATE history SET log_output=? WHERE logid=?', (z, logid))
+        self.execute('INSERT INTO log_chunk(logid, seq, chunk) VALUES (?, ?, ?)', (logid, seq, z))
         self.commit()
+        self.chunkseq[logid] = seq + 1
+        del lines[:]
         return True
 
+    def get_log_chunks(self, logid):
+        """Return the decompressed log chunks of an entry in order"""
+        self.execute('SELECT chunk FROM log_chunk WHERE logid=? ORDER BY seq', (logid,))
+        return [zlib.decompress(row['chunk']) for row in self.c.fetchall()]
+
     def get_storage(self, **kwargs):
         """
         Returns the storage value for an entry given a unique set of constraints
@@ -169,15 +211,14 @@ class HistoryDB(DB):
         
     def close_entry(self, logid, status='NA'):
         """Optionally add a status and then close entry"""
-        #pop the thing from the currentlog, compress, and place/commit
+        #flush the remaining lines as the last chunk and pop the thing from the currentlog
         if logid in self.currentlog:
-            closed = self.currentlog.pop(logid)
+            self.flush_lines(logid)
+            self.currentlog.pop(logid)
+            self.chunkseq.pop(logid, None)
+            self.lastflush.pop(logid, None)
         else:
             return False
-        if len(closed) > 0:
-            c = ''.join(closed)
-            z = sqlite3.Binary(zlib.compress(c))
-            self.execute('UPDATE history SET log_output=? WHERE logid=?', (z, logid))
         finished = int(time.time())
         self.execute('UPDATE history SET status=? WHERE logid=?', (status, logid))
         self.execute('UPDATE history SET finished=? WHERE logid=?', (finished, logid))
@@ -251,14 +292,22 @@ class HistoryDB(DB):
             return True
 
     def get_log_output(self, decompress=True, **kwargs):
-        """Return the log_output of a log entry"""
+        """Return the log_output of a log entry, joining the chunks written by add_line"""
         constraints = self.create_constraints(**kwargs)
         args = self.create_args(**kwargs)
-        self.execute('SELECT log_output FROM history WHERE %s' % (constraints), args)
+        self.execute('SELECT logid, log_output FROM history WHERE %s' % (constraints), args)
         zt = self.c.fetchone()
         if zt is not None:
             z = zt['log_output']
-            if decompress:
+            if z is None:
+                chunks = self.get_log_chunks(zt['logid'])
+                # lines of an open entry not flushed yet
+                for line in self.currentlog.get(zt['logid'], []):
+                    chunks.append(line.encode('utf-8') if isinstance(line, unicode) else line)
+                d = ''.join(chunks)
+                if not decompress:
+                    d = zlib.compress(d)
+            elif decompress:
                 d = zlib.decompress(z)
             else:
                 d = z
@@ -28,6 +28,24 @@ import common
 import logging
 
 _current_mode = None #"atl" "matl" "precert" "plugfest"
+_permissions = None #{mode : {feature : 0/1}} loaded from the usermode table, replaced as a whole
+
+def refresh_permissions(db):
+    """Reloads the permission matrix of all user modes from the UserModeDB and returns it"""
+    global _permissions
+    permissions = db.get_permissions()
+    _permissions = permissions
+    return permissions
+
+def lookup_feature(feat):
+    """
+    Checks the given feature for the current user mode against the loaded
+    permission matrix. Returns None if the matrix has not been loaded yet.
+    """
+    permissions = _permissions
+    if permissions is None:
+        return None
+    return permissions.get(_current_mode, {}).get(feat) == 1
 
 class UserModeObj(object):
     """User mode object is used for storing usermode with the user mode DAO."""
@@ -111,14 +129,18 @@ class UserModeDAO(object):
         mode. If the mode is invalid, then it returns -1.
         """
         global _current_mode
-        valid_modes = set(self.db.get_available_modes())
-        if mode not in valid_modes:
+        permissions = self.refresh_permissions()
+        if mode not in permissions:
             logging.error('Could not set unknown mode "%s" to current user mode' % (mode))
             return -1
         else:
             _current_mode = mode
             return _current_mode
 
+    def refresh_permissions(self):
+        """Reloads the permission matrix of all user modes and returns it"""
+        return refresh_permissions(self.db)
+
     def get_available_modes(self):
         """Returns a list of the currently available user modes"""
         return self.db.get_available_modes()
@@ -137,8 +159,11 @@ class UserModeDAO(object):
         Checks to see if the given feature is true or false for the current 
         user mode
         """
-        global _current_mode
-        return self.db.check_feature(feat, _current_mode)
+        result = lookup_feature(feat)
+        if result is None:
+            self.refresh_permissions()
+            result = lookup_feature(feat)
+        return result
 
 class UserModeDB(DB):
 
@@ -183,11 +208,14 @@ class UserModeDB(DB):
                          (mode, description, edit_scripts, validation, tms, scripts_read_access,
                         scripts_write_access, init_map_read_access, multi_user, no_sigma_support, result_protection,
                         script_protection, app_id), commit=True)
+            refresh_permissions(self)
             
         def get_modes(self, feat):
             """Returns the modes of an entry when given the feature"""
-            query = "SELECT mode FROM usermode WHERE " + feat + "=1"
-            self.execute(query)
+            if feat not in self.columns:
+                logging.error('Unknown user mode feature "%s"' % (feat))
+                return []
+            self.execute('SELECT mode FROM usermode WHERE "%s"=?' % (feat), (1,))
             fa = self.c.fetchall()
             modes = []
             for mode in fa:
@@ -212,10 +240,20 @@ class UserModeDB(DB):
             else:
                 return ''
         
+        def get_permissions(self):
+            """Returns a dictionary of {mode : {feature : value}} for all user modes"""
+            self.execute('SELECT * FROM usermode')
+            permissions = {}
+            for row in self.c.fetchall():
+                permissions[row['mode']] = dict((key, row[key]) for key in row.keys())
+            return permissions
+
         def check_feature(self, feat, mode):
             """Checks if the specific feature is available in current mode"""
-            query = "SELECT " + feat + " FROM usermode WHERE mode= '" + mode + "'"
-            self.execute(query)
+            if feat not in self.columns:
+                #feat is not a column of the usermode table
+                return False
+            self.execute('SELECT "%s" FROM usermode WHERE mode=?' % (feat), (mode,))
             f = self.c.fetchone()
             if f is not None:
                 if f[feat] == 1:
@@ -23,6 +23,7 @@ from __future__ import print_function
 from __future__ import division
 import sqlite3
 import os
+import threading
 import common
 from database import DB
 import datetime
@@ -71,21 +72,7 @@ class ValidationDAO(object):
         """
         Returns a dictionary of: 
         {uwts_name : (validation_command_entity, validation_data_entity)}"""
-        command_dict = {}
-        # 1. Get all data by program
-        for data_entity in self.db.get_data_by_program(program):
-            uwts_name = data_entity.get('uwts_name')
-            # 2. For each data, get command by data's vc_id
-            command_entity = self.db.get_command_by_vc_id(data_entity.get('vc_id'))
-            # 3. Create dictionary with data.uwts_name : get_command_by_vc_id(vc_di)
-            data_command_dict = {'data' : data_entity, 'command' : command_entity}
-            t = command_dict.setdefault(uwts_name, data_command_dict)
-            if t['command'] != command_entity:
-                #There can be only one. Choose the one with a > expiration
-                if data_entity.get('expiration') > t['data'].get('expiration'):
-                    command_dict[uwts_name] = data_command_dict
-                    print('Newer expiration found for {0}'.format(data_entity.get('uwts_name')))
-        return command_dict
+        return dict(self.db.get_command_map(program))
 
     def get_validation_fields(self, program='VHT'):
         """
@@ -105,7 +92,12 @@ class TestPlanTemplateDB(DB):
     TestPlanTemplateDB class provides access methods to the validation tables. 
     The current tables are validation_command, validation_data, and 
     validation_vars.
+
+    The command maps built by get_command_map are shared by all instances and
+    kept until the database file changes.
     """
+    command_maps = {}
+    command_maps_lock = threading.Lock()
 
     def __init__(self, dbpath):
         super(TestPlanTemplateDB, self).__init__(dbpath)
@@ -127,6 +119,12 @@ class TestPlanTemplateDB(DB):
             for description in self.c.description:
                 self.columns[table].append(description[0])
             self.columns[table] = tuple(self.columns[table])
+        # one statement for all rows of a program, sqlite3 keeps it prepared
+        self.command_map_sql = ('SELECT %s, %s FROM validation_data AS d '
+                                'LEFT JOIN validation_command AS c ON c.vc_id = d.vc_id '
+                                'WHERE d.program=? ORDER BY d.vd_id' %
+                                (', '.join(['d.%s' % column for column in self.columns['validation_data']]),
+                                 ', '.join(['c.{0} AS c_{0}'.format(column) for column in self.columns['validation_command']])))
 
     def create(self):
         try:
@@ -328,6 +326,7 @@ class TestPlanTemplateDB(DB):
                     VALUES
                     (?, ?, ?, ?)''',
                     tuple(L), commit=commit)
+        self.clear_command_maps()
         return self.c.lastrowid
 
     def add_data_entry(self, data_entity, commit=True):
@@ -359,6 +358,7 @@ class TestPlanTemplateDB(DB):
                     (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
                     tuple(L),
                     commit=commit)
+        self.clear_command_maps()
         return self.c.lastrowid
 
     def get_table_entity(self, table, **kwargs):
@@ -394,6 +394,7 @@ class TestPlanTemplateDB(DB):
         T = (expiration, vd_id)
         self.execute('UPDATE validation_data SET expiration=? WHERE vd_id=?',
                      T, commit=commit)
+        self.clear_command_maps()
 
     def get_commands_by_program(self, program):
         """Returns a list of validation_command entities for the given program"""
@@ -423,6 +424,57 @@ class TestPlanTemplateDB(DB):
             entity = self.get_table_entity(table, **d)
         return entity
 
+    def get_db_stamp(self):
+        """Returns the (modification time, size) of the database file"""
+        try:
+            stat = os.stat(self.dbpath)
+        except OSError:
+            return None
+        return (stat.st_mtime, stat.st_size)
+
+    def clear_command_maps(self):
+        """Drops the command maps after a change made through this connection"""
+        with TestPlanTemplateDB.command_maps_lock:
+            TestPlanTemplateDB.command_maps.clear()
+
+    def get_command_map(self, program):
+        """
+        Returns a dictionary of {uwts_name : {'data' : data, 'command' : command}}
+        for the given program, read with a single join of validation_data and
+        validation_command. The map is memoized per program.
+        """
+        key = (os.path.abspath(self.dbpath), program)
+        stamp = self.get_db_stamp()
+        with TestPlanTemplateDB.command_maps_lock:
+            cached = TestPlanTemplateDB.command_maps.get(key)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+
+        data_columns = self.columns['validation_data']
+        command_columns = self.columns['validation_command']
+        command_dict = {}
+        self.execute(self.command_map_sql, (program,))
+        for row in self.c.fetchall():
+            data_entity = ValidationGeneric('validation_data', data_columns,
+                                            **dict((column, row[column]) for column in data_columns))
+            if row['c_vc_id'] is None:
+                print('No validation command found for {0}'.format(data_entity.get('uwts_name')))
+                continue
+            command_entity = ValidationGeneric('validation_command', command_columns,
+                                               **dict((column, row['c_' + column]) for column in command_columns))
+            uwts_name = data_entity.get('uwts_name')
+            data_command_dict = {'data' : data_entity, 'command' : command_entity}
+            t = command_dict.setdefault(uwts_name, data_command_dict)
+            if t['command'] != command_entity:
+                #There can be only one. Choose the one with a > expiration
+                if data_entity.get('expiration') > t['data'].get('expiration'):
+                    command_dict[uwts_name] = data_command_dict
+                    print('Newer expiration found for {0}'.format(data_entity.get('uwts_name')))
+
+        with TestPlanTemplateDB.command_maps_lock:
+            TestPlanTemplateDB.command_maps[key] = (stamp, command_dict)
+        return command_dict
+
     def get_data_by_program(self, program):
         """Returns a list of validation_data entities for the given program"""
         table = 'validation_data'
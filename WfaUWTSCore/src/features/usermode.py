@@ -22,7 +22,7 @@ from __future__ import print_function
 from __future__ import division
 import logging
 from dbaccess import settingsdb
-from dbaccess.usermodedb import UserModeService
+from dbaccess.usermodedb import UserModeService, lookup_feature
 
 class UserMode(object):
     """
@@ -46,6 +46,7 @@ class UserMode(object):
             ssdao = ss.get_settingsDAO()
             newsetting = settingsdb.Settings(key='default_user_mode', value=mode)
             ssdao.upsert_setting(newsetting)
+            umdao.refresh_permissions()
 
     def get_default_mode(self):
         """
@@ -115,7 +116,9 @@ class UserMode(object):
         Checks to see if the given feature is true or false for the current 
         user mode
         """
-        with UserModeService() as ums:
-            umdao = ums.get_usermodeDAO()
-            result = umdao.check_feature(feat)
+        result = lookup_feature(feat)
+        if result is None:
+            with UserModeService() as ums:
+                umdao = ums.get_usermodeDAO()
+                result = umdao.check_feature(feat)
         return result
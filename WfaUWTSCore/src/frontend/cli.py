@@ -44,6 +44,9 @@ logging.basicConfig(level=logging.DEBUG,
                     format='%(name)s: %(message)s',
                     )
 
+# the group scheduler starts its bench workers on their own ports
+CLI_SERVER_PORT = int(os.environ.get("WTS_CLI_PORT", "8559"))
+
 
 class FrontendQueueMsg:
     def __init__(self, dst, src, msgId, msgType, message ):
@@ -107,7 +110,7 @@ class FrontendCliServer(threading.Thread):
     TEST_EXECUTION = "TestExec"
     REQUEST = "Req"
     RESPONSE = "Resp"
-    def __init__(self, name = 'FCtcpserver', num_client = 4, server_port = 8559):
+    def __init__(self, name = 'FCtcpserver', num_client = 4, server_port = CLI_SERVER_PORT):
         threading.Thread.__init__(self, name = name)
         self._start_event =  threading.Event()
         self._stop_event =  threading.Event()
@@ -179,11 +182,14 @@ class FrontendCliServer(threading.Thread):
                 tcid = ""
                 group_run = False
                 group_file = ""
+                bench_file = ""
                 if val[0] == "group":
                     group_run = True
                     group_file = val[1]
                     if len(val) > 2 and val[2] == "Val" :
                         testcase_val = True
+                    elif len(val) > 2:
+                        bench_file = val[2]
                 elif val[0] != "Val":
                     tcid = val[0]
                     group_run = False
@@ -205,6 +211,7 @@ class FrontendCliServer(threading.Thread):
                 try:
                     self._type = FrontendCliServer.REQUEST
                     Q_message = self.get_test_item_object(prog, tcid, group_run, group_file, testbed_val, testcase_val, None)
+                    Q_message.cmd.bench_file_name = bench_file
                     GlobalConfigFiles.usr_req_que.enqueue(Q_message)
                     self._cmdCatlist.append(FrontendCliServer.TEST_EXECUTION)
                 except Exception as e:
@@ -391,7 +398,7 @@ class FrontendCliServer(threading.Thread):
             #print "TestExec command received"
             test_exec_cmd = msg_string.split()
             if test_exec_cmd[2] == "group":
-                self.Cli_to_Flctl_req(test_exec_cmd[1], [test_exec_cmd[2], test_exec_cmd[3]])
+                self.Cli_to_Flctl_req(test_exec_cmd[1], test_exec_cmd[2:5])
             else:
                 self.Cli_to_Flctl_req(test_exec_cmd[1], [test_exec_cmd[2]])
             supported_cmd = True
@@ -465,7 +472,7 @@ class FrontendCli(argparse.ArgumentParser):
         else:
             self.prog_name =[]
 
-        self.server_port = 8559
+        self.server_port = CLI_SERVER_PORT
         self.parser = argparse.ArgumentParser(prog='WTS ',formatter_class=argparse.RawTextHelpFormatter )
         self.cmd_list = CmdList()
         self.testProgName = ""
@@ -586,12 +593,13 @@ class FrontendCli(argparse.ArgumentParser):
         else:
             prog_name_str = "<Prog name>"
             
-        legacy_cli_help_str = "\n\t USAGE : wts <Program Name> <Test ID> \n          OR wts <Program Name> group <group file name> \
+        legacy_cli_help_str = "\n\t USAGE : wts <Program Name> <Test ID> \n          OR wts <Program Name> group <group file name> [<bench file name>] \
             \n\t [1] Program Name :" \
             + prog_name_str + \
             "\n\n\t [2] Test ID : Test case ID for that program            OR\
             \n\n\t [2] group : group if running group of test cases followed by group file name\
             \n\n\t [3] group file name: Group file name which contains list of test cases\
+            \n\n\t [4] bench file name: Optional file of <bench name>,<WTS src folder> lines to run the group on several benches in parallel\
             \n\n\t\t For example, To run test P2P-4.1.1 of P2P(Wi-Fi Direct) program,\
             \n\t\t    wts P2P P2P-4.1.1        OR\
             \n\n\t\t For example, To run group of P2P test cases listed in file L1.txt\
@@ -607,7 +615,7 @@ class FrontendCli(argparse.ArgumentParser):
 
     def fec_legacy_cli(self, argv):
         nargs = len(argv)
-        if (nargs < 2) or (  2 >= nargs < 3 and ( argv[1] == 'group'  or argv[1] == 'qual') ) or (nargs >= 4):
+        if (nargs < 2) or (  2 >= nargs < 3 and ( argv[1] == 'group'  or argv[1] == 'qual') ) or (nargs >= 5) or (nargs == 4 and argv[1] != 'group'):
             if (nargs >= 4):
                 print "ERROR More number of Argument in Legacy CLi : " + str(nargs) 
             help_string = self.fec_legacy_cli_help()
@@ -630,7 +638,7 @@ class FrontendCli(argparse.ArgumentParser):
 
     def handle_cli_cmd(self, argv):
         HOST = '127.0.0.1'    # The remote host
-        PORT = 8559              # The same port as used by the server
+        PORT = CLI_SERVER_PORT   # The same port as used by the server
         msg =""
         if (len(sys.argv) >= 1):
             msg = "uwts.exe "
@@ -0,0 +1,239 @@
+###############################################################################
+#
+# Copyright (c) 2016 Wi-Fi Alliance
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER
+# RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT,
+# NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE
+# USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+###############################################################################
+
+#!/usr/bin/env python
+
+"""
+Persistent CAPI control agent connections
+"""
+
+import socket
+import logging
+import threading
+from select import select
+
+from netcomm.netsocket import NetCommClient, NetCommServer, NetCommLineReader
+
+
+class CapiConnectionPool(object):
+    """The class that keeps one live TCP connection per control agent.
+
+    A pooled connection is reused as long as it passes a cheap non-blocking
+    liveness probe, and is only re-established after it has actually failed.
+    Data pending on a connection nobody is reading from, e.g. the late reply of
+    a command which timed out, is drained before the connection is reused, so
+    that it is not taken as the reply of the next command.
+
+    Attributes:
+        clients (dictionary): The NetCommClient objects keyed by "ip:port".
+        readers (dictionary): The NetCommLineReader objects keyed by "ip:port".
+        sock_ipport (dictionary): The "ip:port" strings keyed by socket object.
+        hits (int): The number of requests served by an existing connection.
+        misses (int): The number of requests that opened a new connection.
+        reconnects (int): The number of failed connections that were re-established.
+        lock (object): The lock protecting the pool.
+
+    """
+    def __init__(self):
+        self.clients = {}
+        self.readers = {}
+        self.sock_ipport = {}
+        self.hits = 0
+        self.misses = 0
+        self.reconnects = 0
+        self.lock = threading.RLock()
+
+
+    def get_client(self, ipaddr, port, drain=True):
+        """Gets a connected client for the control agent, connecting if required.
+
+        Args:
+            ipaddr (str): The control agent IP address.
+            port (str): The control agent port number.
+            drain (bool): Whether to discard the data pending on a pooled connection,
+                          False while the response dispatcher reads from it.
+
+        Returns None if the control agent cannot be reached.
+        """
+        ipport = "%s:%s" % (ipaddr, port)
+        with self.lock:
+            client = self.clients.get(ipport)
+            if client is not None:
+                if drain:
+                    alive = self.drain_pending(ipport)
+                else:
+                    alive = CapiConnectionPool.is_alive(client.sock)
+                if alive:
+                    self.hits += 1
+                    return client
+                logging.debug("Connection to %s lost, reconnecting", ipport)
+                self.release(ipport)
+                self.reconnects += 1
+            else:
+                self.misses += 1
+
+            client = NetCommClient(socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                client.networkClientSockKeepAlive()
+            except Exception:
+                logging.debug("Unable to set keepalive option for %s", ipport)
+
+            if not client.networkClientSockConnect(ipaddr, port):
+                client.networkClientSockClose()
+                return None
+
+            self.clients[ipport] = client
+            self.readers[ipport] = NetCommLineReader(client.sock)
+            self.sock_ipport[client.sock] = ipport
+            NetCommServer.conntable[ipport] = client.sock
+            return client
+
+
+    def get_reader(self, ipport):
+        """Gets the line reader of the pooled connection.
+
+        Args:
+            ipport (str): The control agent "ip:port" string.
+        """
+        return self.readers.get(ipport)
+
+
+    def get_ipport_by_sock(self, sock):
+        """Gets the control agent "ip:port" string of a pooled socket.
+
+        Args:
+            sock (object): The pooled socket.
+        """
+        return self.sock_ipport.get(sock)
+
+
+    def release(self, ipport):
+        """Closes the pooled connection of the control agent and forgets it.
+
+        Args:
+            ipport (str): The control agent "ip:port" string.
+        """
+        with self.lock:
+            client = self.clients.pop(ipport, None)
+            self.readers.pop(ipport, None)
+            NetCommServer.conntable.pop(ipport, None)
+            if client is None:
+                return
+
+            self.sock_ipport.pop(client.sock, None)
+
+            if client.sock in NetCommServer.SOCK_READABLE:
+                NetCommServer.SOCK_READABLE.remove(client.sock)
+            if client.sock in NetCommServer.SOCK_WAIT:
+                NetCommServer.SOCK_WAIT.remove(client.sock)
+            try:
+                # wakes up a thread still blocked receiving on the connection
+                client.sock.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+            try:
+                client.networkClientSockClose()
+            except Exception:
+                pass
+
+
+    def release_all(self):
+        """Closes all pooled connections.
+        """
+        with self.lock:
+            for ipport in self.clients.keys():
+                self.release(ipport)
+
+
+    def drain_pending(self, ipport):
+        """Discards the data already received on the pooled connection without blocking.
+
+        The discarded lines are logged, since they are replies nobody waited for.
+
+        Args:
+            ipport (str): The control agent "ip:port" string.
+
+        Returns False if the connection has failed or was closed by the peer.
+        """
+        client = self.clients.get(ipport)
+        reader = self.readers.get(ipport)
+        if client is None or reader is None:
+            return False
+
+        while True:
+            try:
+                readable, writable, errored = select([client.sock], [], [client.sock], 0)
+            except (socket.error, ValueError):
+                return False
+            if errored:
+                return False
+            if not readable:
+                break
+            try:
+                if not reader.fill():
+                    return False
+            except socket.error:
+                return False
+
+        stale_lines = reader.drain_lines()
+        if reader.buf:
+            stale_lines.append(reader.buf)
+            reader.buf = ''
+        for line in stale_lines:
+            logging.info("Discarding stale reply from %s: %s" % (ipport, line))
+        return True
+
+
+    @staticmethod
+    def is_alive(sock):
+        """Checks if the socket is still connected without blocking.
+
+        A socket that is readable but returns no data has been closed by the
+        peer, while pending data means the connection is still usable.
+
+        Args:
+            sock (object): The socket to be checked.
+        """
+        try:
+            readable, writable, errored = select([sock], [], [sock], 0)
+        except (socket.error, ValueError):
+            return False
+
+        if errored:
+            return False
+        if readable:
+            try:
+                data = sock.recv(1, socket.MSG_PEEK)
+            except socket.error:
+                return False
+            return data != ''
+        return True
+
+
+    def get_stats(self):
+        """Gets the pool counters as a dictionary.
+        """
+        return {'hits' : self.hits, 'misses' : self.misses, 'reconnects' : self.reconnects}
+
+
+    def reset_stats(self):
+        """Resets the pool counters.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.reconnects = 0
@@ -0,0 +1,368 @@
+###############################################################################
+#
+# Copyright (c) 2016 Wi-Fi Alliance
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER
+# RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT,
+# NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE
+# USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+###############################################################################
+
+#!/usr/bin/env python
+
+"""
+Event driven dispatcher for CAPI responses
+"""
+
+import socket
+import logging
+import threading
+from Queue import Queue, Empty
+from select import select
+
+
+class CapiReplyWaiter(object):
+    """The class that receives the reply lines of one outstanding CAPI command.
+
+    Attributes:
+        ipport (str): The control agent "ip:port" string.
+        lines (object): The queue of reply lines, None marks a stopped dispatcher.
+
+    """
+    def __init__(self, ipport):
+        self.ipport = ipport
+        self.lines = Queue()
+
+
+    def get_line(self, timeout=None):
+        """Waits for the next reply line.
+
+        Args:
+            timeout (float): The maximum time to wait in seconds.
+
+        Returns None if the dispatcher stopped before a line was received and
+        raises socket.timeout if nothing was received in time.
+        """
+        try:
+            return self.lines.get(True, timeout)
+        except Empty:
+            raise socket.timeout("No reply from %s" % self.ipport)
+
+
+
+class CapiResponseDispatcher(object):
+    """The class that waits on all watched control agent sockets at once.
+
+    The dispatcher blocks in select() until a socket becomes readable, so it
+    uses no CPU while idle. Stream completion lines reporting a stream the
+    listener of the agent expects are routed to that listener, other complete
+    lines go to the reply waiter of the agent if a CAPI command is outstanding,
+    otherwise to the listener as well. Only one dispatch loop runs at a time,
+    stop() waits for the running loop to exit.
+
+    Attributes:
+        conn_pool (object): The CapiConnectionPool object owning the sockets.
+        socks (dictionary): The watched "ip:port" strings keyed by socket object.
+        listeners (dictionary): The line callbacks keyed by "ip:port".
+        waiters (dictionary): The lists of CapiReplyWaiter objects keyed by "ip:port".
+        streams (dictionary): The sets of stream IDs the listener expects keyed by "ip:port".
+        is_started (boolean): The flag to indicate the dispatcher has been started.
+        is_dispatching (boolean): The flag to indicate the dispatch loop is running.
+        generation (int): The number of the current dispatch loop, a loop exits once it changes.
+        loop_thread (object): The thread running the dispatch loop, None if no loop runs.
+        loop_done (object): The event set when the last dispatch loop has exited.
+
+    """
+    JOIN_TIMEOUT = 5
+
+    def __init__(self, conn_pool):
+        self.conn_pool = conn_pool
+        self.socks = {}
+        self.listeners = {}
+        self.waiters = {}
+        self.streams = {}
+        self.is_started = False
+        self.is_dispatching = False
+        self.generation = 0
+        self.loop_thread = None
+        self.loop_done = threading.Event()
+        self.loop_done.set()
+        self.lock = threading.RLock()
+
+        # loopback datagram socket used to interrupt select() portably
+        self.wakeup_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.wakeup_sock.bind(('127.0.0.1', 0))
+        self.wakeup_sock.setblocking(0)
+        self.wakeup_addr = self.wakeup_sock.getsockname()
+
+
+    def wakeup(self):
+        """Interrupts the select() call so that changes take effect immediately.
+        """
+        try:
+            self.wakeup_sock.sendto('x', self.wakeup_addr)
+        except socket.error:
+            pass
+
+
+    def watch(self, ipport, listener=None):
+        """Starts dispatching lines received from the pooled connection of an agent.
+
+        Args:
+            ipport (str): The control agent "ip:port" string.
+            listener (function): The callback called with (ipport, line).
+        """
+        client = self.conn_pool.clients.get(ipport)
+        if client is None:
+            return False
+
+        with self.lock:
+            for sock, watched in self.socks.items():
+                if watched == ipport and sock is not client.sock:
+                    del self.socks[sock]
+            self.socks[client.sock] = ipport
+            if listener is not None:
+                self.listeners[ipport] = listener
+        self.wakeup()
+        return True
+
+
+    def watch_all(self, listener=None):
+        """Watches every connection currently held by the pool.
+
+        Args:
+            listener (function): The callback called with (ipport, line).
+        """
+        for ipport in self.conn_pool.clients.keys():
+            self.watch(ipport, listener)
+
+
+    def unwatch(self, ipport):
+        """Stops dispatching lines of an agent and releases its waiters.
+
+        Args:
+            ipport (str): The control agent "ip:port" string.
+        """
+        with self.lock:
+            for sock, watched in self.socks.items():
+                if watched == ipport:
+                    del self.socks[sock]
+            self.listeners.pop(ipport, None)
+            self.streams.pop(ipport, None)
+            for waiter in self.waiters.pop(ipport, []):
+                waiter.lines.put(None)
+        self.wakeup()
+
+
+    def is_watching(self, ipport):
+        """Checks if lines of the agent are currently consumed by the dispatcher.
+
+        Args:
+            ipport (str): The control agent "ip:port" string.
+        """
+        with self.lock:
+            return self.is_dispatching and ipport in self.socks.values()
+
+
+    def expect_reply(self, ipport):
+        """Registers a waiter for the reply of a CAPI command about to be sent.
+
+        Args:
+            ipport (str): The control agent "ip:port" string.
+        """
+        waiter = CapiReplyWaiter(ipport)
+        with self.lock:
+            self.waiters.setdefault(ipport, []).append(waiter)
+        return waiter
+
+
+    def expect_stream(self, ipport, stream_id):
+        """Registers a stream whose completion line is to be routed to the listener.
+
+        Args:
+            ipport (str): The control agent "ip:port" string.
+            stream_id (str): The stream ID.
+        """
+        with self.lock:
+            self.streams.setdefault(ipport, set()).add(stream_id)
+
+
+    def release_reply(self, waiter):
+        """Unregisters a reply waiter once its command has completed.
+
+        Args:
+            waiter (object): The CapiReplyWaiter object.
+        """
+        with self.lock:
+            waiters = self.waiters.get(waiter.ipport, [])
+            if waiter in waiters:
+                waiters.remove(waiter)
+
+
+    def is_stream_line(self, ipport, line):
+        """Checks if the line reports the completion of a stream the listener expects.
+
+        A completion line carries the frame counters after the stream IDs, unlike
+        the reply of e.g. traffic_agent_config. The reported streams are no longer
+        expected afterwards.
+
+        Args:
+            ipport (str): The control agent "ip:port" string.
+            line (str): The received line.
+        """
+        expected = self.streams.get(ipport)
+        if not expected:
+            return False
+        fields = line.split(',')
+        if len(fields) <= 4 or fields[2] != 'streamID':
+            return False
+        stream_ids = set(fields[3].split())
+        if not (stream_ids & expected):
+            return False
+        expected.difference_update(stream_ids)
+        return True
+
+
+    def dispatch(self, ipport, line):
+        """Routes a complete line to the listener or to the oldest reply waiter.
+
+        Args:
+            ipport (str): The control agent "ip:port" string.
+            line (str): The received line.
+        """
+        with self.lock:
+            waiters = self.waiters.get(ipport)
+            listener = self.listeners.get(ipport)
+            if listener is not None and self.is_stream_line(ipport, line):
+                waiters = None
+            if waiters:
+                waiters[0].lines.put(line)
+                return
+        if listener is not None:
+            listener(ipport, line)
+
+
+    def start(self):
+        """Marks the dispatcher as started, run() must be called afterwards.
+        """
+        with self.lock:
+            self.is_started = True
+
+
+    def run(self):
+        """Runs the dispatch loop until stop() is called.
+
+        Returns at once if the dispatcher was not started or a loop is already running.
+        """
+        with self.lock:
+            if not self.is_started or self.loop_thread is not None:
+                return
+            self.generation += 1
+            generation = self.generation
+            self.is_dispatching = True
+            self.loop_thread = threading.currentThread()
+            self.loop_done = threading.Event()
+            loop_done = self.loop_done
+        logging.debug("CAPI response dispatcher started")
+
+        try:
+            self.dispatch_loop(generation)
+        finally:
+            with self.lock:
+                if self.loop_thread is threading.currentThread():
+                    self.loop_thread = None
+            loop_done.set()
+            logging.debug("CAPI response dispatcher stopped")
+
+
+    def dispatch_loop(self, generation):
+        """Waits for readable sockets and dispatches their lines while the loop is current.
+
+        Args:
+            generation (int): The number of the loop.
+        """
+        while True:
+            with self.lock:
+                if not self.is_dispatching or self.generation != generation:
+                    break
+                rlist = self.socks.keys()
+            rlist.append(self.wakeup_sock)
+
+            try:
+                readables, writeables, exceptions = select(rlist, [], [])
+            except (socket.error, ValueError):
+                # a watched socket got closed, drop it and carry on
+                with self.lock:
+                    for sock in self.socks.keys():
+                        if sock not in self.conn_pool.sock_ipport:
+                            del self.socks[sock]
+                continue
+
+            for sock in readables:
+                if sock is self.wakeup_sock:
+                    try:
+                        while True:
+                            self.wakeup_sock.recv(64)
+                    except socket.error:
+                        pass
+                    continue
+
+                with self.lock:
+                    if self.generation != generation:
+                        return
+                    ipport = self.socks.get(sock)
+                reader = self.conn_pool.get_reader(ipport)
+                if reader is None:
+                    self.unwatch(ipport)
+                    continue
+
+                try:
+                    if not reader.fill():
+                        logging.debug("Connection to %s closed by the control agent" % ipport)
+                        self.unwatch(ipport)
+                        self.conn_pool.release(ipport)
+                        continue
+                except socket.error:
+                    continue
+
+                for line in reader.drain_lines():
+                    self.dispatch(ipport, line)
+
+
+    def stop(self):
+        """Stops the dispatch loop and hands pending waiters back to their callers.
+
+        Waits for the running loop to exit, unless called from the loop itself,
+        so that a loop started afterwards never runs alongside it.
+
+        Returns False if the running loop did not exit in time.
+        """
+        with self.lock:
+            self.is_started = False
+            self.is_dispatching = False
+            self.generation += 1
+            for waiters in self.waiters.values():
+                for waiter in waiters:
+                    waiter.lines.put(None)
+            self.waiters = {}
+            self.listeners = {}
+            self.streams = {}
+            self.socks = {}
+            loop_thread = self.loop_thread
+            loop_done = self.loop_done
+            self.loop_thread = None
+        self.wakeup()
+
+        if loop_thread is not None and loop_thread is not threading.currentThread():
+            if not loop_done.wait(CapiResponseDispatcher.JOIN_TIMEOUT):
+                logging.debug("CAPI response dispatcher loop did not exit within %s seconds" % CapiResponseDispatcher.JOIN_TIMEOUT)
+                return False
+        return True
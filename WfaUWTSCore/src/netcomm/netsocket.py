@@ -21,6 +21,8 @@ Network communication APIs
 """
 
 import socket
+import threading
+from collections import deque
 from select import select
 import logging
 
@@ -71,6 +73,15 @@ class NetCommServer(object):
             raise Exception("Network socket error - ", err_num, ": ", err_msg)
             #print "Network socket error - ", err_num, ": ", err_msg
 
+    def networkSockKeepAlive(self):
+        """
+        Set network socket keepalive option
+        """
+        try:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        except socket.error, (err_num, err_msg):
+            raise Exception("Network socket error - ", err_num, ": ", err_msg)
+
     def networkSockBlocking(self, sock_blocking):
         """
         Use blocking or non-blocking sockets
@@ -261,10 +272,12 @@ class NetCommClient(NetCommServer):
             #logging.info('Connecting to - IP Addr = %s Port = %s', tcp_server_host, tcp_server_port)
             NetCommServer.SOCK_READABLE.append(self.sock)
             NetCommServer.SOCK_WAIT.append(self.sock)
+            return True
             
         except socket.error, (err_num, err_msg):
             logging.error("TCP client socket error - %s: %s", str(err_num), err_msg)
             logging.error("Error connecting to %s:%s", tcp_server_host, tcp_server_port)
+            return False
 
 
     def networkClientSockSelectRecvfrom(self, receive_buffer_size):
@@ -312,8 +325,95 @@ class NetCommClient(NetCommServer):
         """
         super(NetCommClient, self).networkSockClose()
 
+    def networkClientSockKeepAlive(self):
+        """
+        Set network socket keepalive option
+        """
+        super(NetCommClient, self).networkSockKeepAlive()
+
     def networkClientSockTimeout(self, timeout):
         """
         Set specific network socket timeout
         """
         super(NetCommClient, self).networkSockTimeout(timeout)
+
+
+class NetCommLineReader(object):
+
+    """
+    Buffered reader that splits a TCP byte stream into response lines.
+    Data is received in large chunks and complete lines ("\n", "\r\n" or
+    "\n\r" terminated) are queued in arrival order; a partial line stays
+    buffered until the rest of it is received.
+    """
+    def __init__(self, sock, receive_buffer_size=4096):
+        self.sock = sock
+        self.receive_buffer_size = receive_buffer_size
+        self.buf = ''
+        self.lines = deque()
+        self.lock = threading.RLock()
+
+    def feed(self, data):
+        """
+        Append received data and queue every complete line
+        """
+        with self.lock:
+            parts = (self.buf + data).split('\n')
+            self.buf = parts.pop()
+            for part in parts:
+                line = part.strip('\r')
+                if not line.strip():
+                    continue
+                # RUNNING and COMPLETE sent back to back without a line break
+                pos = line.find('status,', 1)
+                while line.startswith('status,RUNNING') and pos > 0:
+                    self.lines.append(line[:pos].rstrip())
+                    line = line[pos:]
+                    pos = line.find('status,', 1)
+                self.lines.append(line)
+
+    def fill(self):
+        """
+        Receive one chunk from the socket, returns False if the peer closed the connection
+        """
+        with self.lock:
+            data = self.sock.recv(self.receive_buffer_size)
+            if not data:
+                return False
+            self.feed(data)
+            return True
+
+    def has_line(self):
+        """
+        Check if a complete line is queued
+        """
+        return len(self.lines) > 0
+
+    def pop_line(self):
+        """
+        Dequeue the oldest complete line, None if there is no complete line
+        """
+        with self.lock:
+            if self.lines:
+                return self.lines.popleft()
+            return None
+
+    def drain_lines(self):
+        """
+        Dequeue all complete lines already received without blocking
+        """
+        with self.lock:
+            lines = list(self.lines)
+            self.lines.clear()
+            return lines
+
+    def read_line(self):
+        """
+        Read the next complete line, receiving from the socket as needed.
+        Returns an empty string if the peer closed the connection.
+        """
+        with self.lock:
+            while not self.lines:
+                if not self.fill():
+                    return ''
+            return self.lines.popleft()
@@ -0,0 +1,352 @@
+###############################################################################
+#
+# Copyright (c) 2016 Wi-Fi Alliance
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER
+# RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT,
+# NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE
+# USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+###############################################################################
+
+#!/usr/bin/env python
+
+"""
+Process-wide index of the MasterTestInfo XML file
+"""
+
+import os
+import threading
+from xml.parsers import expat
+
+
+class MasterTestInfoRecord(object):
+    """The class that holds what the test harness reads of one test case element.
+
+    Attributes:
+        tc_name (str): The test case ID, i.e. the element tag.
+        entries (list): The (tag, text) pairs of the subtree in document order, as stored on the sll.
+        values (dictionary): The first text node of the last element of each tag, as read by the TMS lookups.
+        value_order (dictionary): The document order index of the element each value was taken from.
+
+    """
+    def __init__(self, tc_name):
+        self.tc_name = tc_name
+        self.entries = []
+        self.values = {}
+        self.value_order = {}
+
+
+    def set_value(self, tag, text, order):
+        """Keeps the text of the element of the tag coming last in document order.
+
+        Args:
+            tag (str): The tag name.
+            text (str): The first text node of the element.
+            order (int): The document order index of the element.
+        """
+        if order >= self.value_order.get(tag, -1):
+            self.values[tag] = text
+            self.value_order[tag] = order
+
+
+
+class MasterTestInfoStop(Exception):
+    """The exception raised from the expat handlers to stop reading the file.
+    """
+
+
+
+class MasterTestInfoReader(object):
+    """The class that streams the MasterTestInfo file with expat up to the end of one test case.
+
+    Only the subtree of the test case is recorded, following the node model of
+    the DOM the file used to be read into: a comment, processing instruction or
+    non-empty CDATA section is a child node of its own, and a run of character
+    data between them is a single text node. An element is recorded if it has
+    any child node, and its value is the first child if that is a text node,
+    an empty string otherwise.
+
+    Attributes:
+        tc_name (str): The test case ID, None to read the root element name only.
+        root_name (str): The root element name.
+        record (object): The MasterTestInfoRecord object, None until the test case is found.
+        depth (int): The element depth of the parser position.
+        stack (list): The open elements of the test case subtree, the test case element first.
+        order (int): The number of elements of the test case subtree started so far.
+        cdata (list): The text of the CDATA section being read, None outside CDATA sections.
+
+    """
+    READ_SIZE = 65536
+
+    def __init__(self, tc_name):
+        self.tc_name = tc_name
+        self.root_name = None
+        self.record = None
+        self.depth = 0
+        self.stack = []
+        self.order = 0
+        self.cdata = None
+
+
+    def read(self, file_path):
+        """Reads the file until the end of the test case element.
+
+        Args:
+            file_path (str): The MasterTestInfo file path.
+
+        Returns the MasterTestInfoRecord object, None if the test case is not found.
+        """
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = self.start_element
+        parser.EndElementHandler = self.end_element
+        parser.CharacterDataHandler = self.character_data
+        parser.CommentHandler = self.comment
+        parser.ProcessingInstructionHandler = self.processing_instruction
+        parser.StartCdataSectionHandler = self.start_cdata
+        parser.EndCdataSectionHandler = self.end_cdata
+
+        xml_file = open(file_path, 'rb')
+        try:
+            while True:
+                data = xml_file.read(MasterTestInfoReader.READ_SIZE)
+                parser.Parse(data, data == '')
+                if data == '':
+                    break
+        except MasterTestInfoStop:
+            pass
+        finally:
+            xml_file.close()
+        return self.record
+
+
+    def add_child(self, kind):
+        """Records a child node of the innermost open element, ending its text node.
+
+        Args:
+            kind (str): The node kind, i.e. element, text, comment, pi or cdata.
+        """
+        frame = self.stack[-1]
+        self.end_text(frame)
+        if frame['first_kind'] is None:
+            frame['first_kind'] = kind
+
+
+    def end_text(self, frame):
+        """Ends the text node being read in the element, if any.
+
+        Args:
+            frame (dictionary): The open element.
+        """
+        if frame['text'] is None:
+            return
+        text = ''.join(frame['text'])
+        frame['text'] = None
+        if frame['first_text'] is None:
+            frame['first_text'] = text
+        if frame['first_kind'] == 'text' and frame['value'] is None:
+            frame['value'] = text
+
+
+    def start_element(self, tag, attrs):
+        """Starts an element, the test case subtree is recorded from its start tag on.
+        """
+        self.depth += 1
+        if self.depth == 1:
+            self.root_name = tag
+            if self.tc_name is None:
+                raise MasterTestInfoStop()
+            return
+
+        if self.stack:
+            self.add_child('element')
+            self.record.entries.append((tag, ""))
+        elif self.depth == 2 and tag == self.tc_name:
+            self.record = MasterTestInfoRecord(tag)
+        else:
+            return
+        self.stack.append({'tag' : tag, 'order' : self.order, 'entry' : len(self.record.entries) - 1,
+                           'first_kind' : None, 'value' : None, 'first_text' : None, 'text' : None})
+        self.order += 1
+
+
+    def end_element(self, tag):
+        """Ends an element and records its entry and value.
+        """
+        self.depth -= 1
+        if not self.stack:
+            return
+
+        frame = self.stack.pop()
+        self.end_text(frame)
+        if not self.stack:
+            # end of the test case element
+            raise MasterTestInfoStop()
+
+        if frame['first_kind'] is None:
+            # an element without child nodes is the last entry recorded
+            self.record.entries.pop()
+        elif frame['first_kind'] == 'text':
+            self.record.entries[frame['entry']] = (tag, frame['value'])
+        if frame['first_text'] is not None:
+            self.record.set_value(tag, frame['first_text'], frame['order'])
+
+
+    def character_data(self, data):
+        """Adds character data to the current text node or CDATA section.
+        """
+        if not self.stack:
+            return
+        if self.cdata is not None:
+            self.cdata.append(data)
+            return
+        frame = self.stack[-1]
+        if frame['text'] is None:
+            self.add_child('text')
+            frame['text'] = []
+        frame['text'].append(data)
+
+
+    def comment(self, data):
+        """Records a comment node.
+        """
+        if self.stack:
+            self.add_child('comment')
+
+
+    def processing_instruction(self, target, data):
+        """Records a processing instruction node.
+        """
+        if self.stack:
+            self.add_child('pi')
+
+
+    def start_cdata(self):
+        """Starts collecting the text of a CDATA section.
+        """
+        if self.stack:
+            self.cdata = []
+
+
+    def end_cdata(self):
+        """Records a CDATA section node unless it is empty.
+        """
+        if self.cdata is None:
+            return
+        text = ''.join(self.cdata)
+        self.cdata = None
+        if text != '':
+            self.add_child('cdata')
+
+
+
+class MasterTestInfoIndex(object):
+    """The class that indexes the MasterTestInfo file by test case ID and tag.
+
+    A test case is read on its first lookup with a MasterTestInfoReader. The
+    read stops at the end of the test case element, and nothing is kept of the
+    test cases passed on the way, so the memory and time of a lookup do not
+    grow with the size of the whole test plan. The records are kept until the
+    modification time or size of the file changes. The TMS lookups and the XML
+    file parser share the index, so a test case is read at most once.
+
+    Attributes:
+        indexes (dictionary): The MasterTestInfoIndex objects keyed by file path.
+        lock (object): The lock protecting the indexes and the records.
+        file_path (str): The MasterTestInfo file path.
+        stamp (tuple): The (modification time, size) of the indexed file.
+        root_name (str): The root element name, None until the file is read.
+        records (dictionary): The MasterTestInfoRecord objects keyed by test case ID.
+
+    """
+    indexes = {}
+    lock = threading.RLock()
+
+    def __init__(self, file_path, stamp):
+        self.file_path = file_path
+        self.stamp = stamp
+        self.root_name = None
+        self.records = {}
+
+
+    @staticmethod
+    def get_file_stamp(file_path):
+        """Gets the (modification time, size) of the file.
+
+        Args:
+            file_path (str): The file path.
+        """
+        stat = os.stat(file_path)
+        return (stat.st_mtime, stat.st_size)
+
+
+    @staticmethod
+    def get_index(file_path):
+        """Gets the index of the file, the records are dropped if the file was changed.
+
+        Args:
+            file_path (str): The MasterTestInfo file path.
+        """
+        stamp = MasterTestInfoIndex.get_file_stamp(file_path)
+        with MasterTestInfoIndex.lock:
+            index = MasterTestInfoIndex.indexes.get(file_path)
+            if index is None or index.stamp != stamp:
+                index = MasterTestInfoIndex(file_path, stamp)
+                MasterTestInfoIndex.indexes[file_path] = index
+            return index
+
+
+    def load_test_case(self, tc_name):
+        """Streams the file up to the end of the test case element, i.e. a child of the root.
+
+        Args:
+            tc_name (str): The test case ID, None to read the root element name only.
+
+        Returns the MasterTestInfoRecord object, None if the test case is not found.
+        """
+        reader = MasterTestInfoReader(tc_name)
+        record = reader.read(self.file_path)
+        self.root_name = reader.root_name
+        return record
+
+
+    def get_root_name(self):
+        """Gets the root element name, only the start of the file is read if required.
+        """
+        with MasterTestInfoIndex.lock:
+            if self.root_name is None:
+                self.load_test_case(None)
+            return self.root_name
+
+
+    def get_record(self, tc_name):
+        """Gets the record of a test case, None if the test case is not found.
+
+        Args:
+            tc_name (str): The test case ID.
+        """
+        with MasterTestInfoIndex.lock:
+            if tc_name not in self.records:
+                self.records[tc_name] = self.load_test_case(tc_name)
+            return self.records[tc_name]
+
+
+    def get_value(self, tc_name, tag):
+        """Gets the value of a tag under the test case element, an empty string if not found.
+
+        Args:
+            tc_name (str): The test case ID.
+            tag (str): The tag name.
+        """
+        record = self.get_record(tc_name)
+        if record is None:
+            return ""
+        return record.values.get(tag, "")
@@ -17,7 +17,9 @@
 ###############################################################################
 
 #!/usr/bin/env python
-﻿
+﻿import re
+
+
 class ElementTypeError(Exception):
     """The summary line for a class docstring should fit on one line.
     """
@@ -1248,6 +1250,47 @@ class TestScriptElementType:
         "^Realtek[^_]*STA\w*": WFA_TESTBEDSTA
     }
 
+    # The scanner classifies every segment against the CAPI command and testbed
+    # device patterns, so they are compiled once. The alternation regexes only
+    # tell if any pattern matches; which device pattern matched first is decided
+    # by the precompiled patterns kept in the dictionary iteration order.
+    capi_command_regex = re.compile("|".join(["(?:%s)" % cmd for cmd in script_capi_commands]), re.I)
+    testbed_device_regex = re.compile("|".join(["(?:%s)" % key for key in script_testbed_devices]), re.I)
+    testbed_device_patterns = [(key, re.compile(key, re.I)) for key in script_testbed_devices]
+
+    # Inverted dictionaries for the value to key lookups. Some values are shared
+    # by several keys, the items are reversed so that the key found first by
+    # iterating the dictionary wins, as with a linear scan.
+    spcl_sym_key_by_val = dict([(v, k) for k, v in reversed(script_special_symbols.items())])
+    resv_word_key_by_val = dict([(v, k) for k, v in reversed(script_reserved_words.items())])
+    test_feat_key_by_val = dict([(v, k) for k, v in reversed(test_feature_key_words.items())])
+    capi_name_by_val = dict([(v, k) for k, v in reversed(script_capi_commands.items())])
+
+
+    @staticmethod
+    def is_capi_command(text):
+        """Checks if the text matches any of the script_capi_commands patterns.
+
+        Args:
+            text (str): The segment text.
+        """
+        return TestScriptElementType.capi_command_regex.search(text) is not None
+
+
+    @staticmethod
+    def search_testbed_device_key(text):
+        """Gets the first script_testbed_devices key whose pattern matches the text, None if no match.
+
+        Args:
+            text (str): The segment text.
+        """
+        if TestScriptElementType.testbed_device_regex.search(text) is None:
+            return None
+        for key, pattern in TestScriptElementType.testbed_device_patterns:
+            if pattern.search(text):
+                return key
+        return None
+
 
     @staticmethod
     def get_spcl_sym_key_from_val(val_name):
@@ -1256,9 +1299,7 @@ class TestScriptElementType:
         Args:
             val_name (str): The entry value.
         """
-        for spcl_sym_item in TestScriptElementType.script_special_symbols:
-            if TestScriptElementType.script_special_symbols[spcl_sym_item] == val_name:
-                return spcl_sym_item
+        return TestScriptElementType.spcl_sym_key_by_val.get(val_name)
 
     @staticmethod
     def get_resv_word_key_from_val(val_name):
@@ -1267,9 +1308,7 @@ class TestScriptElementType:
         Args:
             val_name (str): The entry value.
         """
-        for resv_item in TestScriptElementType.script_reserved_words:
-            if TestScriptElementType.script_reserved_words[resv_item] == val_name:
-                return resv_item
+        return TestScriptElementType.resv_word_key_by_val.get(val_name)
 
 
     @staticmethod
@@ -1279,9 +1318,7 @@ class TestScriptElementType:
         Args:
             val_name (str): The value of entry.
         """
-        for feat_item in TestScriptElementType.test_feature_key_words:
-            if TestScriptElementType.test_feature_key_words[feat_item] == val_name:
-                return feat_item
+        return TestScriptElementType.test_feat_key_by_val.get(val_name)
 
 
     @staticmethod
@@ -1291,9 +1328,7 @@ class TestScriptElementType:
         Args:
             val_name (str): The value of the dictionary entry.
         """
-        for capi_item in TestScriptElementType.script_capi_commands:
-            if TestScriptElementType.script_capi_commands[capi_item] == val_name:
-                return capi_item
+        return TestScriptElementType.capi_name_by_val.get(val_name)
 
 
     @staticmethod
@@ -1306,16 +1341,16 @@ class TestScriptElementType:
         if text.startswith('$'):
             return "VARIABLE"
         
-        elif text in TestScriptElementType.script_special_symbols.keys():
+        elif text in TestScriptElementType.script_special_symbols:
             return TestScriptElementType.script_special_symbols[text]
 
-        elif text in TestScriptElementType.script_reserved_words.keys():
+        elif text in TestScriptElementType.script_reserved_words:
             return TestScriptElementType.script_reserved_words[text]
 
-        elif text in TestScriptElementType.script_capi_commands.keys():
+        elif text in TestScriptElementType.script_capi_commands:
             return TestScriptElementType.script_capi_commands[text]
 
-        elif text in TestScriptElementType.test_feature_key_words.keys():
+        elif text in TestScriptElementType.test_feature_key_words:
             return TestScriptElementType.test_feature_key_words[text]
         # move the STRING type check for <text> to the end to make sure it can be recognized as other types first
         elif isinstance(text, str):
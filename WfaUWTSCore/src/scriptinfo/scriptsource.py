@@ -30,9 +30,73 @@ from util.misc import Util
 from common import GlobalConfigFiles, TestConfigError
 from core.symtable import TestScriptSymbolTable
 from security.filelocker import FileLocker
+from scriptinfo.mastertestinfo import MasterTestInfoIndex
 
 import json
 import logging.config
+import threading
+
+
+class MapFileIndex:
+    """The parsed form of a map file, i.e. a text file of delimited columns.
+
+    Attributes:
+        cache (dictionary): The MapFileIndex objects keyed by (file name, delimiter).
+        lock (object): The lock protecting the cache.
+        stamp (tuple): The (modification time, size) of the parsed file.
+        segments (dictionary): The (line columns, position) of the first occurrence of each column value.
+
+    """
+    cache = {}
+    lock = threading.Lock()
+
+    def __init__(self, file_name, delim, stamp):
+        self.stamp = stamp
+        self.segments = {}
+        with open(file_name, 'r') as file_to_read:
+            for l in file_to_read:
+                line = l.split('#')
+                if line[0] == '':
+                    continue
+
+                line_segs = line[0].split(delim)
+                for pos, seg in enumerate(line_segs):
+                    if seg not in self.segments:
+                        self.segments[seg] = (line_segs, pos)
+
+
+    @staticmethod
+    def get_index(file_name, delim):
+        """Gets the index of the file, it is parsed again if the file was changed.
+
+        Args:
+            file_name (str): The map file.
+            delim (str): The delimiter character.
+        """
+        stat = os.stat(file_name)
+        stamp = (stat.st_mtime, stat.st_size)
+        key = (file_name, delim)
+        with MapFileIndex.lock:
+            index = MapFileIndex.cache.get(key)
+            if index is None or index.stamp != stamp:
+                index = MapFileIndex(file_name, delim, stamp)
+                MapFileIndex.cache[key] = index
+            return index
+
+
+    def lookup(self, pattern, n):
+        """Gets the column n positions after the first occurrence of the pattern.
+
+        Args:
+            pattern (str): The search pattern string.
+            n (int): The search position.
+        """
+        entry = self.segments.get(pattern)
+        if entry is None:
+            return ""
+        line_segs, pos = entry
+        return line_segs[pos+n].strip()
+
 
 
 class TestFileManager:
@@ -121,24 +185,7 @@ class TestFileManager:
             logging.error("File not found -%s- " % file_name)
             return ret_string
 
-        file_to_read = open(file_name, 'r')
-
-        for l in file_to_read.readlines():
-            if not l:
-                break
-
-            line = l.split('#')
-            if line[0] == '':
-                continue
-
-            line_segs = line[0].split(delim)
-
-            if pattern in line_segs:
-                ret_string = line_segs[line_segs.index(pattern)+n].strip()
-                break
-
-        file_to_read.close()
-        return ret_string
+        return MapFileIndex.get_index(file_name, delim).lookup(pattern, n)
 
 
 
@@ -227,12 +274,16 @@ class TestLogFileSource(TestFileSource):
         self.file_path = file_path
 
 
-    def init_logging(self, log_level):
+    def init_logging(self, log_level, which_table=None):
         """Initializes loggers and assign them to corresponding log files.
 
         Args:
             log_level (str): The logging level to be set.
+            which_table (dictionary): The symbol table of the run receiving the log paths, the bound one if None.
         """
+        if which_table is None:
+            which_table = TestScriptSymbolTable.test_script_sym_tab
+
         p = self.file_name.replace(".log", "").split('\\')
         #resultCollectionFile = open("TestResults", "a")
         for s in p:
@@ -243,12 +294,12 @@ class TestLogFileSource(TestFileSource):
         #tmsLogLocation = directory
         os.makedirs(directory)
 
-        TestScriptSymbolTable.insert_sym_tab("$logDir", directory.replace("log/", ""), TestScriptSymbolTable.test_script_sym_tab)
+        TestScriptSymbolTable.insert_sym_tab("$logDir", directory.replace("log/", ""), which_table)
 
         os.system("echo %s > p" % directory)
 
         fname = "%s/log_%s.log" % (directory, t_file_name.rstrip(".txt"))
-        TestScriptSymbolTable.insert_sym_tab("$logFullPath", fname, TestScriptSymbolTable.test_script_sym_tab)
+        TestScriptSymbolTable.insert_sym_tab("$logFullPath", fname, which_table)
 
         fname_sniffer = "%s/sniffer_log_%s.log" % (directory, t_file_name.rstrip(".txt"))
 
@@ -368,6 +419,21 @@ class TestXmlFileSource(TestFileSource):
             raise e
 
 
+    def get_test_info_index(self):
+        """Gets the shared MasterTestInfoIndex object of the xml file.
+        """
+        return MasterTestInfoIndex.get_index(self.xml_file_path + "\\" + self.xml_file_name)
+
+
+    def load_test_case(self, tc_name):
+        """Loads a single test case element without building the DOM tree of the whole file.
+
+        Args:
+            tc_name (str): The test case ID.
+        """
+        return self.get_test_info_index().get_record(tc_name)
+
+
     def get_nodes_by_tag_name(self, tag_name):
         """Gets the node based on the tag name.
 
@@ -18,7 +18,9 @@
 
 #!/usr/bin/env python
 import re
+import time
 import logging
+import threading
 from core.symtable import TestScriptSymbolTable
 from scriptinfo.scriptelement import TestScriptElementType
 
@@ -78,7 +80,11 @@ class DataStreamManager(object):
 
 
 class DataStream(object):
-    """The summary line for a class docstring should fit on one line.
+    """The class that stores the traffic streams and their results of a test case.
+
+    Besides the arrays, which keep the order the streams were reported in, the
+    streams and results are indexed by (streamID, IP address, phase) so that
+    checks do not need to scan the arrays.
 
     Attributes:
         max_throughput (str): The maximum throughput value.
@@ -89,6 +95,13 @@ class DataStream(object):
         streamRecvResultArray (list): A list of receive stream results.
         streamSendResultArray (list): A list of send stream results.
         streamInfoArray (list): A list of stream information.
+        stream_info_index (dictionary): The streamInfo objects keyed by (streamID, IP address, phase).
+        send_result_index (dictionary): The send streamResult objects keyed by (streamID, IP address, phase).
+        recv_result_index (dictionary): The receive streamResult objects keyed by (streamID, IP address, phase).
+        send_results_by_id (dictionary): The lists of send streamResult objects keyed by (streamID, phase).
+        recv_results_by_id (dictionary): The lists of receive streamResult objects keyed by (streamID, phase).
+        pending_results (set): The (streamID, IP address, phase) keys of the results still expected.
+        results_cond (object): The condition notified whenever a result is added.
 
     """
     def __init__(self):
@@ -100,12 +113,174 @@ class DataStream(object):
         self.streamRecvResultArray = []
         self.streamSendResultArray = []
         self.streamInfoArray = []
+        self.stream_info_index = {}
+        self.send_result_index = {}
+        self.recv_result_index = {}
+        self.send_results_by_id = {}
+        self.recv_results_by_id = {}
+        self.pending_results = set()
+        self.results_cond = threading.Condition()
+
+
+    @staticmethod
+    def phase_key(phase):
+        """Normalizes a phase value so that "1" and 1 map to the same index key.
+
+        Args:
+            phase (str): The data transfer phase.
+        """
+        try:
+            return int(phase)
+        except (TypeError, ValueError):
+            return phase
+
+
+    def add_stream_info(self, stream_info):
+        """Adds a stream to the array and the index.
+
+        Args:
+            stream_info (object): The streamInfo object.
+        """
+        self.streamInfoArray.append(stream_info)
+        key = (stream_info.streamID, stream_info.IPAddress, DataStream.phase_key(stream_info.phase))
+        self.stream_info_index.setdefault(key, stream_info)
+
+
+    def get_stream_info(self, streamID, IPAddress, phase):
+        """Gets the stream configured on a traffic agent in a phase, None if not found.
+
+        Args:
+            streamID (str): The stream ID.
+            IPAddress (str): The traffic agent "ip:port" string.
+            phase (str): The data transfer phase.
+        """
+        return self.stream_info_index.get((streamID, IPAddress, DataStream.phase_key(phase)))
+
+
+    def add_send_result(self, result):
+        """Adds the result of a send stream to the array and the index.
+
+        Args:
+            result (object): The streamResult object.
+        """
+        self.streamSendResultArray.append(result)
+        self._index_result(result, self.send_result_index, self.send_results_by_id)
+
+
+    def add_recv_result(self, result):
+        """Adds the result of a receive stream to the array and the index.
+
+        Args:
+            result (object): The streamResult object.
+        """
+        self.streamRecvResultArray.append(result)
+        self._index_result(result, self.recv_result_index, self.recv_results_by_id)
+
+
+    def _index_result(self, result, result_index, results_by_id):
+        phase = DataStream.phase_key(result.phase)
+        result_index[(result.streamID, result.IPAddress, phase)] = result
+        results_by_id.setdefault((result.streamID, phase), []).append(result)
+        with self.results_cond:
+            self.pending_results.discard((result.streamID, result.IPAddress, phase))
+            self.results_cond.notifyAll()
+
+
+    def expect_result(self, streamID, IPAddress, phase):
+        """Registers a stream result which the traffic agent is going to report.
+
+        Args:
+            streamID (str): The stream ID.
+            IPAddress (str): The traffic agent "ip:port" string.
+            phase (str): The data transfer phase.
+        """
+        with self.results_cond:
+            self.pending_results.add((streamID, IPAddress, DataStream.phase_key(phase)))
+
+
+    def drop_pending_results(self):
+        """Forgets the expected results, e.g. once no more responses are dispatched.
+        """
+        with self.results_cond:
+            if self.pending_results:
+                logging.debug("%d expected stream results were not reported" % len(self.pending_results))
+            self.pending_results.clear()
+            self.results_cond.notifyAll()
+
+
+    def wait_results(self, phase=None, timeout=None):
+        """Waits until all expected stream results of a phase have been reported.
+
+        Args:
+            phase (str): The data transfer phase, all phases if None.
+            timeout (float): The maximum time to wait in seconds.
+
+        Returns the number of results still missing when the wait ended.
+        """
+        if phase is not None:
+            phase = DataStream.phase_key(phase)
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+
+        with self.results_cond:
+            while True:
+                missing = len([key for key in self.pending_results if phase is None or key[2] == phase])
+                if missing == 0:
+                    return 0
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return missing
+                self.results_cond.wait(remaining)
+
+
+    def get_send_result(self, streamID, phase, IPAddress=None, first=False):
+        """Gets the last (or first) send stream result, None if not found.
+
+        Args:
+            streamID (str): The stream ID.
+            phase (str): The data transfer phase.
+            IPAddress (str): The traffic agent "ip:port" string, any agent if None.
+            first (bool): Whether to get the first reported result instead of the last one.
+        """
+        return self._get_result(streamID, phase, IPAddress, first, self.send_result_index, self.send_results_by_id)
+
+
+    def get_recv_result(self, streamID, phase, IPAddress=None, first=False):
+        """Gets the last (or first) receive stream result, None if not found.
+
+        Args:
+            streamID (str): The stream ID.
+            phase (str): The data transfer phase.
+            IPAddress (str): The traffic agent "ip:port" string, any agent if None.
+            first (bool): Whether to get the first reported result instead of the last one.
+        """
+        return self._get_result(streamID, phase, IPAddress, first, self.recv_result_index, self.recv_results_by_id)
+
+
+    def _get_result(self, streamID, phase, IPAddress, first, result_index, results_by_id):
+        phase = DataStream.phase_key(phase)
+        if IPAddress is not None and not first:
+            return result_index.get((streamID, IPAddress, phase))
+        results = results_by_id.get((streamID, phase), [])
+        if IPAddress is not None:
+            results = [result for result in results if result.IPAddress == IPAddress]
+        if not results:
+            return None
+        if first:
+            return results[0]
+        return results[-1]
 
 
 
 class streamInfo(object):
     """Returns string in formatted stream info.
     """
+    __slots__ = ('streamID', 'IPAddress', 'pairID', 'direction', 'trafficClass',
+                 'frameRate', 'phase', 'RTPID', 'status', 'completed')
+
     def __init__(self, streamID, IPAddress, pairID, direction,
                  trafficClass, frameRate, phase, RTPID):
         self.streamID = streamID
@@ -117,6 +292,26 @@ class streamInfo(object):
         self.phase = phase
         self.RTPID = RTPID
         self.status = -1
+        self.completed = threading.Event()
+
+
+    def set_complete(self):
+        """Marks the stream as completed and wakes up the waiting threads.
+        """
+        self.status = 1
+        self.completed.set()
+
+
+    def wait_complete(self, timeout=None):
+        """Waits for the stream to complete.
+
+        Args:
+            timeout (float): The maximum time to wait in seconds.
+
+        Returns True if the stream completed, False on timeout.
+        """
+        self.completed.wait(timeout)
+        return self.completed.is_set()
         
 
     def __str__(self):
@@ -126,18 +321,37 @@ class streamInfo(object):
 
 class streamResult(object):
     """Returns string in formatted stream result.
+
+    The frame and byte counters reported by the traffic agent are converted to
+    integers once, a missing or malformed counter is stored as 0.
     """
+    __slots__ = ('streamID', 'IPAddress', 'rxFrames', 'txFrames', 'rxBytes',
+                 'txBytes', 'phase')
+
     def __init__(self, streamID, IPAddress, rxFrames, txFrames, rxBytes,
                  txBytes, phase):
         self.streamID = streamID
         self.IPAddress = IPAddress
-        self.rxFrames = rxFrames
-        self.txFrames = txFrames
-        self.rxBytes = rxBytes
-        self.txBytes = txBytes
+        self.rxFrames = streamResult.to_int(rxFrames)
+        self.txFrames = streamResult.to_int(txFrames)
+        self.rxBytes = streamResult.to_int(rxBytes)
+        self.txBytes = streamResult.to_int(txBytes)
         self.phase = phase
 
 
+    @staticmethod
+    def to_int(value):
+        """Converts a counter reported by the traffic agent to an integer.
+
+        Args:
+            value (str): The counter value.
+        """
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return 0
+
+
     def __str__(self):
         return "%-10s RX   %10s  Bytes   |  TX  %10s   | Stream ID = %s" % (' ', self.rxBytes, self.txBytes, self.streamID)
 
@@ -36,6 +36,7 @@ class TestbedDeviceManager:
         self.prog_name = prog_name
         self.test_mngr_initr = None
         self.num_of_aps_capi = 0
+        self.testbed_dev_index = None
 
     def create_testbed_device_instance(self, dev_name_info, hint):
         """Creates the instance of testbed device specified by the input parameters.
@@ -526,6 +527,127 @@ class TestbedDeviceManager:
 
             curr_node = curr_node.next
 
+        self.testbed_dev_index = TestbedDeviceIndex(self.test_mngr_initr.test_prog_mngr.test_prog.testbed_dev_list)
+
+
+    def get_testbed_dev_index(self):
+        """Gets the index of the testbed device list, building it if the list has changed.
+        """
+        testbed_dev_list = self.test_mngr_initr.test_prog_mngr.test_prog.testbed_dev_list
+        if self.testbed_dev_index is None or not self.testbed_dev_index.is_built_from(testbed_dev_list):
+            self.testbed_dev_index = TestbedDeviceIndex(testbed_dev_list)
+        return self.testbed_dev_index
+
+
+
+class TestbedDeviceIndex:
+    """The class that indexes the testbed devices for the lookups done per executed command.
+
+    Where several devices share a key, the lookups return the same device the
+    former scans over the testbed device list did.
+
+    Attributes:
+        testbed_dev_list (list): The indexed testbed device list.
+        dev_count (int): The number of devices when the index was built.
+        by_alias (dictionary): The lists of devices keyed by alias.
+        ap_by_dev_name (dictionary): The lists of AP devices keyed by device name.
+        by_num_var_name (dictionary): The last device keyed by numVarName.
+        by_ctrl_ipaddr (dictionary): The last device keyed by control IP address.
+        displayname_by_ipport (dictionary): The first display name keyed by control "ip:port".
+        ap_agent (object): The last TestbedAPConfigServer device.
+        ap_agent_port (str): The control port of the first TestbedAPConfigServer device.
+
+    """
+    def __init__(self, testbed_dev_list):
+        self.testbed_dev_list = testbed_dev_list
+        self.dev_count = len(testbed_dev_list)
+        self.by_alias = {}
+        self.ap_by_dev_name = {}
+        self.by_num_var_name = {}
+        self.by_ctrl_ipaddr = {}
+        self.displayname_by_ipport = {}
+        self.ap_agent = None
+        self.ap_agent_port = None
+
+        for pos, tbd in enumerate(testbed_dev_list):
+            self.by_alias.setdefault(tbd.alias, []).append((pos, tbd))
+            if tbd.dev_type == 'AP':
+                self.ap_by_dev_name.setdefault(tbd.dev_name, []).append((pos, tbd))
+            num_var_name = getattr(tbd, 'numVarName', None)
+            if num_var_name is not None:
+                self.by_num_var_name[num_var_name] = tbd
+            self.by_ctrl_ipaddr[tbd.ctrlipaddr] = tbd
+            self.displayname_by_ipport.setdefault("%s:%s" % (tbd.ctrlipaddr, tbd.ctrlport), tbd.displayname)
+            if tbd.alias == 'TestbedAPConfigServer':
+                self.ap_agent = tbd
+                if self.ap_agent_port is None:
+                    self.ap_agent_port = tbd.ctrlport
+
+
+    def is_built_from(self, testbed_dev_list):
+        """Checks if the index is still in line with the testbed device list.
+
+        Args:
+            testbed_dev_list (list): The testbed device list.
+        """
+        return self.testbed_dev_list is testbed_dev_list and self.dev_count == len(testbed_dev_list)
+
+
+    def get_ap_agent_ipport(self):
+        """Gets the control "ip:port" string of the AP config agent, None if there is none.
+        """
+        if self.ap_agent is None:
+            return None
+        return self.ap_agent.ctrlipaddr + ':' + self.ap_agent.ctrlport
+
+
+    def search_device(self, dev_name):
+        """Searches the device addressed by a name used in the test scripts.
+
+        AP devices are matched by alias or by the name without the AP suffix,
+        unless the name refers to a wfa control agent. All other devices are
+        matched by alias.
+
+        Args:
+            dev_name (str): The alias, device name or $ variable name.
+        """
+        if dev_name.startswith('$'):
+            return self.by_num_var_name.get(dev_name)
+
+        candidates = list(self.by_alias.get(dev_name, []))
+        if dev_name.lower().find('wfa') == -1:
+            candidates.extend(self.ap_by_dev_name.get(dev_name.replace('AP', ''), []))
+
+        if not candidates:
+            return None
+        return max(candidates, key=lambda candidate: candidate[0])[1]
+
+
+    def search_device_ipport(self, dev_name):
+        """Gets the control "ip:port" string of the device addressed by a script name, None if not found.
+
+        Args:
+            dev_name (str): The alias, device name or $ variable name.
+        """
+        tbd = self.search_device(dev_name)
+        if tbd is None:
+            return None
+        if tbd.dev_type == 'AP' and not dev_name.startswith('$') and dev_name.lower().find('wfa') == -1 and tbd.ctrlipaddr == '':
+            return self.get_ap_agent_ipport()
+        return tbd.ctrlipaddr + ':' + tbd.ctrlport
+
+
+    def get_displayname(self, ctrlipaddr):
+        """Gets the display name of the device with the control IP address, None if not found.
+
+        Args:
+            ctrlipaddr (str): The control IP address.
+        """
+        tbd = self.by_ctrl_ipaddr.get(ctrlipaddr)
+        if tbd is None:
+            return None
+        return tbd.displayname
+
         
 
 class TestbedDevice:
@@ -20,6 +20,12 @@
 from testcase import TestCase
 
 
+# Programs which need the traffic agents and sniffer to settle after stopping,
+# in seconds. Programs not listed here do not wait at all.
+STREAM_SETTLE_TIME = {"WMMPS" : 2}
+SNIFFER_SETTLE_TIME = {"WMMPS" : 2}
+
+
 class TestProgramManager:
     """The class that manages the test program class.
 
@@ -43,6 +49,10 @@ class TestProgram:
         testbed_dev_list (list): The program testbed device list.
         tc_list (list): The program's test case list.
         is_tp_prog (boolean): The flag to indicate the throughput related program.
+        stream_timeout (int): The maximum time in seconds to wait for a send stream to complete.
+        stream_result_timeout (int): The maximum time in seconds a result check waits for the stream results.
+        stream_settle_time (int): The time in seconds to wait after stopping a receive stream.
+        sniffer_settle_time (int): The time in seconds to wait around stopping the sniffer.
 
     """
     def __init__(self, prog_name):
@@ -52,6 +62,10 @@ class TestProgram:
         self.testbed_dev_list = []
         self.tc_list = self.tcListFactoryMethod()
         self.is_tp_prog = False
+        self.stream_timeout = 600
+        self.stream_result_timeout = 5
+        self.stream_settle_time = 0
+        self.sniffer_settle_time = 0
 
     def set_prog_info(self):
         if (self.prog_name == "N" 
@@ -61,6 +75,9 @@ class TestProgram:
             or self.prog_name == "VE"):
             self.is_tp_prog = True
 
+        self.stream_settle_time = STREAM_SETTLE_TIME.get(self.prog_name, 0)
+        self.sniffer_settle_time = SNIFFER_SETTLE_TIME.get(self.prog_name, 0)
+
     def featListFactoryMethod(self):
         return {}
 
@@ -220,3 +220,191 @@ class SingleLinkedList(object):
             #raise ValueError("Data not in the list")
             return None
         return curr_node
+
+
+
+class IndexedSingleLinkedList(SingleLinkedList):
+    """A Singly linked list class which indexes its nodes while they are inserted.
+
+    It keeps the API of SingleLinkedList, but the lookups by node key and by
+    parent/child node key no longer walk the list from the head.
+
+    Attributes:
+        head (Node): The head node.
+        tail (Node): The tail node.
+        length (int): The number of nodes on the list.
+        key_nodes (dictionary): The lists of nodes keyed by node key, in list order.
+        child_nodes (dictionary): The child node keys to first child node maps keyed by parent node.
+        open_parents (list): The parent nodes the following nodes are added to as children.
+
+    """
+    def __init__(self):
+        super(IndexedSingleLinkedList, self).__init__()
+        self.length = 0
+        self.key_nodes = {}
+        self.child_nodes = {}
+        self.open_parents = []
+
+
+    @staticmethod
+    def is_parent_value(value):
+        """Checks if the node value marks a parent element, i.e. it has no nodevalue.
+
+        Args:
+            value (str): The node value.
+        """
+        return not ("%s" % value).strip()
+
+
+    def insert(self, key, value, tag="", group_tag=""):
+        """Inserts a node to the linkedlist with the key, tag and group_tag.
+
+        Args:
+            key (str): The key to uniquely identify the node.
+            tag (str): The tag to label the node's attribute.
+            group_tag (str): The group tag.
+        """
+        prev_node = self.tail
+        super(IndexedSingleLinkedList, self).insert(key, value, tag, group_tag)
+        self.index_node(prev_node, self.tail)
+
+
+    def index_node(self, prev_node, node):
+        """Adds the node to the key and the parent/child indexes.
+
+        The children of a parent node are its immediate next node followed by
+        all nodes up to the next node without nodevalue, as walked by
+        search_node_by_parent of SingleLinkedList.
+
+        Args:
+            prev_node (Node): The node before the node, None for the head.
+            node (Node): The node to be indexed.
+        """
+        self.length += 1
+        key = node.data.keys()[0]
+        self.key_nodes.setdefault(key, []).append(node)
+
+        is_parent = IndexedSingleLinkedList.is_parent_value(node.data[key])
+        open_parents = []
+        for parent_node in self.open_parents:
+            if parent_node is prev_node or not is_parent:
+                self.child_nodes[parent_node].setdefault(key, node)
+                open_parents.append(parent_node)
+
+        if is_parent:
+            self.child_nodes[node] = {}
+            open_parents.append(node)
+        self.open_parents = open_parents
+
+
+    def rebuild_index(self):
+        """Rebuilds all indexes from the nodes on the list.
+        """
+        self.length = 0
+        self.key_nodes = {}
+        self.child_nodes = {}
+        self.open_parents = []
+        prev_node = None
+        curr_node = self.head
+        while curr_node is not None:
+            self.index_node(prev_node, curr_node)
+            prev_node = curr_node
+            curr_node = curr_node.next
+
+
+    def delete(self, node_key):
+        """Deletes the nodes from the linkedlist based on the specified key.
+
+        Args:
+            node_key (str): The node key.
+        """
+        curr_node = self.head
+        prev_node = None
+
+        while curr_node is not None:
+            if curr_node.data.keys()[0] == node_key:
+                if prev_node is not None:
+                    prev_node.next = curr_node.next
+                else:
+                    self.head = curr_node.next
+                if curr_node is self.tail:
+                    self.tail = prev_node
+            else:
+                prev_node = curr_node
+            curr_node = curr_node.next
+
+        self.rebuild_index()
+
+
+    def size(self):
+        """The size of the linkedlist.
+        """
+        return self.length
+
+
+    def get_first_node(self, node_key):
+        """Gets the first node with the specified key, None if not found.
+
+        Args:
+            node_key (str): The node key.
+        """
+        nodes = self.key_nodes.get(node_key)
+        if nodes:
+            return nodes[0]
+        return None
+
+
+    def get_num_nodes_with_keyword(self, parent_node_key, keyword):
+        """Gets the number of nodes associated with the given keyword.
+
+        Args:
+            keyword (str): The key name to match with.
+        """
+        count = []
+        curr_node = self.get_first_node(parent_node_key)
+        if curr_node is None:
+            return count
+
+        curr_node = curr_node.next
+        while curr_node is not None and curr_node.data.values()[0] != "":
+            key_name = curr_node.data.keys()[0]
+            if re.search(keyword, key_name, re.I):
+                count.append(key_name)
+            curr_node = curr_node.next
+
+        return count
+
+
+    def get_next_node(self, curr_node_key):
+        """Gets the next node of currently found node with the specified key.
+
+        Args:
+            curr_node_key (str): The key to search for the current node.
+        """
+        curr_node = self.get_first_node(curr_node_key)
+        if curr_node is None:
+            return None
+        return curr_node.next
+
+
+    def search_node_by_parent(self, parent_node_key, child_node_key):
+        """Searches for the child node by given its node key and its parent node key.
+
+        Args:
+            parent_node_key (str): The parent node key.
+            child_node_key (str): The child node key.
+        """
+        for parent_node in self.key_nodes.get(parent_node_key, []):
+            # only the first parent element without nodevalue is searched
+            if parent_node in self.child_nodes:
+                return self.child_nodes[parent_node].get(child_node_key)
+        return None
+
+
+    def search(self, node_key):
+        """Searches for a node given its key.
+
+        Args:
+            node_key (str): The node key.
+        """
+        return self.get_first_node(node_key)
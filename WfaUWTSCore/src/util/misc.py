@@ -57,7 +57,16 @@ class Util(object):
     BACKGROUND_CYAN = BACKGROUND_BLUE | BACKGROUND_GREEN
     BACKGROUND_MAGENTA = BACKGROUND_RED | BACKGROUND_BLUE
 
-    std_out_handle = windll.kernel32.GetStdHandle(STD_OUTPUT_HANDLE)
+    std_out_handle = None
+
+
+    @staticmethod
+    def get_std_out_handle():
+        """Gets the console output handle, it is only looked up once.
+        """
+        if Util.std_out_handle is None:
+            Util.std_out_handle = windll.kernel32.GetStdHandle(Util.STD_OUTPUT_HANDLE)
+        return Util.std_out_handle
 
 
     @staticmethod
@@ -161,7 +170,7 @@ class Util(object):
 
 
     @staticmethod
-    def set_color(color, handle=std_out_handle):
+    def set_color(color, handle=None):
         """Sets the console font color (color) -> BOOL
 
         Args:
@@ -170,7 +179,8 @@ class Util(object):
 
         Example: set_color(FOREGROUND_GREEN | FOREGROUND_INTENSITY)
         """
-        handle = windll.kernel32.GetStdHandle(Util.STD_OUTPUT_HANDLE)
+        if handle is None:
+            handle = Util.get_std_out_handle()
         setRslt = windll.kernel32.SetConsoleTextAttribute(handle, color)
         return setRslt
     
@@ -0,0 +1,222 @@
+###############################################################################
+#
+# Copyright (c) 2016 Wi-Fi Alliance
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+# SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES WHATSOEVER
+# RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN ACTION OF CONTRACT,
+# NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF OR IN CONNECTION WITH THE
+# USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+###############################################################################
+
+#!/usr/bin/env python
+
+"""
+Micro-benchmarks of the script and response processing hot paths
+
+Usage (from the src folder):
+    python -m util.perfbench scanner <script folder> [repeat]
+    python -m util.perfbench capi <log file or folder> [repeat]
+"""
+
+import os
+import re
+import sys
+import time
+
+from scriptinfo.scriptelement import TestScriptElementType
+from core.capiresponse import CapiResponse
+
+#values read from device_get_info, ca_get_version and sniffer_get_info replies
+DEVICE_INFO_KEYS = ['vendor', 'model', 'version', 'firmware', 'WfaSnifferVersion', 'SnifferSTA', 'SwInfo', 'WiresharkVersion']
+#a device_get_info reply is read by the result processor, the validation and the TMS handler
+DEVICE_INFO_READERS = 3
+
+
+def read_script_segments(script_dir):
+    """Reads the segments of all test scripts in the folder the way the scanner splits them.
+
+    Args:
+        script_dir (str): The folder containing the .txt test scripts.
+    """
+    segments = []
+    for root, dirs, files in os.walk(script_dir):
+        for file_name in files:
+            if not file_name.lower().endswith(".txt"):
+                continue
+            with open(os.path.join(root, file_name), 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith('#') or line == '':
+                        continue
+                    line_segments = line.split('!')
+                    if line_segments and line_segments[-1] == '':
+                        line_segments.pop()
+                    segments.extend(line_segments)
+    return segments
+
+
+def classify_by_search(segment):
+    """Classifies a segment with one uncompiled re.search per pattern, as the scanner used to.
+
+    Args:
+        segment (str): The segment text.
+    """
+    for cmd in TestScriptElementType.script_capi_commands:
+        if re.search(cmd, segment, re.I):
+            return "CAPI"
+    for key in TestScriptElementType.script_testbed_devices:
+        if re.search(key, segment, re.I):
+            return key
+    return None
+
+
+def classify_by_matcher(segment):
+    """Classifies a segment with the precompiled matchers.
+
+    Args:
+        segment (str): The segment text.
+    """
+    if TestScriptElementType.is_capi_command(segment):
+        return "CAPI"
+    return TestScriptElementType.search_testbed_device_key(segment)
+
+
+def run_timed(func, segments, repeat):
+    """Runs the classifier over all segments and returns the results and tokens per second.
+
+    Args:
+        func (function): The classifier.
+        segments (list): The segments.
+        repeat (int): The number of passes over the segments.
+    """
+    results = None
+    start = time.time()
+    for i in range(repeat):
+        results = [func(segment) for segment in segments]
+    elapsed = time.time() - start
+    return results, (len(segments) * repeat) / max(elapsed, 1e-9)
+
+
+def bench_scanner(script_dir, repeat=3):
+    """Compares the segment classification throughput before and after precompiling.
+
+    Args:
+        script_dir (str): The folder containing the .txt test scripts.
+        repeat (int): The number of passes over the segments.
+    """
+    segments = read_script_segments(script_dir)
+    if not segments:
+        print "No script segments found in %s" % script_dir
+        return
+
+    before, before_rate = run_timed(classify_by_search, segments, repeat)
+    after, after_rate = run_timed(classify_by_matcher, segments, repeat)
+
+    mismatches = [segments[i] for i in range(len(segments)) if before[i] != after[i]]
+    print "Segments            : %d" % len(segments)
+    print "re.search per key   : %10.0f tokens/s" % before_rate
+    print "precompiled matcher : %10.0f tokens/s" % after_rate
+    print "speedup             : %10.1fx" % (after_rate / before_rate)
+    print "classification diffs: %d %s" % (len(mismatches), mismatches[:5])
+
+
+def read_capi_replies(log_path):
+    """Reads the recorded CAPI replies, i.e. the text after "<--", from UCC log files.
+
+    Args:
+        log_path (str): The log file or a folder containing .log/.txt log files.
+    """
+    log_files = []
+    if os.path.isdir(log_path):
+        for root, dirs, files in os.walk(log_path):
+            log_files.extend([os.path.join(root, f) for f in files if f.lower().endswith((".log", ".txt"))])
+    else:
+        log_files.append(log_path)
+
+    replies = []
+    for log_file in log_files:
+        with open(log_file, 'r') as f:
+            for line in f:
+                pos = line.find('<--')
+                if pos == -1:
+                    continue
+                reply = line[pos + 3:].strip()
+                if reply.startswith('status,'):
+                    replies.append(reply)
+    return replies
+
+
+def extract_by_scan(reply):
+    """Extracts the device info values with one search and slice per key and reader, as it used to be done.
+
+    Args:
+        reply (str): The CAPI reply.
+    """
+    for i in range(DEVICE_INFO_READERS):
+        stitems = reply.split(',')
+        values = [stitems[1] if len(stitems) > 1 else ""]
+        for key in DEVICE_INFO_KEYS:
+            value = ""
+            if re.search(key, reply) and reply.find(key + ',') != -1:
+                data = reply[reply.index(key + ',') + len(key) + 1:].lstrip()
+                try:
+                    value = data[:data.index(',')]
+                except ValueError:
+                    value = data.rstrip('\n')
+            values.append(value)
+    return values
+
+
+def extract_by_response(reply):
+    """Extracts the device info values for every reader from a single CapiResponse parse.
+
+    Args:
+        reply (str): The CAPI reply.
+    """
+    response = CapiResponse(reply)
+    for i in range(DEVICE_INFO_READERS):
+        values = [response.status] + [response.get(key, "") for key in DEVICE_INFO_KEYS]
+    return values
+
+
+def bench_capi_response(log_path, repeat=3):
+    """Compares the reply parsing throughput of the slice scans and CapiResponse.
+
+    Args:
+        log_path (str): The log file or a folder containing log files.
+        repeat (int): The number of passes over the replies.
+    """
+    replies = read_capi_replies(log_path)
+    if not replies:
+        print "No CAPI replies found in %s" % log_path
+        return
+
+    before, before_rate = run_timed(extract_by_scan, replies, repeat)
+    after, after_rate = run_timed(extract_by_response, replies, repeat)
+
+    mismatches = [replies[i] for i in range(len(replies)) if before[i] != after[i]]
+    print "Replies             : %d" % len(replies)
+    print "search and slice    : %10.0f replies/s" % before_rate
+    print "CapiResponse        : %10.0f replies/s" % after_rate
+    print "speedup             : %10.1fx" % (after_rate / before_rate)
+    print "value diffs         : %d %s" % (len(mismatches), mismatches[:5])
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3 or sys.argv[1] not in ("scanner", "capi"):
+        print __doc__
+        sys.exit(1)
+
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    if sys.argv[1] == "scanner":
+        bench_scanner(sys.argv[2], repeat)
+    elif sys.argv[1] == "capi":
+        bench_capi_response(sys.argv[2], repeat)
@@ -30,6 +30,8 @@ import core.initializer
 from common import *
 from util.misc import Util
 from core.executor import Executor
+from core.runcontext import RunContext
+from core.benchscheduler import TestBenchScheduler
 from features import display_val_result
 from features.usermode import UserMode
 from frontend.cli import FrontendCli, FrontendCliServer
@@ -309,8 +311,7 @@ class TestFlowController:
         core.parser.TestScriptParser.sub_file_call_dict = {}
         TestLogFileSource.log_file_hdl_list = []
         TestLogFileSource.log_file_source_obj_list = []
-        core.parser.test_script_sym_tab = {"ifCondBit" : True, "socktimeout" : 60, "iDNB" : 0, "testRunning" : 0, "threadCount" : 0}
-        core.parser.capi_cmd_ret_sym_tab = {}
+        TestFlowController.test_mngr_initr.run_context.reset()
 
 
     @staticmethod
@@ -322,7 +323,9 @@ class TestFlowController:
         """
         GlobalConfigFiles.curr_prog_name = usr_in_cmd.prog_name
 
-        if usr_in_cmd.is_group_run:
+        if usr_in_cmd.is_group_run and usr_in_cmd.bench_file_name:
+            TestFlowController.run_group_on_benches(usr_in_cmd)
+        elif usr_in_cmd.is_group_run:
             if os.path.exists(usr_in_cmd.group_file_name):
                 grp_files = open(usr_in_cmd.group_file_name, 'r')
                 for tc in grp_files:
@@ -356,6 +359,32 @@ class TestFlowController:
             TestFlowController.reset_test_environment()
 
 
+    @staticmethod
+    def run_group_on_benches(usr_in_cmd):
+        """Runs the test cases of a group file in parallel, one at a time per bench.
+
+        Args:
+            usr_in_cmd (object): The object of UserCommand class.
+        """
+        if not os.path.exists(usr_in_cmd.group_file_name):
+            raise OSError(usr_in_cmd.group_file_name + " not exists")
+
+        tc_list = []
+        with open(usr_in_cmd.group_file_name, 'r') as grp_files:
+            for tc in grp_files:
+                tc = tc.strip()
+                if tc:
+                    tc_list.append(tc)
+
+        bench_list = TestBenchScheduler.load_bench_file(usr_in_cmd.bench_file_name)
+        GlobalConfigFiles.curr_tc_name = usr_in_cmd.group_file_name
+        results = TestBenchScheduler(usr_in_cmd.prog_name, bench_list).run_group(tc_list)
+        if all(result is not None and result.verdict == 'PASS' for result in results):
+            GlobalConfigFiles.test_result = 'PASS'
+        else:
+            GlobalConfigFiles.test_result = 'FAIL'
+
+
     @staticmethod
     def initialize_test_environment(usr_in_cmd):
         """Initializes test execution environment including domain object managers.
@@ -364,7 +393,7 @@ class TestFlowController:
             usr_in_cmd (object): The object of UserCommand class.
         """
         if TestFlowController.test_mngr_initr == None:
-            TestFlowController.test_mngr_initr = core.initializer.TestManagerInitializer(usr_in_cmd.prog_name, usr_in_cmd.test_case_id)
+            TestFlowController.test_mngr_initr = core.initializer.TestManagerInitializer(usr_in_cmd.prog_name, usr_in_cmd.test_case_id, RunContext().activate())
 
         TestFlowController.test_mngr_initr.init_test_config_context(usr_in_cmd)
         # gets the current user mode
@@ -455,8 +484,9 @@ class TestFlowController:
                 count += 1
             logging.debug("the count %s" % str(count))
 
-            executor_inst = Executor()
+            executor_inst = Executor(TestFlowController.test_mngr_initr.run_context)
             executor_inst.parallel_enable = True
+            executor_inst.graph_enable = True
             
             if usr_in_cmd.is_testbed_val or usr_in_cmd.is_testcase_val:
                 executor_inst.construct_valiadate_q(TestFlowController.test_mngr_initr,
@@ -623,7 +653,7 @@ class TestFlowController:
 
             U = "\n Test ID = [%s] CmdPath = [%s] Prog Name = [%s] initFile =[%s] TBFile =[%s]" % (usr_in_cmd.test_case_id, TestFlowController.test_mngr_initr.test_script_mngr.prog_script_folder_path, usr_in_cmd.prog_name, GlobalConfigFiles.init_config_file, TestFlowController.test_mngr_initr.test_script_mngr.testbed_ap_file)
 
-            TestLogFileSource.log_file_source_obj_list[2].init_logging(GlobalConfigFiles.LOG_LEVEL)
+            TestLogFileSource.log_file_source_obj_list[2].init_logging(GlobalConfigFiles.LOG_LEVEL, TestFlowController.test_mngr_initr.run_context.test_script_sym_tab)
             TestLogFileSource.log_file_source_obj_list[3].create_log_file()
 
             logging.info("\n Test Info %s" % U)
@@ -718,7 +748,7 @@ class TestFlowController:
     def save_log_sig():
         """Saves the signature of current test log file to database.
         """
-        log_file_path = TestScriptSymbolTable.get_value_from_sym_tab("$logFullPath", TestScriptSymbolTable.test_script_sym_tab)
+        log_file_path = TestScriptSymbolTable.get_value_from_sym_tab("$logFullPath", TestFlowController.test_mngr_initr.run_context.test_script_sym_tab)
         history = historydb.History(GlobalConfigFiles.curr_prog_name, GlobalConfigFiles.curr_tc_name, TestFlowController.test_mngr_initr.test_config_cxt.user_mode, log_file_path)
         history_service = historydb.HistoryService(history)
 